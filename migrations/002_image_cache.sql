@@ -0,0 +1,17 @@
+-- =============================================================================
+-- Sticker Trendz: Replicate image cache
+-- =============================================================================
+-- Idempotent: safe to re-run (uses IF NOT EXISTS).
+--
+-- Maps sha256(prompt|model_ref|image_size) to the R2 key holding the raw
+-- Replicate output, so a repeated prompt can skip the paid generation call.
+
+CREATE TABLE IF NOT EXISTS image_cache (
+    hash TEXT PRIMARY KEY,
+    r2_key TEXT NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_image_cache_created ON image_cache(created_at);
+
+ALTER TABLE image_cache ENABLE ROW LEVEL SECURITY;
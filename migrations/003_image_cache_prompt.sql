@@ -0,0 +1,9 @@
+-- =============================================================================
+-- Sticker Trendz: store prompt text on image_cache
+-- =============================================================================
+-- Idempotent: safe to re-run (uses IF NOT EXISTS).
+--
+-- The semantic prompt cache re-embeds recent prompts at startup so
+-- near-duplicate prompts can reuse an existing image.
+
+ALTER TABLE image_cache ADD COLUMN IF NOT EXISTS prompt TEXT;
@@ -0,0 +1,10 @@
+-- =============================================================================
+-- Sticker Trendz: store prompt embeddings on image_cache
+-- =============================================================================
+-- Idempotent: safe to re-run (uses IF NOT EXISTS).
+--
+-- The semantic prompt cache loads stored embeddings at startup instead of
+-- re-embedding every historical prompt. Rows without an embedding are
+-- encoded on load as before.
+
+ALTER TABLE image_cache ADD COLUMN IF NOT EXISTS embedding REAL[];
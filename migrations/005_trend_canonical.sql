@@ -0,0 +1,10 @@
+-- =============================================================================
+-- Sticker Trendz: link near-duplicate trends to a canonical trend
+-- =============================================================================
+-- Idempotent: safe to re-run (uses IF NOT EXISTS).
+--
+-- The sticker generator clusters discovered trends by topic embedding and
+-- only generates stickers for one trend per cluster. The other members are
+-- marked generated and point at that trend, whose sticker records they share.
+
+ALTER TABLE trends ADD COLUMN IF NOT EXISTS canonical_trend_id UUID REFERENCES trends(id);
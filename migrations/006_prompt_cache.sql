@@ -0,0 +1,18 @@
+-- =============================================================================
+-- Sticker Trendz: image prompt cache
+-- =============================================================================
+-- Idempotent: safe to re-run (uses IF NOT EXISTS).
+--
+-- Maps sha256(model|topic|context|count) to the prompts GPT generated for a
+-- trend, so a re-run on the same topic (retries, backfills) can skip the
+-- OpenAI call. Entries older than a day are ignored by the reader.
+
+CREATE TABLE IF NOT EXISTS prompt_cache (
+    hash TEXT PRIMARY KEY,
+    prompts JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_prompt_cache_created ON prompt_cache(created_at);
+
+ALTER TABLE prompt_cache ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,18 @@
+-- =============================================================================
+-- Sticker Trendz: trend score cache
+-- =============================================================================
+-- Idempotent: safe to re-run (uses IF NOT EXISTS).
+--
+-- Maps sha256(model|topic_normalized|sorted keywords) to the score the LLM
+-- gave a trend, so a trend that resurfaces in a later cycle is not scored
+-- again. Entries older than 7 days are ignored by the reader.
+
+CREATE TABLE IF NOT EXISTS scored_trends_cache (
+    hash TEXT PRIMARY KEY,
+    score JSONB NOT NULL,
+    created_at TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_scored_trends_cache_created ON scored_trends_cache(created_at);
+
+ALTER TABLE scored_trends_cache ENABLE ROW LEVEL SECURITY;
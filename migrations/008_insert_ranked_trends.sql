@@ -0,0 +1,39 @@
+-- =============================================================================
+-- Sticker Trendz: insert a cycle's trends with ranking done in SQL
+-- =============================================================================
+-- Idempotent: safe to re-run (uses CREATE OR REPLACE).
+--
+-- The trend monitor stores every qualifying trend of a cycle in one call.
+-- The top discovered_limit trends by score_overall become 'discovered' and
+-- the rest 'queued'; ties keep the order the rows were passed in.
+
+CREATE OR REPLACE FUNCTION insert_ranked_trends(trend_rows JSONB, discovered_limit INT)
+RETURNS SETOF trends
+LANGUAGE sql
+AS $$
+    INSERT INTO trends (
+        topic, topic_normalized, keywords, sources,
+        score_velocity, score_commercial, score_safety, score_uniqueness, score_overall,
+        reasoning, status, source_data
+    )
+    SELECT
+        e.item->>'topic',
+        e.item->>'topic_normalized',
+        ARRAY(SELECT jsonb_array_elements_text(e.item->'keywords')),
+        ARRAY(SELECT jsonb_array_elements_text(e.item->'sources')),
+        (e.item->>'score_velocity')::FLOAT,
+        (e.item->>'score_commercial')::FLOAT,
+        (e.item->>'score_safety')::FLOAT,
+        (e.item->>'score_uniqueness')::FLOAT,
+        (e.item->>'score_overall')::FLOAT,
+        e.item->>'reasoning',
+        CASE
+            WHEN row_number() OVER (
+                ORDER BY (e.item->>'score_overall')::FLOAT DESC NULLS LAST, e.ord
+            ) <= discovered_limit THEN 'discovered'
+            ELSE 'queued'
+        END,
+        COALESCE(e.item->'source_data', '{}'::JSONB)
+    FROM jsonb_array_elements(trend_rows) WITH ORDINALITY AS e(item, ord)
+    RETURNING *;
+$$;
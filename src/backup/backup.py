@@ -236,9 +236,8 @@ class DatabaseBackup:
         try:
             objects = self._storage.list_objects(BACKUP_PREFIX)
             for obj in objects:
-                last_modified = obj.get("LastModified")
-                if last_modified and last_modified < cutoff:
-                    key = obj.get("Key", "")
+                if obj.last_modified and obj.last_modified < cutoff:
+                    key = obj.key
                     try:
                         self._storage.delete_object(key)
                         deleted += 1
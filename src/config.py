@@ -54,6 +54,14 @@ def _optional_int(name: str, default: int) -> int:
         return default
 
 
+def _optional_bool(name: str, default: bool) -> bool:
+    """Return a boolean environment variable (1/true/yes/on) or the default."""
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
 def _optional_float(name: str, default: float) -> float:
     """Return a float environment variable or the default."""
     raw = os.getenv(name)
@@ -104,6 +112,8 @@ class OpenAIConfig:
     prompt_model: str = "gemini-2.5-flash"
     seo_model: str = "gemini-2.5-flash"
     moderation_api_key: str = ""
+    structured_output: bool = True
+    requests_per_minute: int = 15
 
 
 @dataclass(frozen=True)
@@ -167,6 +177,7 @@ class CapsConfig:
     max_images_per_day: int = 50
     max_active_listings: int = 300
     ai_monthly_budget_cap_usd: float = 150.0
+    max_concurrent_trends: int = 2
 
 
 @dataclass(frozen=True)
@@ -210,10 +221,12 @@ def load_config(require_all: bool = False) -> AppConfig:
         llm_api_key = gemini_key
         default_base_url = "https://generativelanguage.googleapis.com/v1beta/openai/"
         default_model = "gemini-2.5-flash"
+        default_rpm = 15
     else:
         llm_api_key = openai_key
         default_base_url = ""
         default_model = "gpt-4o-mini"
+        default_rpm = 500
 
     return AppConfig(
         openai=OpenAIConfig(
@@ -223,6 +236,8 @@ def load_config(require_all: bool = False) -> AppConfig:
             prompt_model=_optional("LLM_PROMPT_MODEL", default_model),
             seo_model=_optional("LLM_SEO_MODEL", default_model),
             moderation_api_key=openai_key,
+            structured_output=_optional_bool("LLM_STRUCTURED_OUTPUT", True),
+            requests_per_minute=_optional_int("LLM_REQUESTS_PER_MINUTE", default_rpm),
         ),
         replicate=ReplicateConfig(
             api_token=getter("REPLICATE_API_TOKEN"),
@@ -270,6 +285,7 @@ def load_config(require_all: bool = False) -> AppConfig:
             ai_monthly_budget_cap_usd=_optional_float(
                 "AI_MONTHLY_BUDGET_CAP_USD", 150.0
             ),
+            max_concurrent_trends=_optional_int("MAX_CONCURRENT_TRENDS", 2),
         ),
     )
 
@@ -22,7 +22,7 @@ _ALLOWED_COLUMNS: Dict[str, frozenset] = {
     "trends": frozenset({
         "id", "topic", "topic_normalized", "source", "sources", "keywords",
         "status", "score_overall", "score_velocity", "score_sentiment",
-        "created_at", "updated_at",
+        "canonical_trend_id", "created_at", "updated_at",
     }),
     "stickers": frozenset({
         "id", "trend_id", "title", "description", "tags", "image_url",
@@ -63,6 +63,15 @@ _ALLOWED_COLUMNS: Dict[str, frozenset] = {
         "id", "sticker_id", "old_price", "new_price", "pricing_tier",
         "reason", "created_at",
     }),
+    "image_cache": frozenset({
+        "hash", "r2_key", "prompt", "embedding", "created_at",
+    }),
+    "prompt_cache": frozenset({
+        "hash", "prompts", "created_at",
+    }),
+    "scored_trends_cache": frozenset({
+        "hash", "score", "created_at",
+    }),
 }
 
 
@@ -83,6 +92,14 @@ class DatabaseError(Exception):
     """Raised on database operation failures."""
 
 
+class MissingFunctionError(DatabaseError):
+    """Raised when an RPC's stored function does not exist (migration not applied)."""
+
+
+# PostgREST "function not found in schema cache" and Postgres undefined_function
+_MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+
+
 class SupabaseClient:
     """
     Thin wrapper around the Supabase Python client.
@@ -140,6 +157,17 @@ class SupabaseClient:
             logger.error("Insert into '%s' failed: %s", table, exc)
             raise DatabaseError(f"Insert into '{table}' failed: {exc}") from exc
 
+    def insert_many(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert several rows in one request and return the inserted records."""
+        if not rows:
+            return []
+        try:
+            result = self._client.table(table).insert(rows).execute()
+            return result.data or []
+        except Exception as exc:
+            logger.error("Bulk insert into '%s' failed: %s", table, exc)
+            raise DatabaseError(f"Bulk insert into '{table}' failed: {exc}") from exc
+
     def upsert(self, table: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Upsert a row and return the record."""
         try:
@@ -151,6 +179,17 @@ class SupabaseClient:
             logger.error("Upsert into '%s' failed: %s", table, exc)
             raise DatabaseError(f"Upsert into '{table}' failed: {exc}") from exc
 
+    def upsert_many(self, table: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Upsert several rows in one request and return the records."""
+        if not rows:
+            return []
+        try:
+            result = self._client.table(table).upsert(rows).execute()
+            return result.data or []
+        except Exception as exc:
+            logger.error("Bulk upsert into '%s' failed: %s", table, exc)
+            raise DatabaseError(f"Bulk upsert into '{table}' failed: {exc}") from exc
+
     def update(
         self, table: str, filters: Dict[str, Any], data: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
@@ -166,6 +205,20 @@ class SupabaseClient:
             logger.error("Update '%s' failed: %s", table, exc)
             raise DatabaseError(f"Update '{table}' failed: {exc}") from exc
 
+    def update_in(
+        self, table: str, column: str, values: List[Any], data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Update every row whose column is in values. Returns updated records."""
+        _validate_filter_columns(table, {column: None})
+        if not values:
+            return []
+        try:
+            result = self._client.table(table).update(data).in_(column, values).execute()
+            return result.data or []
+        except Exception as exc:
+            logger.error("Update '%s' failed: %s", table, exc)
+            raise DatabaseError(f"Update '{table}' failed: {exc}") from exc
+
     def select(
         self,
         table: str,
@@ -197,6 +250,20 @@ class SupabaseClient:
             logger.error("Select from '%s' failed: %s", table, exc)
             raise DatabaseError(f"Select from '{table}' failed: {exc}") from exc
 
+    def select_in(
+        self, table: str, column: str, values: List[Any], columns: str = "*",
+    ) -> List[Dict[str, Any]]:
+        """Select every row whose column is in values."""
+        _validate_filter_columns(table, {column: None})
+        if not values:
+            return []
+        try:
+            result = self._client.table(table).select(columns).in_(column, values).execute()
+            return result.data or []
+        except Exception as exc:
+            logger.error("Select from '%s' failed: %s", table, exc)
+            raise DatabaseError(f"Select from '{table}' failed: {exc}") from exc
+
     def delete(self, table: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Delete rows matching filters. Returns deleted records."""
         _validate_filter_columns(table, filters)
@@ -217,6 +284,13 @@ class SupabaseClient:
             return result.data
         except Exception as exc:
             logger.error("RPC '%s' failed: %s", function_name, exc)
+            message = str(exc)
+            if any(code in message for code in _MISSING_FUNCTION_CODES) or (
+                "function" in message and "does not exist" in message
+            ):
+                raise MissingFunctionError(
+                    f"RPC '{function_name}' not found: {exc}"
+                ) from exc
             raise DatabaseError(f"RPC '{function_name}' failed: {exc}") from exc
 
     # ------------------------------------------------------------------
@@ -226,10 +300,43 @@ class SupabaseClient:
     def insert_trend(self, data: Dict[str, Any]) -> Dict[str, Any]:
         return self.insert("trends", data)
 
+    def insert_trends(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert several trends in one request (all-or-nothing)."""
+        return self.insert_many("trends", rows)
+
+    def insert_ranked_trends(
+        self, rows: List[Dict[str, Any]], discovered_limit: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Insert a cycle's trends in one call, ranking them in SQL.
+
+        The top discovered_limit rows by score_overall are stored as
+        'discovered' and the rest as 'queued' (any status in rows is
+        ignored). Returns the inserted records.
+        """
+        if not rows:
+            return []
+        return self.rpc(
+            "insert_ranked_trends",
+            {"trend_rows": rows, "discovered_limit": discovered_limit},
+        ) or []
+
     def get_trend_by_normalized_topic(self, normalized: str) -> Optional[Dict[str, Any]]:
         rows = self.select("trends", filters={"topic_normalized": normalized}, limit=1)
         return rows[0] if rows else None
 
+    def get_trends_by_normalized_topics(
+        self, normalized: List[str], columns: str = "*",
+    ) -> Dict[str, Dict[str, Any]]:
+        """Existing trends keyed by topic_normalized, fetched in one query."""
+        rows = self.select_in(
+            "trends", "topic_normalized", list(dict.fromkeys(normalized)), columns=columns,
+        )
+        found: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            found.setdefault(row.get("topic_normalized", ""), row)
+        return found
+
     def get_trends_by_status(self, status: str, limit: int = 100) -> List[Dict[str, Any]]:
         return self.select("trends", filters={"status": status}, order_by="-score_overall", limit=limit)
 
@@ -237,6 +344,13 @@ class SupabaseClient:
         data["updated_at"] = datetime.now(timezone.utc).isoformat()
         return self.update("trends", {"id": trend_id}, data)
 
+    def update_trends(self, trend_ids: List[str], data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        data["updated_at"] = datetime.now(timezone.utc).isoformat()
+        return self.update_in("trends", "id", trend_ids, data)
+
+    def update_trends_status(self, trend_ids: List[str], status: str) -> List[Dict[str, Any]]:
+        return self.update_trends(trend_ids, {"status": status})
+
     # ------------------------------------------------------------------
     # Stickers
     # ------------------------------------------------------------------
@@ -244,6 +358,9 @@ class SupabaseClient:
     def insert_sticker(self, data: Dict[str, Any]) -> Dict[str, Any]:
         return self.insert("stickers", data)
 
+    def insert_stickers(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.insert_many("stickers", rows)
+
     def get_stickers_by_status(self, moderation_status: str, limit: int = 100) -> List[Dict[str, Any]]:
         return self.select("stickers", filters={"moderation_status": moderation_status}, limit=limit)
 
@@ -365,3 +482,59 @@ class SupabaseClient:
 
     def insert_price_history(self, data: Dict[str, Any]) -> Dict[str, Any]:
         return self.insert("price_history", data)
+
+    # ------------------------------------------------------------------
+    # Image Cache
+    # ------------------------------------------------------------------
+
+    def get_image_cache(self, cache_hash: str) -> Optional[Dict[str, Any]]:
+        rows = self.select("image_cache", filters={"hash": cache_hash}, limit=1)
+        return rows[0] if rows else None
+
+    def get_recent_image_cache(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        return self.select(
+            "image_cache", columns="prompt,r2_key,embedding",
+            order_by="-created_at", limit=limit,
+        )
+
+    def upsert_image_cache(
+        self,
+        cache_hash: str,
+        r2_key: str,
+        prompt: Optional[str] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"hash": cache_hash, "r2_key": r2_key, "prompt": prompt}
+        if embedding is not None:
+            data["embedding"] = embedding
+        return self.upsert("image_cache", data)
+
+    # ------------------------------------------------------------------
+    # Prompt Cache
+    # ------------------------------------------------------------------
+
+    def get_prompt_cache(self, hashes: List[str]) -> List[Dict[str, Any]]:
+        return self.select_in("prompt_cache", "hash", hashes, columns="hash,prompts,created_at")
+
+    def upsert_prompt_cache(self, entries: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc).isoformat()
+        return self.upsert_many("prompt_cache", [
+            {"hash": h, "prompts": prompts, "created_at": now}
+            for h, prompts in entries.items()
+        ])
+
+    # ------------------------------------------------------------------
+    # Trend Score Cache
+    # ------------------------------------------------------------------
+
+    def get_score_cache(self, hashes: List[str]) -> List[Dict[str, Any]]:
+        return self.select_in(
+            "scored_trends_cache", "hash", hashes, columns="hash,score,created_at",
+        )
+
+    def upsert_score_cache(self, entries: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        now = datetime.now(timezone.utc).isoformat()
+        return self.upsert_many("scored_trends_cache", [
+            {"hash": h, "score": score, "created_at": now}
+            for h, score in entries.items()
+        ])
@@ -117,10 +117,14 @@ def check_keywords(text: str) -> Tuple[bool, Optional[str]]:
     return False, None
 
 
+@lru_cache(maxsize=4096)
 def check_all(text: str) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Check text against both trademark and keyword blocklists.
 
+    Results are cached per text, since the same topics recur across
+    monitor cycles; clear_cache() drops them along with the lists.
+
     Args:
         text: The text to check.
 
@@ -143,3 +147,4 @@ def clear_cache() -> None:
     """Clear the cached blocklists (useful for testing)."""
     get_trademark_blocklist.cache_clear()
     get_keyword_blocklist.cache_clear()
+    check_all.cache_clear()
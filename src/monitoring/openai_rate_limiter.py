@@ -0,0 +1,130 @@
+"""
+Redis-backed request rate limiter for OpenAI-compatible LLM APIs.
+
+Keeps LLM calls under the account's requests-per-minute ceiling across
+every concurrent workflow, so bursts are delayed client-side instead of
+burning retries on 429 responses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Callable, Optional
+
+from src.config import load_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RPM = 500
+WINDOW_MS = 60_000
+MAX_WAIT_SECONDS = 60.0
+
+# Sliding window over a sorted set of request timestamps. Drops entries
+# older than the window, then either records this request (returns 0) or
+# returns the milliseconds until the oldest entry leaves the window.
+# Check and record happen in one EVAL, so concurrent callers can't both
+# take the last slot.
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], 0, now - window)
+if redis.call("ZCARD", KEYS[1]) < limit then
+    redis.call("ZADD", KEYS[1], now, ARGV[4])
+    redis.call("PEXPIRE", KEYS[1], window)
+    return 0
+end
+local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+return math.max(1, tonumber(oldest[2]) + window - now)
+"""
+
+
+class OpenAIRateLimiter:
+    """
+    Sliding-window requests-per-minute limiter shared through Redis.
+
+    Fails open: if Redis is unreachable, requests proceed and the API's
+    own 429 handling takes over.
+    """
+
+    def __init__(
+        self,
+        rpm: int = DEFAULT_RPM,
+        redis_url: Optional[str] = None,
+        redis_token: Optional[str] = None,
+        redis_client: Optional[object] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            rpm: Maximum requests per rolling minute.
+            redis_url: Upstash Redis URL. Falls back to config.
+            redis_token: Upstash Redis token. Falls back to config.
+            redis_client: Pre-built Redis client (for testing).
+            clock: Wall-clock source in seconds (for testing).
+        """
+        self._rpm = rpm
+        self._clock = clock
+        self._redis = redis_client
+
+        if self._redis is None:
+            cfg = load_config(require_all=False)
+            try:
+                import redis as redis_lib
+
+                self._redis = redis_lib.Redis.from_url(
+                    redis_url or cfg.redis.url,
+                    password=redis_token or cfg.redis.token,
+                    decode_responses=True,
+                    socket_timeout=5,
+                    socket_connect_timeout=5,
+                )
+                logger.info("Redis client initialized for OpenAI rate limiter")
+            except Exception as exc:
+                logger.warning("OpenAI rate limiter disabled, Redis unavailable: %s", exc)
+                self._redis = None
+
+    def try_acquire(self, key: str) -> int:
+        """
+        Record one request under key if the window has room.
+
+        Returns:
+            0 if the request may proceed, else milliseconds to wait before
+            trying again.
+        """
+        if self._redis is None:
+            return 0
+        now_ms = int(self._clock() * 1000)
+        member = f"{now_ms}-{uuid.uuid4().hex}"
+        try:
+            wait_ms = self._redis.eval(
+                _SLIDING_WINDOW_LUA, 1, f"ratelimit:{key}",
+                now_ms, WINDOW_MS, self._rpm, member,
+            )
+            return int(wait_ms or 0)
+        except Exception as exc:
+            logger.warning("Rate limiter check failed for '%s', proceeding: %s", key, exc)
+            return 0
+
+    def acquire(self, key: str, max_wait: float = MAX_WAIT_SECONDS) -> None:
+        """Block until a request slot is free (or max_wait seconds pass)."""
+        deadline = time.monotonic() + max_wait
+        while (wait_ms := self.try_acquire(key)) > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("Rate limit wait for '%s' exceeded %.0fs, proceeding", key, max_wait)
+                return
+            time.sleep(min(wait_ms / 1000, remaining))
+
+    async def aacquire(self, key: str, max_wait: float = MAX_WAIT_SECONDS) -> None:
+        """Async twin of acquire(); waits without blocking the event loop."""
+        deadline = time.monotonic() + max_wait
+        while (wait_ms := await asyncio.to_thread(self.try_acquire, key)) > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logger.warning("Rate limit wait for '%s' exceeded %.0fs, proceeding", key, max_wait)
+                return
+            await asyncio.sleep(min(wait_ms / 1000, remaining))
@@ -9,6 +9,8 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+import time
 from datetime import datetime, timezone
 from typing import Optional
 
@@ -59,6 +61,7 @@ REPLICATE_COST_PER_IMAGE: float = _load_replicate_cost()
 MONTHLY_WARNING_USD: float = 120.0
 MONTHLY_HARD_STOP_USD: float = 150.0
 DAILY_WARNING_USD: float = 8.0
+BUDGET_CACHE_TTL_SECONDS: float = 60.0
 
 
 def estimate_llm_cost(input_tokens: int, output_tokens: int) -> float:
@@ -104,7 +107,10 @@ class SpendTracker:
     Tracks AI spend against daily and monthly budget caps.
 
     Reads cumulative costs from the pipeline_runs table and enforces
-    the $120 warning / $150 hard-stop thresholds.
+    the $120 warning / $150 hard-stop thresholds. The monthly total is
+    cached for cache_ttl seconds; spend recorded in-process with
+    record_spend() is added on top of every refresh until it has been
+    written to pipeline_runs and marked with mark_stored().
     """
 
     def __init__(
@@ -114,6 +120,7 @@ class SpendTracker:
         monthly_warning: float = MONTHLY_WARNING_USD,
         monthly_cap: float = MONTHLY_HARD_STOP_USD,
         daily_warning: float = DAILY_WARNING_USD,
+        cache_ttl: float = BUDGET_CACHE_TTL_SECONDS,
     ) -> None:
         self._db = db or SupabaseClient()
         self._alerter = alerter or EmailAlerter()
@@ -121,6 +128,31 @@ class SpendTracker:
         self._monthly_cap = monthly_cap
         self._daily_warning = daily_warning
         self._alert_sent_for_month: Optional[str] = None  # Track if we already alerted this month
+        self._cache_ttl = cache_ttl
+        self._cached_monthly: Optional[float] = None
+        self._cached_at = 0.0
+        self._unstored_spend = 0.0  # recorded locally, not yet in pipeline_runs
+        self._lock = threading.Lock()
+
+    @property
+    def unstored_spend(self) -> float:
+        """In-process spend not yet written to pipeline_runs."""
+        with self._lock:
+            return round(self._unstored_spend, 4)
+
+    def record_spend(self, usd: float) -> None:
+        """Add in-process spend to the monthly total until it is stored."""
+        if usd > 0:
+            with self._lock:
+                self._unstored_spend += usd
+
+    def mark_stored(self, usd: float) -> None:
+        """Stop counting spend that has been written to pipeline_runs."""
+        if usd > 0:
+            with self._lock:
+                self._unstored_spend = max(0.0, self._unstored_spend - usd)
+                # The stored total now includes it; refresh on the next check
+                self._cached_monthly = None
 
     def get_daily_spend(self, date: Optional[datetime] = None) -> float:
         """
@@ -185,6 +217,23 @@ class SpendTracker:
             logger.error("Failed to query monthly AI spend: %s", exc)
             return 0.0
 
+    def _current_monthly_spend(self) -> float:
+        """
+        Cached monthly spend plus locally recorded, unstored spend.
+
+        Re-queries Supabase once the cache is older than cache_ttl, or
+        when the local estimate reaches the hard-stop cap so a stop is
+        always confirmed against the stored total. Unstored spend is not
+        in pipeline_runs yet, so it is kept across refreshes.
+        """
+        with self._lock:
+            now = time.monotonic()
+            stale = self._cached_monthly is None or now - self._cached_at >= self._cache_ttl
+            if stale or self._cached_monthly + self._unstored_spend >= self._monthly_cap:
+                self._cached_monthly = self.get_monthly_spend()
+                self._cached_at = now
+            return round(self._cached_monthly + self._unstored_spend, 4)
+
     def check_budget(self) -> dict:
         """
         Check current monthly spend against budget thresholds.
@@ -201,7 +250,7 @@ class SpendTracker:
               - hard_stop (bool): True if past the hard stop threshold.
               - message (str): Human-readable status.
         """
-        monthly = self.get_monthly_spend()
+        monthly = self._current_monthly_spend()
         hard_stop = monthly >= self._monthly_cap
         warning = monthly >= self._monthly_warning
 
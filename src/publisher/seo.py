@@ -19,6 +19,7 @@ logger = logging.getLogger(__name__)
 
 MAX_TITLE_LENGTH = 140
 REQUIRED_TAG_COUNT = 13
+MAX_BATCH_SIZE = 10  # topics per batch call, keeps output under the token budget
 
 # Evergreen sticker tags always included
 EVERGREEN_TAGS = [
@@ -64,21 +65,42 @@ SIZE_MAP = {
     "4in": ("4 inch", "4\" x 4\""),
 }
 
+# DESCRIPTION_TEMPLATE pre-rendered per size at import time; only the
+# {ai_description} placeholder is left to fill in per listing.
+_DESCRIPTION_BY_SIZE = {
+    size: DESCRIPTION_TEMPLATE.replace("{size}", label).replace(
+        "{dimensions}", dimensions
+    )
+    for size, (label, dimensions) in SIZE_MAP.items()
+}
+
 SYSTEM_PROMPT = (
     "You are an Etsy SEO expert for a trending sticker shop. "
     "Generate listing copy that ranks well in Etsy search."
 )
 
+# Requirement lists shared by the per-topic and batch prompts so the two
+# paths always ask for the same copy
+TITLE_RULES = """- Maximum 140 characters
+- Format: '{{Trend Topic}} Sticker - {{Style}} Vinyl Decal - Laptop Water Bottle Sticker - Trending {{Category}}'
+- Include relevant keywords for Etsy search
+- Do NOT include trademark or brand names"""
+
+TAG_RULES = """- 5-7 trend-specific tags related to the topic
+- 3-4 evergreen sticker tags (like 'vinyl sticker', 'laptop sticker', 'waterproof decal')
+- 2-3 audience/style tags (like 'funny sticker', 'meme sticker')
+- Always include 'free shipping' as one tag
+- Each tag must be 1-3 words
+- No trademark or brand names
+- Return exactly 13 tags"""
+
 TITLE_PROMPT_TEMPLATE = """Generate an Etsy listing title for this sticker.
 
 Topic: {topic}
 Style: Die-cut vinyl sticker
 
 Requirements:
-- Maximum 140 characters
-- Format: '{{Trend Topic}} Sticker - {{Style}} Vinyl Decal - Laptop Water Bottle Sticker - Trending {{Category}}'
-- Include relevant keywords for Etsy search
-- Do NOT include trademark or brand names
+""" + TITLE_RULES + """
 
 Return a JSON object with a "title" field."""
 
@@ -88,16 +110,24 @@ Topic: {topic}
 Keywords: {keywords}
 
 Requirements:
-- 5-7 trend-specific tags related to the topic
-- 3-4 evergreen sticker tags (like 'vinyl sticker', 'laptop sticker', 'waterproof decal')
-- 2-3 audience/style tags (like 'funny sticker', 'meme sticker')
-- Always include 'free shipping' as one tag
-- Each tag must be 1-3 words
-- No trademark or brand names
-- Return exactly 13 tags
+""" + TAG_RULES + """
 
 Return a JSON object with a "tags" array of exactly 13 strings."""
 
+BATCH_PROMPT_TEMPLATE = """Generate an Etsy listing title and tags for each sticker topic below.
+
+{topics_json}
+
+Requirements for each title:
+""" + TITLE_RULES + """
+
+Requirements for each tag list:
+""" + TAG_RULES + """
+
+Return a JSON object with a single key "listings" containing an array with
+one object per topic, each with "index", "topic", "title", and "tags"
+fields. Copy "index" and "topic" unchanged from the input."""
+
 
 class SEOGenerator:
     """
@@ -205,6 +235,145 @@ class SEOGenerator:
             except Exception as exc:
                 logger.error("Tag generation failed: %s", exc)
 
+        return self._finalize_tags(tags, trend_topic, keywords)
+
+    def generate_batch(
+        self,
+        topics: List[str],
+        keywords_map: Optional[Dict[str, List[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate titles and tags for several topics with one API call per batch.
+
+        Topics are sent in chunks of MAX_BATCH_SIZE. Rows are matched to
+        topics by their topic text or echoed index, never by position, so a
+        reordered or renamed row cannot put one trend's copy on another.
+        Any topic without a valid matching row falls back to
+        generate_title/generate_tags.
+
+        Args:
+            topics: Trend topics to generate listing copy for.
+            keywords_map: Optional topic -> extracted keywords mapping.
+
+        Returns:
+            List of dicts with 'topic', 'title', and 'tags', in input order.
+        """
+        keywords_map = keywords_map or {}
+        results: List[Dict[str, Any]] = []
+
+        for start in range(0, len(topics), MAX_BATCH_SIZE):
+            chunk = topics[start:start + MAX_BATCH_SIZE]
+            matched = self._match_rows(chunk, self._request_batch(chunk, keywords_map))
+
+            for i, topic in enumerate(chunk):
+                keywords = keywords_map.get(topic)
+                row = matched.get(i, {})
+                title = self._validated_title(row.get("title"))
+                ai_tags = row.get("tags")
+
+                if (
+                    title is None
+                    or not isinstance(ai_tags, list)
+                    or len(ai_tags) != REQUIRED_TAG_COUNT
+                ):
+                    logger.warning(
+                        "Batch row invalid for '%s', using per-topic generation",
+                        topic[:50],
+                    )
+                    results.append({
+                        "topic": topic,
+                        "title": self.generate_title(topic),
+                        "tags": self.generate_tags(topic, keywords),
+                    })
+                    continue
+
+                tags = [str(t).lower().strip() for t in ai_tags if t]
+                results.append({
+                    "topic": topic,
+                    "title": title,
+                    "tags": self._finalize_tags(tags, topic, keywords),
+                })
+
+        return results
+
+    @staticmethod
+    def _match_rows(
+        topics: List[str], rows: List[Dict[str, Any]]
+    ) -> Dict[int, Dict[str, Any]]:
+        """Map topic positions to batch rows by exact topic, else by echoed index."""
+        positions: Dict[str, int] = {}
+        for i, topic in enumerate(topics):
+            positions.setdefault(topic, i)
+
+        matched: Dict[int, Dict[str, Any]] = {}
+        for row in rows:
+            i = positions.get(str(row.get("topic", "")))
+            if i is None:
+                index = row.get("index")
+                valid = isinstance(index, int) and not isinstance(index, bool)
+                if valid and 0 <= index < len(topics):
+                    i = index
+            if i is not None:
+                matched.setdefault(i, row)
+        return matched
+
+    def _request_batch(
+        self, topics: List[str], keywords_map: Dict[str, List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Send one batch prompt and return the raw listing rows (may be empty)."""
+        if not self._client or not topics:
+            return []
+
+        topics_json = json.dumps(
+            [
+                {
+                    "index": i,
+                    "topic": topic,
+                    "keywords": (keywords_map.get(topic) or [topic])[:10],
+                }
+                for i, topic in enumerate(topics)
+            ],
+            indent=2,
+        )
+        try:
+            response = self._client.chat.completions.create(
+                model=self._model,
+                response_format={"type": "json_object"},
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {
+                        "role": "user",
+                        "content": BATCH_PROMPT_TEMPLATE.format(topics_json=topics_json),
+                    },
+                ],
+                temperature=0.5,
+            )
+            raw = response.choices[0].message.content or ""
+            data = json.loads(raw)
+        except Exception as exc:
+            logger.error("Batch SEO generation failed: %s", exc)
+            return []
+
+        listings = data.get("listings", []) if isinstance(data, dict) else []
+        if not isinstance(listings, list):
+            return []
+        return [row if isinstance(row, dict) else {} for row in listings]
+
+    @staticmethod
+    def _validated_title(title: Any) -> Optional[str]:
+        """Return the title if it is non-empty, within length, and trademark-free."""
+        if not title:
+            return None
+        title = str(title)
+        if len(title) > MAX_TITLE_LENGTH or check_trademark(title)[0]:
+            return None
+        return title
+
+    @staticmethod
+    def _finalize_tags(
+        tags: List[str], trend_topic: str, keywords: Optional[List[str]]
+    ) -> List[str]:
+        """Filter trademarked tags and pad/trim to exactly REQUIRED_TAG_COUNT."""
         # Filter out trademarked tags
         tags = [t for t in tags if not check_trademark(t)[0]]
 
@@ -289,10 +458,5 @@ class SEOGenerator:
                 f"Perfect for decorating your laptop, water bottle, or notebook."
             )
 
-        size_label, dimensions = SIZE_MAP.get(size, ("3 inch", '3" x 3"'))
-
-        return DESCRIPTION_TEMPLATE.format(
-            ai_description=ai_description,
-            size=size_label,
-            dimensions=dimensions,
-        )
+        template = _DESCRIPTION_BY_SIZE.get(size, _DESCRIPTION_BY_SIZE["3in"])
+        return template.replace("{ai_description}", ai_description, 1)
@@ -8,6 +8,8 @@ backups, and manage objects in the R2 bucket.
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
+from datetime import datetime
 from io import BytesIO
 from typing import List, Optional
 
@@ -24,6 +26,15 @@ class StorageError(Exception):
     """Raised on R2 storage operation failures."""
 
 
+@dataclass(slots=True)
+class R2Object:
+    """Summary of an object listed from R2."""
+
+    key: str
+    size: int
+    last_modified: datetime
+
+
 class R2StorageClient:
     """
     Cloudflare R2 storage client using the S3-compatible API.
@@ -98,13 +109,17 @@ class R2StorageClient:
                 ContentType=content_type,
                 CacheControl=cache_control,
             )
-            url = f"{self._public_url}/{key}" if self._public_url else key
+            url = self.public_url(key)
             logger.info("Uploaded image to R2: %s (%d bytes)", key, len(data))
             return url
         except ClientError as exc:
             logger.error("R2 upload failed for key '%s': %s", key, exc)
             raise StorageError(f"R2 upload failed for '{key}': {exc}") from exc
 
+    def public_url(self, key: str) -> str:
+        """Public URL of an object (the bare key when no public URL is configured)."""
+        return f"{self._public_url}/{key}" if self._public_url else key
+
     def upload_backup(
         self,
         key: str,
@@ -142,22 +157,29 @@ class R2StorageClient:
             logger.error("R2 delete failed for key '%s': %s", key, exc)
             raise StorageError(f"R2 delete failed for '{key}': {exc}") from exc
 
-    def list_objects(self, prefix: str, max_keys: int = 1000) -> List[dict]:
+    def list_objects(self, prefix: str, max_keys: int = 1000) -> List[R2Object]:
         """
         List objects under a prefix.
 
+        Follows continuation tokens so prefixes with more than 1000 objects
+        are listed in full (up to max_keys per page).
+
         Returns:
-            List of dicts with 'Key', 'Size', 'LastModified'.
+            List of R2Object with key, size, and last_modified.
         """
         try:
-            response = self._client.list_objects_v2(
-                Bucket=self._bucket,
-                Prefix=prefix,
-                MaxKeys=max_keys,
-            )
-            contents = response.get("Contents", [])
-            logger.debug("Listed %d objects under prefix '%s'", len(contents), prefix)
-            return contents
+            paginator = self._client.get_paginator("list_objects_v2")
+            objects = [
+                R2Object(o["Key"], o["Size"], o["LastModified"])
+                for page in paginator.paginate(
+                    Bucket=self._bucket,
+                    Prefix=prefix,
+                    PaginationConfig={"PageSize": max_keys},
+                )
+                for o in page.get("Contents", [])
+            ]
+            logger.debug("Listed %d objects under prefix '%s'", len(objects), prefix)
+            return objects
         except ClientError as exc:
             logger.error("R2 list failed for prefix '%s': %s", prefix, exc)
             raise StorageError(f"R2 list failed for '{prefix}': {exc}") from exc
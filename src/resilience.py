@@ -7,11 +7,13 @@ circuit breaker. Every external API call should use these wrappers.
 
 from __future__ import annotations
 
+import asyncio
 import functools
 import logging
+import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, Optional, Type, Tuple
+from typing import Any, Awaitable, Callable, Dict, Optional, Type, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -50,9 +52,16 @@ class CircuitBreakerState:
     is_open: bool = False
     _opened_at: Optional[float] = field(default=None, repr=False)
     _probe_in_flight: bool = field(default=False, repr=False)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
 
     def record_failure(self) -> bool:
         """Record a failure. Returns True if the circuit just tripped open."""
+        with self._lock:
+            return self._record_failure_locked()
+
+    def _record_failure_locked(self) -> bool:
         if self.is_open:
             # Probe failed -- reset the open timer, stay open
             self._opened_at = time.monotonic()
@@ -77,20 +86,21 @@ class CircuitBreakerState:
 
     def record_success(self) -> None:
         """Record a success, resetting the failure counter and closing the circuit."""
-        if self.is_open:
-            logger.info(
-                "Circuit breaker CLOSED for service '%s' after successful probe",
-                self.service,
-            )
-        elif self.consecutive_failures > 0:
-            logger.debug(
-                "Circuit breaker reset for service '%s' after success",
-                self.service,
-            )
-        self.consecutive_failures = 0
-        self.is_open = False
-        self._opened_at = None
-        self._probe_in_flight = False
+        with self._lock:
+            if self.is_open:
+                logger.info(
+                    "Circuit breaker CLOSED for service '%s' after successful probe",
+                    self.service,
+                )
+            elif self.consecutive_failures > 0:
+                logger.debug(
+                    "Circuit breaker reset for service '%s' after success",
+                    self.service,
+                )
+            self.consecutive_failures = 0
+            self.is_open = False
+            self._opened_at = None
+            self._probe_in_flight = False
 
     def can_proceed(self) -> bool:
         """
@@ -103,18 +113,23 @@ class CircuitBreakerState:
         if not self.is_open:
             return True
 
-        # Check whether the reset timeout has elapsed
-        if self._opened_at is not None:
-            elapsed = time.monotonic() - self._opened_at
-            if elapsed >= self.reset_timeout and not self._probe_in_flight:
-                logger.info(
-                    "Circuit breaker HALF-OPEN for '%s' (%.0fs elapsed); allowing probe",
-                    self.service,
-                    elapsed,
-                )
-                self._probe_in_flight = True
+        with self._lock:
+            # Re-check under the lock: another thread may have closed it
+            if not self.is_open:
                 return True
 
+            # Check whether the reset timeout has elapsed
+            if self._opened_at is not None:
+                elapsed = time.monotonic() - self._opened_at
+                if elapsed >= self.reset_timeout and not self._probe_in_flight:
+                    logger.info(
+                        "Circuit breaker HALF-OPEN for '%s' (%.0fs elapsed); allowing probe",
+                        self.service,
+                        elapsed,
+                    )
+                    self._probe_in_flight = True
+                    return True
+
         return False
 
 
@@ -124,25 +139,41 @@ class CircuitBreakerRegistry:
 
     State resets between workflow runs (not persisted) -- instantiate
     a fresh registry at the start of each workflow.
+
+    Thread-safe: known services are pre-populated at construction so the
+    common lookup is a plain dict read; unknown services are inserted
+    under a lock so concurrent callers always share one state object.
     """
 
     def __init__(
         self, thresholds: Optional[Dict[str, int]] = None
     ) -> None:
         self._thresholds = thresholds or DEFAULT_THRESHOLDS
-        self._states: Dict[str, CircuitBreakerState] = {}
+        self._lock = threading.Lock()
+        self._states: Dict[str, CircuitBreakerState] = self._initial_states()
+
+    def _initial_states(self) -> Dict[str, CircuitBreakerState]:
+        return {
+            svc: CircuitBreakerState(service=svc, threshold=threshold)
+            for svc, threshold in self._thresholds.items()
+        }
 
     def get(self, service: str) -> CircuitBreakerState:
-        if service not in self._states:
-            threshold = self._thresholds.get(service, 5)
-            self._states[service] = CircuitBreakerState(
-                service=service, threshold=threshold
-            )
-        return self._states[service]
+        state = self._states.get(service)
+        if state is not None:
+            return state
+        with self._lock:
+            state = self._states.get(service)
+            if state is None:
+                threshold = self._thresholds.get(service, 5)
+                state = CircuitBreakerState(service=service, threshold=threshold)
+                self._states[service] = state
+            return state
 
     def reset_all(self) -> None:
         """Reset all circuit breakers (e.g. at the start of a new run)."""
-        self._states.clear()
+        with self._lock:
+            self._states = self._initial_states()
 
 
 # Module-level default registry -- replace per workflow run if needed.
@@ -174,10 +205,15 @@ def retry(
     service: Optional[str] = None,
     cb_registry: Optional[CircuitBreakerRegistry] = None,
     sleep_fn: Callable[[float], None] = time.sleep,
+    async_sleep_fn: Callable[[float], Awaitable[None]] = asyncio.sleep,
 ) -> Callable:
     """
     Decorator: retry with exponential backoff and optional circuit breaker.
 
+    Works on both plain functions and coroutine functions. Coroutines are
+    awaited on each attempt and back off with ``async_sleep_fn`` so the
+    event loop is never blocked.
+
     Args:
         max_retries: Maximum number of retry attempts (default 3).
         backoff_base: Base for exponential wait (default 2 -> 2s, 4s, 8s ...).
@@ -186,14 +222,13 @@ def retry(
         service: If provided, integrates with the circuit breaker for this service.
         cb_registry: Circuit breaker registry to use (defaults to module-level).
         sleep_fn: Sleep function (injectable for testing).
+        async_sleep_fn: Awaitable sleep used for coroutine functions
+                        (injectable for testing).
     """
 
     def decorator(fn: Callable) -> Callable:
-        @functools.wraps(fn)
-        def wrapper(*args: Any, **kwargs: Any) -> Any:
-            registry = cb_registry or circuit_breakers
-
-            # Check circuit breaker before attempting
+        def check_circuit(registry: CircuitBreakerRegistry) -> None:
+            """Raise RetryExhaustedError if the service circuit is open."""
             if service:
                 cb = registry.get(service)
                 if not cb.can_proceed():
@@ -209,6 +244,82 @@ def retry(
                         attempts=0,
                     )
 
+        def handle_failure(
+            registry: CircuitBreakerRegistry, attempt: int, exc: Exception
+        ) -> Optional[float]:
+            """
+            Record a failed attempt. Returns the backoff wait in seconds, or
+            None if no further attempts should be made.
+            """
+            if service:
+                registry.get(service).record_failure()
+                if not registry.get(service).can_proceed():
+                    logger.error(
+                        "Circuit breaker tripped for '%s' on attempt %d/%d: %s",
+                        service,
+                        attempt,
+                        max_retries,
+                        exc,
+                    )
+                    return None
+
+            if attempt < max_retries:
+                wait = min(
+                    backoff_base ** attempt, backoff_max
+                )
+                logger.warning(
+                    "Retry %d/%d for %s (service=%s) in %.1fs: %s",
+                    attempt,
+                    max_retries,
+                    fn.__name__,
+                    service or "unknown",
+                    wait,
+                    exc,
+                )
+                return wait
+
+            logger.error(
+                "All %d retries exhausted for %s (service=%s): %s",
+                max_retries,
+                fn.__name__,
+                service or "unknown",
+                exc,
+            )
+            return None
+
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def awrapper(*args: Any, **kwargs: Any) -> Any:
+                registry = cb_registry or circuit_breakers
+                check_circuit(registry)
+
+                last_exception: Optional[Exception] = None
+                for attempt in range(1, max_retries + 1):
+                    try:
+                        result = await fn(*args, **kwargs)
+                        if service:
+                            registry.get(service).record_success()
+                        return result
+                    except retryable_exceptions as exc:
+                        last_exception = exc
+                        wait = handle_failure(registry, attempt, exc)
+                        if wait is None:
+                            break
+                        await async_sleep_fn(wait)
+
+                assert last_exception is not None
+                raise RetryExhaustedError(last_exception, max_retries)
+
+            return awrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            registry = cb_registry or circuit_breakers
+
+            # Check circuit breaker before attempting
+            check_circuit(registry)
+
             last_exception: Optional[Exception] = None
             for attempt in range(1, max_retries + 1):
                 try:
@@ -219,40 +330,10 @@ def retry(
                     return result
                 except retryable_exceptions as exc:
                     last_exception = exc
-                    if service:
-                        registry.get(service).record_failure()
-                        if not registry.get(service).can_proceed():
-                            logger.error(
-                                "Circuit breaker tripped for '%s' on attempt %d/%d: %s",
-                                service,
-                                attempt,
-                                max_retries,
-                                exc,
-                            )
-                            break
-
-                    if attempt < max_retries:
-                        wait = min(
-                            backoff_base ** attempt, backoff_max
-                        )
-                        logger.warning(
-                            "Retry %d/%d for %s (service=%s) in %.1fs: %s",
-                            attempt,
-                            max_retries,
-                            fn.__name__,
-                            service or "unknown",
-                            wait,
-                            exc,
-                        )
-                        sleep_fn(wait)
-                    else:
-                        logger.error(
-                            "All %d retries exhausted for %s (service=%s): %s",
-                            max_retries,
-                            fn.__name__,
-                            service or "unknown",
-                            exc,
-                        )
+                    wait = handle_failure(registry, attempt, exc)
+                    if wait is None:
+                        break
+                    sleep_fn(wait)
 
             assert last_exception is not None
             raise RetryExhaustedError(last_exception, max_retries)
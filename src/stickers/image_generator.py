@@ -8,10 +8,19 @@ validation, post-processing, and upload to R2.
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import hashlib
 import io
 import logging
+import multiprocessing
+import os
 import sys
-from typing import Any, Dict, List, Optional
+import uuid
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
 
@@ -23,17 +32,42 @@ from src.monitoring.error_logger import ErrorLogger
 from src.monitoring.alerter import EmailAlerter
 from src.monitoring.spend_tracker import SpendTracker, estimate_replicate_cost
 from src.publisher.storage import R2StorageClient
+from src.stickers.prompt_cache import SemanticPromptCache, MAX_ENTRIES as PROMPT_CACHE_ENTRIES
 from src.stickers.prompt_generator import PromptGenerator
 from src.stickers.quality_validator import validate_image, get_modified_prompt
-from src.stickers.post_processor import process_image, PostProcessingError
+from src.stickers.post_processor import process_image, PostProcessingError, ProcessedImage
+
+try:
+    # Time-ordered ids keep a sticker's R2 keys sorted by creation time
+    from uuid6 import uuid7 as _sticker_uuid
+except ImportError:  # pragma: no cover - stdlib uuid7 on 3.14+, else uuid4
+    _sticker_uuid = getattr(uuid, "uuid7", uuid.uuid4)
+
+try:
+    import uvloop  # optional libuv event loop for the async generation path
+except ImportError:  # pragma: no cover - stdlib asyncio loop
+    uvloop = None
 
 logger = logging.getLogger(__name__)
 
 IMAGES_PER_TREND = 3
 MAX_QUALITY_RETRIES = 2
+UPLOAD_WORKERS = 4
+POST_PROCESS_WORKERS = min(4, os.cpu_count() or 1)
+IMAGE_CACHE_SIZE = 32
+PROMPT_BATCH_SIZE = 8
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DUPLICATE_TREND_SIMILARITY = 0.90
 WORKFLOW_NAME = "sticker_generator"
 
 
+@functools.lru_cache(maxsize=1024)
+def _default_prompts(topic: str) -> Tuple[str, ...]:
+    """Template prompts used when no PromptGenerator is configured."""
+    return tuple(PromptGenerator._fallback_prompts(topic, IMAGES_PER_TREND))
+
+
 class ImageGeneratorError(Exception):
     """Raised on image generation failures."""
 
@@ -49,6 +83,9 @@ class ImageGenerator:
       4. Post-process (crop, resize, transparency)
       5. Upload to R2
       6. Create sticker records in Supabase
+
+    Replicate calls for a trend's prompts run concurrently, and up to
+    max_concurrent_trends trends are processed at once.
     """
 
     def __init__(
@@ -64,6 +101,9 @@ class ImageGenerator:
         replicate_model_version: Optional[str] = None,
         replicate_client: Optional[Any] = None,
         max_images_per_day: int = 50,
+        max_concurrent_trends: int = 2,
+        prompt_cache: Optional[SemanticPromptCache] = None,
+        post_process_workers: int = POST_PROCESS_WORKERS,
     ) -> None:
         self._db = db or SupabaseClient()
         self._prompt_gen = prompt_generator
@@ -74,6 +114,21 @@ class ImageGenerator:
         self._spend_tracker = spend_tracker
         self._replicate_client = replicate_client
         self._max_images_per_day = max_images_per_day
+        self._max_concurrent_trends = max_concurrent_trends
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_users = 0
+        self._image_cache: OrderedDict[str, bytes] = OrderedDict()
+        self._prompt_cache = prompt_cache
+        self._prompt_cache_loaded = False
+        self._prompt_vecs: Dict[str, Any] = {}
+        # prompt -> R2 key of an original already stored for it
+        self._original_keys: Dict[str, str] = {}
+        self._upload_executor = ThreadPoolExecutor(
+            max_workers=UPLOAD_WORKERS, thread_name_prefix="r2-upload",
+        )
+        # 0 disables the process pool and post-processes on a worker thread
+        self._post_process_workers = post_process_workers
+        self._process_pool: Optional[ProcessPoolExecutor] = None
 
         cfg = load_config(require_all=False)
         self._replicate_token = replicate_api_token or cfg.replicate.api_token
@@ -88,10 +143,128 @@ class ImageGenerator:
             except Exception as exc:
                 logger.error("Failed to initialize Replicate client: %s", exc)
 
+    @contextlib.asynccontextmanager
+    async def _http_session(self) -> AsyncIterator[None]:
+        """
+        Share one pooled HTTP/2 AsyncClient across every download in a run.
+
+        Sessions are reference-counted: concurrent callers (e.g. several
+        generate_for_trend_async tasks) share the client, and it is closed
+        only when the last of them exits.
+        """
+        if self._http is None:
+            self._http = httpx.AsyncClient(http2=True, timeout=60, limits=HTTP_LIMITS)
+        self._http_users += 1
+        try:
+            yield
+        finally:
+            self._http_users -= 1
+            if self._http_users == 0:
+                client, self._http = self._http, None
+                await client.aclose()
+
+    async def _download(self, url: str) -> bytes:
+        """
+        GET an image URL over the run's shared AsyncClient.
+
+        The body is streamed into a single BytesIO so only one buffer of the
+        image is ever held; getvalue() hands that buffer back without a copy.
+        """
+        async with self._http_session():
+            async with self._http.stream("GET", url) as response:
+                response.raise_for_status()
+                buf = io.BytesIO()
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    buf.write(chunk)
+        return buf.getvalue()
+
+    @property
+    def _model_ref(self) -> str:
+        if self._model_version:
+            return f"{self._model_id}:{self._model_version}"
+        return self._model_id
+
+    def _image_cache_key(self, prompt: str) -> str:
+        """Hash of everything that determines Replicate's output for a prompt."""
+        raw = f"{prompt}|{self._model_ref}|{self._image_size}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _remember_image(self, cache_key: str, image_bytes: bytes) -> None:
+        self._image_cache[cache_key] = image_bytes
+        self._image_cache.move_to_end(cache_key)
+        while len(self._image_cache) > IMAGE_CACHE_SIZE:
+            self._image_cache.popitem(last=False)
+
+    def _load_cached_image(self, cache_key: str) -> Optional[Tuple[bytes, str]]:
+        """Fetch a previously generated original from R2 via the image_cache table."""
+        if not self._storage:
+            return None
+        try:
+            row = self._db.get_image_cache(cache_key)
+            if not row:
+                return None
+            return self._storage.get_object(row["r2_key"]), row["r2_key"]
+        except Exception as exc:
+            logger.warning("Image cache lookup failed: %s", exc)
+            return None
+
+    def _load_prompt_cache(self) -> None:
+        """Seed the semantic prompt cache from recent image_cache rows (once)."""
+        if self._prompt_cache is None or self._prompt_cache_loaded:
+            return
+        self._prompt_cache_loaded = True
+        try:
+            self._prompt_cache.load(
+                self._db.get_recent_image_cache(limit=PROMPT_CACHE_ENTRIES)
+            )
+        except Exception as exc:
+            logger.warning("Failed to load semantic prompt cache: %s", exc)
+
+    def _load_similar_image(self, prompt: str) -> Optional[Tuple[bytes, str]]:
+        """Fetch the original of a near-duplicate prompt from R2, if any."""
+        if self._prompt_cache is None or not self._storage:
+            return None
+        try:
+            vec = self._prompt_vecs.get(prompt)
+            if vec is not None:
+                r2_key = self._prompt_cache.lookup_vector(vec)
+            else:
+                r2_key = self._prompt_cache.lookup(prompt)
+            if not r2_key:
+                return None
+            logger.info("Semantic cache hit for prompt '%s' -> %s", prompt[:50], r2_key)
+            return self._storage.get_object(r2_key), r2_key
+        except Exception as exc:
+            logger.warning("Semantic prompt cache lookup failed: %s", exc)
+            return None
+
+    async def _generate_cached_image(self, prompt: str) -> bytes:
+        """
+        Return image bytes for a prompt, skipping Replicate when the same
+        prompt/model/size was already generated in this process or a
+        previous run, or when a near-duplicate prompt was.
+        """
+        cache_key = self._image_cache_key(prompt)
+        cached = self._image_cache.get(cache_key)
+        if cached is None:
+            hit = await asyncio.to_thread(self._load_cached_image, cache_key)
+            if hit is None:
+                hit = await asyncio.to_thread(self._load_similar_image, prompt)
+            if hit is not None:
+                cached, self._original_keys[prompt] = hit
+        if cached is not None:
+            logger.info("Image cache hit for prompt '%s'", prompt[:50])
+            self._remember_image(cache_key, cached)
+            return cached
+
+        image_bytes = await self._generate_single_image(prompt)
+        self._remember_image(cache_key, image_bytes)
+        return image_bytes
+
     @retry(max_retries=3, service="replicate")
-    def _generate_single_image(self, prompt: str) -> bytes:
+    async def _generate_single_image(self, prompt: str) -> bytes:
         """
-        Generate a single image via Replicate SDXL.
+        Generate a single image via Replicate.
 
         Args:
             prompt: The image generation prompt.
@@ -102,14 +275,8 @@ class ImageGenerator:
         if not self._replicate_client:
             raise ImageGeneratorError("Replicate client not initialized")
 
-        model_ref = (
-            f"{self._model_id}:{self._model_version}"
-            if self._model_version
-            else self._model_id
-        )
-
-        output = self._replicate_client.run(
-            model_ref,
+        output = await self._replicate_client.async_run(
+            self._model_ref,
             input={
                 "prompt": prompt,
                 "width": self._image_size,
@@ -125,163 +292,425 @@ class ImageGenerator:
                 f"Replicate returned unexpected output: {type(output).__name__}"
             )
 
-        image_url = str(output[0])
-        response = httpx.get(image_url, timeout=60)
-        response.raise_for_status()
-        image_bytes = response.content
+        image_bytes = await self._download(str(output[0]))
 
         if len(image_bytes) == 0:
             raise ImageGeneratorError("Replicate returned empty image")
 
         return image_bytes
 
-    def generate_for_trend(
+    async def _generate_validated_image(
         self,
+        prompt: str,
+        index: int,
         trend: Dict[str, Any],
-        run_id: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+        run_id: Optional[str],
+    ) -> Tuple[Optional[bytes], str]:
         """
-        Generate sticker images for a single trend.
-
-        Args:
-            trend: Trend dict from Supabase (must have 'id', 'topic').
-            run_id: Pipeline run ID for error logging.
+        Generate an image for one prompt, retrying with a modified prompt
+        when quality validation fails.
 
         Returns:
-            List of created sticker dicts.
+            (image_bytes, prompt_used). image_bytes is None if every attempt
+            failed generation or validation.
         """
         trend_id = trend.get("id", "")
         topic = trend.get("topic", "")
-        stickers_created: List[Dict[str, Any]] = []
+        current_prompt = prompt
 
-        # Generate prompts
-        if self._prompt_gen:
+        for retry_num in range(MAX_QUALITY_RETRIES + 1):
             try:
-                prompts = self._prompt_gen.generate_prompts(topic)
-            except Exception as exc:
-                logger.error("Prompt generation failed for '%s': %s", topic[:50], exc)
+                raw_bytes = await self._generate_cached_image(current_prompt)
+            except (RetryExhaustedError, ImageGeneratorError, Exception) as exc:
+                logger.error(
+                    "Image generation failed for trend '%s' prompt %d: %s",
+                    topic[:50], index + 1, exc,
+                )
                 self._error_logger.log_error(
-                    workflow=WORKFLOW_NAME, step="prompt_generation",
+                    workflow=WORKFLOW_NAME, step="image_generation",
                     error_type="api_error", error_message=str(exc),
-                    service="openai", pipeline_run_id=run_id,
-                    context={"trend_id": trend_id},
+                    service="replicate", pipeline_run_id=run_id,
+                    context={"trend_id": trend_id, "prompt_index": index},
                 )
-                self._update_trend_status(trend_id, "generation_failed")
-                return []
-        else:
-            logger.warning("No prompt generator available, using default prompts")
-            from src.stickers.prompt_generator import PromptGenerator as PG
-            prompts = PG._fallback_prompts(topic, IMAGES_PER_TREND)
+                break
 
-        all_failed = True
+            # Validate quality
+            validation = validate_image(raw_bytes)
+            if validation.passed:
+                return raw_bytes, current_prompt
 
-        for i, prompt in enumerate(prompts[:IMAGES_PER_TREND]):
-            image_bytes = None
-            current_prompt = prompt
+            logger.warning(
+                "Quality validation failed for trend '%s' prompt %d (retry %d): %s",
+                topic[:50], index + 1, retry_num,
+                "; ".join(validation.failures),
+            )
+            if retry_num < MAX_QUALITY_RETRIES:
+                current_prompt = get_modified_prompt(current_prompt)
 
-            # Try generating with quality retries
-            for retry_num in range(MAX_QUALITY_RETRIES + 1):
-                try:
-                    raw_bytes = self._generate_single_image(current_prompt)
-                except (RetryExhaustedError, ImageGeneratorError, Exception) as exc:
-                    logger.error(
-                        "Image generation failed for trend '%s' prompt %d: %s",
-                        topic[:50], i + 1, exc,
-                    )
-                    self._error_logger.log_error(
-                        workflow=WORKFLOW_NAME, step="image_generation",
-                        error_type="api_error", error_message=str(exc),
-                        service="replicate", pipeline_run_id=run_id,
-                        context={"trend_id": trend_id, "prompt_index": i},
-                    )
-                    break
+        logger.warning(
+            "All retries exhausted for trend '%s' prompt %d",
+            topic[:50], index + 1,
+        )
+        return None, current_prompt
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            # spawn: forking a process that already runs upload threads and
+            # an event loop is unsafe
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self._post_process_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._process_pool
+
+    async def _post_process(
+        self,
+        image_bytes: bytes,
+        topic: str,
+        index: int,
+    ) -> Optional[ProcessedImage]:
+        """
+        Run the CPU-bound post-processor off the event loop (and the GIL).
+
+        Any failure, including a worker killed mid-task or an unpicklable
+        result, costs only this image. A broken pool is dropped so the next
+        call starts a fresh one.
+        """
+        pool: Optional[ProcessPoolExecutor] = None
+        try:
+            if self._post_process_workers > 0:
+                pool = self._get_process_pool()
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(pool, process_image, image_bytes)
+            return await asyncio.to_thread(process_image, image_bytes)
+        except PostProcessingError as exc:
+            logger.error(
+                "Post-processing failed for trend '%s' prompt %d: %s",
+                topic[:50], index + 1, exc,
+            )
+        except BrokenExecutor as exc:
+            logger.error(
+                "Post-processing pool broke for trend '%s' prompt %d: %s",
+                topic[:50], index + 1, exc,
+            )
+            # Concurrent images see the same broken pool; replace it once
+            if pool is not None and self._process_pool is pool:
+                self._process_pool = None
+                pool.shutdown(wait=False)
+        except Exception as exc:
+            logger.error(
+                "Post-processing crashed for trend '%s' prompt %d: %s",
+                topic[:50], index + 1, exc,
+            )
+        return None
 
-                # Validate quality
-                validation = validate_image(raw_bytes)
-                if validation.passed:
-                    image_bytes = raw_bytes
-                    break
+    def close(self) -> None:
+        """Shut down the upload and post-processing worker pools."""
+        self._upload_executor.shutdown(wait=True)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+
+    def _upload_sticker(
+        self,
+        trend: Dict[str, Any],
+        image_bytes: bytes,
+        processed: ProcessedImage,
+        prompt: str,
+        run_id: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Upload one post-processed image and build its sticker row."""
+        trend_id = trend.get("id", "")
+        topic = trend.get("topic", "")
+
+        # Upload to R2. The original is the untouched Replicate output; if it
+        # came from the image cache it is already in R2 and is not re-uploaded.
+        if self._storage:
+            try:
+                sticker_id = str(_sticker_uuid())
+                print_key = f"stickers/{sticker_id}/print_ready.png"
+                thumb_key = f"stickers/{sticker_id}/thumbnail.png"
+                uploads = [
+                    (print_key, processed.print_ready),
+                    (thumb_key, processed.thumbnail),
+                ]
+                existing_key = self._original_keys.get(prompt)
+                if existing_key:
+                    original_key = existing_key
                 else:
-                    logger.warning(
-                        "Quality validation failed for trend '%s' prompt %d (retry %d): %s",
-                        topic[:50], i + 1, retry_num,
-                        "; ".join(validation.failures),
-                    )
-                    if retry_num < MAX_QUALITY_RETRIES:
-                        current_prompt = get_modified_prompt(current_prompt)
+                    original_key = f"stickers/{sticker_id}/original.png"
+                    uploads.insert(0, (original_key, image_bytes))
 
-            if image_bytes is None:
-                logger.warning(
-                    "All retries exhausted for trend '%s' prompt %d",
-                    topic[:50], i + 1,
+                urls = self._upload_all(uploads)
+                if existing_key:
+                    original_url = self._storage.public_url(existing_key)
+                    print_url, thumb_url = urls
+                else:
+                    original_url, print_url, thumb_url = urls
+                    self._original_keys[prompt] = original_key
+            except Exception as exc:
+                logger.error("R2 upload failed: %s", exc)
+                self._error_logger.log_error(
+                    workflow=WORKFLOW_NAME, step="image_upload",
+                    error_type="api_error", error_message=str(exc),
+                    service="r2", pipeline_run_id=run_id,
+                    context={"trend_id": trend_id},
                 )
-                continue
+                return None
 
-            # Post-process
             try:
-                processed = process_image(image_bytes)
-            except PostProcessingError as exc:
-                logger.error(
-                    "Post-processing failed for trend '%s' prompt %d: %s",
-                    topic[:50], i + 1, exc,
+                # Store the embedding with the row so the next run's warm
+                # start loads it instead of re-encoding the prompt.
+                vec = None
+                if self._prompt_cache is not None and not existing_key:
+                    vec = self._prompt_vecs.get(prompt)
+                    if vec is None:
+                        vec = self._prompt_cache.encode([prompt])[0]
+                self._db.upsert_image_cache(
+                    self._image_cache_key(prompt), original_key, prompt=prompt,
+                    embedding=vec.tolist() if vec is not None else None,
                 )
-                continue
+                if vec is not None:
+                    self._prompt_cache.add_vector(vec, original_key)
+            except Exception as exc:
+                logger.warning("Failed to record image cache entry: %s", exc)
+        else:
+            original_url = ""
+            print_url = ""
+            thumb_url = ""
+
+        return {
+            "trend_id": trend_id,
+            "title": f"Trending Sticker - {topic[:80]}",
+            "image_url": print_url,
+            "thumbnail_url": thumb_url,
+            "original_url": original_url,
+            "size": "3in",
+            "generation_prompt": prompt[:1000],
+            "generation_model": self._model_id,
+            "generation_model_version": self._model_version or "",
+            "moderation_status": "pending",
+        }
+
+    def _insert_stickers(
+        self, rows: List[Dict[str, Any]], trend: Dict[str, Any], run_id: Optional[str],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Create all of a trend's sticker records in one round trip.
 
-            # Upload to R2
-            if self._storage:
-                try:
-                    import uuid
-                    sticker_id = str(uuid.uuid4())
-                    original_key = f"stickers/{sticker_id}/original.png"
-                    print_key = f"stickers/{sticker_id}/print_ready.png"
-                    thumb_key = f"stickers/{sticker_id}/thumbnail.png"
-
-                    original_url = self._storage.upload_image(original_key, image_bytes)
-                    print_url = self._storage.upload_image(print_key, processed.print_ready)
-                    thumb_url = self._storage.upload_image(thumb_key, processed.thumbnail)
-                except Exception as exc:
-                    logger.error("R2 upload failed: %s", exc)
-                    self._error_logger.log_error(
-                        workflow=WORKFLOW_NAME, step="image_upload",
-                        error_type="api_error", error_message=str(exc),
-                        service="r2", pipeline_run_id=run_id,
-                        context={"trend_id": trend_id},
-                    )
-                    continue
-            else:
-                original_url = ""
-                print_url = ""
-                thumb_url = ""
+        Returns None (after logging the error) if the insert failed.
+        """
+        if not rows:
+            return []
+        try:
+            stickers = self._db.insert_stickers(rows)
+        except DatabaseError as exc:
+            logger.error("Failed to create sticker records: %s", exc)
+            self._error_logger.log_error(
+                workflow=WORKFLOW_NAME, step="sticker_insert",
+                error_type="api_error", error_message=str(exc),
+                service="supabase", pipeline_run_id=run_id,
+                context={"trend_id": trend.get("id", ""), "sticker_count": len(rows)},
+            )
+            return None
+        logger.info(
+            "Created %d stickers for trend '%s'", len(stickers), trend.get("topic", "")[:50],
+        )
+        return stickers
+
+    def _upload_all(self, items: List[Tuple[str, bytes]]) -> List[str]:
+        """Upload several (key, bytes) pairs to R2 in parallel; returns URLs in order."""
+        futures = [
+            self._upload_executor.submit(self._storage.upload_image, key, data)
+            for key, data in items
+        ]
+        return [f.result() for f in futures]
 
-            # Create sticker record
+    def generate_for_trend(
+        self,
+        trend: Dict[str, Any],
+        run_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate sticker images for a single trend.
+
+        Synchronous wrapper around generate_for_trend_async(); must not be
+        called from inside a running event loop.
+
+        Args:
+            trend: Trend dict from Supabase (must have 'id', 'topic').
+            run_id: Pipeline run ID for error logging.
+
+        Returns:
+            List of created sticker dicts.
+        """
+        return asyncio.run(self.generate_for_trend_async(trend, run_id=run_id))
+
+    async def _prompts_for_trend(
+        self,
+        trend: Dict[str, Any],
+        run_id: Optional[str],
+    ) -> List[str]:
+        """Generate the image prompts for one trend; [] if generation failed."""
+        topic = trend.get("topic", "")
+        if not self._prompt_gen:
+            logger.warning("No prompt generator available, using default prompts")
+            return list(_default_prompts(topic))
+
+        try:
+            return await asyncio.to_thread(self._prompt_gen.generate_prompts, topic)
+        except Exception as exc:
+            logger.error("Prompt generation failed for '%s': %s", topic[:50], exc)
+            self._error_logger.log_error(
+                workflow=WORKFLOW_NAME, step="prompt_generation",
+                error_type="api_error", error_message=str(exc),
+                service="openai", pipeline_run_id=run_id,
+                context={"trend_id": trend.get("id", "")},
+            )
+            return []
+
+    async def _prompts_for_trends(
+        self,
+        trends: List[Dict[str, Any]],
+        run_id: Optional[str],
+    ) -> List[List[str]]:
+        """Generate prompts for several trends in one batched request."""
+        topics = [t.get("topic", "") for t in trends]
+        if not self._prompt_gen:
+            logger.warning("No prompt generator available, using default prompts")
+            return [list(_default_prompts(topic)) for topic in topics]
+
+        try:
+            return await asyncio.to_thread(
+                self._prompt_gen.generate_prompts_batch, [(topic, "") for topic in topics],
+            )
+        except Exception as exc:
+            logger.error("Batch prompt generation failed for %d trends: %s", len(trends), exc)
+            self._error_logger.log_error(
+                workflow=WORKFLOW_NAME, step="prompt_generation",
+                error_type="api_error", error_message=str(exc),
+                service="openai", pipeline_run_id=run_id,
+                context={"trend_ids": [t.get("id", "") for t in trends]},
+            )
+            return [[] for _ in trends]
+
+    async def _prepare_prompts(
+        self,
+        trends: List[Dict[str, Any]],
+        run_id: Optional[str],
+    ) -> Dict[str, List[str]]:
+        """
+        Generate prompts for every trend that can fit under the daily cap,
+        PROMPT_BATCH_SIZE trends per OpenAI request, then embed all of them
+        for the semantic cache in a single batch.
+        """
+        limit = -(-self._max_images_per_day // IMAGES_PER_TREND)
+        semaphore = asyncio.Semaphore(max(1, self._max_concurrent_trends))
+
+        async def prompts_for(chunk: List[Dict[str, Any]]) -> List[List[str]]:
+            async with semaphore:
+                return await self._prompts_for_trends(chunk, run_id)
+
+        batch = trends[:limit]
+        chunks = [
+            batch[i:i + PROMPT_BATCH_SIZE] for i in range(0, len(batch), PROMPT_BATCH_SIZE)
+        ]
+        results = [
+            prompts
+            for chunk_prompts in await asyncio.gather(*(prompts_for(c) for c in chunks))
+            for prompts in chunk_prompts
+        ]
+        prepared = {t.get("id", ""): p for t, p in zip(batch, results)}
+
+        all_prompts = [p for prompts in results for p in prompts[:IMAGES_PER_TREND]]
+        if self._prompt_cache is not None and all_prompts:
             try:
-                sticker_data = {
-                    "trend_id": trend_id,
-                    "title": f"Trending Sticker - {topic[:80]}",
-                    "image_url": print_url,
-                    "thumbnail_url": thumb_url,
-                    "original_url": original_url,
-                    "size": "3in",
-                    "generation_prompt": current_prompt[:1000],
-                    "generation_model": self._model_id,
-                    "generation_model_version": self._model_version or "",
-                    "moderation_status": "pending",
-                }
-                sticker = self._db.insert_sticker(sticker_data)
-                stickers_created.append(sticker)
-                all_failed = False
-                logger.info(
-                    "Created sticker for trend '%s' (prompt %d)",
-                    topic[:50], i + 1,
-                )
-            except DatabaseError as exc:
-                logger.error("Failed to create sticker record: %s", exc)
+                vecs = await asyncio.to_thread(self._prompt_cache.encode, all_prompts)
+                self._prompt_vecs.update(zip(all_prompts, vecs))
+            except Exception as exc:
+                logger.warning("Batch prompt embedding failed: %s", exc)
+        return prepared
+
+    async def _produce_sticker(
+        self,
+        prompt: str,
+        index: int,
+        trend: Dict[str, Any],
+        run_id: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Generate, post-process, and upload one image; returns its sticker row."""
+        image_bytes, prompt_used = await self._generate_validated_image(
+            prompt, index, trend, run_id,
+        )
+        if image_bytes is None:
+            return None
+        processed = await self._post_process(image_bytes, trend.get("topic", ""), index)
+        if processed is None:
+            return None
+        return await asyncio.to_thread(
+            self._upload_sticker, trend, image_bytes, processed, prompt_used, run_id,
+        )
+
+    async def generate_for_trend_async(
+        self,
+        trend: Dict[str, Any],
+        run_id: Optional[str] = None,
+        prompts: Optional[List[str]] = None,
+        status_updates: Optional[Dict[str, List[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate sticker images for a single trend.
+
+        All IMAGES_PER_TREND prompts are pipelined concurrently: each image
+        moves on to post-processing and upload as soon as it is generated.
+        CPU and blocking I/O run off the event loop.
+
+        Args:
+            trend: Trend dict from Supabase (must have 'id', 'topic').
+            run_id: Pipeline run ID for error logging.
+            prompts: Pre-generated prompts; generated here when None.
+            status_updates: When given, the trend's new status is queued here
+                (status -> trend ids) for a batched write instead of being
+                written immediately.
+
+        Returns:
+            List of created sticker dicts.
+        """
+        trend_id = trend.get("id", "")
+        topic = trend.get("topic", "")
+
+        def set_status(status: str) -> None:
+            if status_updates is None:
+                self._update_trend_status(trend_id, status)
+            else:
+                status_updates.setdefault(status, []).append(trend_id)
+
+        if prompts is None:
+            prompts = await self._prompts_for_trend(trend, run_id)
+        if not prompts:
+            set_status("generation_failed")
+            return []
+
+        # Each prompt runs its own generate -> post-process -> upload chain,
+        # so one image's Replicate call overlaps another's processing/upload.
+        async with self._http_session():
+            results = await asyncio.gather(*(
+                self._produce_sticker(prompt, i, trend, run_id)
+                for i, prompt in enumerate(prompts[:IMAGES_PER_TREND])
+            ))
+        rows = [row for row in results if row is not None]
+
+        stickers_created = await asyncio.to_thread(self._insert_stickers, rows, trend, run_id)
+        if stickers_created is None:
+            # Images were produced but not recorded; leave the trend's status
+            # alone so the next run picks it up again
+            return []
 
         # Update trend status
         if stickers_created:
-            self._update_trend_status(trend_id, "generated")
-        elif all_failed:
-            self._update_trend_status(trend_id, "generation_failed")
+            set_status("generated")
+        else:
+            set_status("generation_failed")
             if self._alerter:
                 self._alerter.send_alert(
                     f"Generation failed for trend: {topic[:50]}",
@@ -291,6 +720,117 @@ class ImageGenerator:
 
         return stickers_created
 
+    async def _generate_all(
+        self,
+        trends: List[Dict[str, Any]],
+        run_id: Optional[str],
+    ) -> int:
+        """
+        Generate stickers for several trends, at most max_concurrent_trends
+        at a time. Returns the number of stickers created.
+        """
+        trends, duplicates = await asyncio.to_thread(self._dedupe_trends, trends)
+        prepared = await self._prepare_prompts(trends, run_id)
+        semaphore = asyncio.Semaphore(max(1, self._max_concurrent_trends))
+        status_updates: Dict[str, List[str]] = {}
+        total = 0
+        # Images created plus a full trend's worth for each trend in flight,
+        # so concurrent trends cannot all pass the cap check before any of
+        # them has added its stickers
+        reserved = 0
+        cap_logged = False
+
+        async def process(trend: Dict[str, Any]) -> None:
+            nonlocal total, reserved, cap_logged
+            async with semaphore:
+                if reserved >= self._max_images_per_day:
+                    if not cap_logged:
+                        logger.info(
+                            "Daily image cap reached (%d)", self._max_images_per_day,
+                        )
+                        cap_logged = True
+                    return
+                reserved += IMAGES_PER_TREND
+                stickers: List[Dict[str, Any]] = []
+                try:
+                    stickers = await self.generate_for_trend_async(
+                        trend, run_id=run_id, prompts=prepared.get(trend.get("id", "")),
+                        status_updates=status_updates,
+                    )
+                finally:
+                    # Release the part of the reservation that was not used
+                    reserved -= IMAGES_PER_TREND - len(stickers)
+                total += len(stickers)
+
+        try:
+            async with self._http_session():
+                await asyncio.gather(*(process(t) for t in trends))
+        finally:
+            self._prompt_vecs.clear()
+            self._original_keys.clear()
+            await asyncio.to_thread(self._flush_trend_statuses, status_updates)
+            await asyncio.to_thread(
+                self._mark_duplicates, duplicates, status_updates.get("generated", []),
+            )
+        return total
+
+    def _dedupe_trends(
+        self, trends: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
+        """
+        Greedily cluster trends whose topic embeddings are near-duplicates.
+
+        The first trend of each cluster (highest score, as fetched) is kept;
+        the rest are dropped from this run. Returns (kept_trends,
+        {leader_id: [duplicate trend ids]}).
+        """
+        if self._prompt_cache is None or len(trends) < 2:
+            return trends, {}
+        try:
+            vecs = self._prompt_cache.encode([t.get("topic", "") for t in trends])
+        except Exception as exc:
+            logger.warning("Trend topic embedding failed: %s", exc)
+            return trends, {}
+
+        sims = vecs @ vecs.T
+        assigned = [False] * len(trends)
+        kept: List[Dict[str, Any]] = []
+        duplicates: Dict[str, List[str]] = {}
+        for i, trend in enumerate(trends):
+            if assigned[i]:
+                continue
+            kept.append(trend)
+            for j in range(i + 1, len(trends)):
+                if not assigned[j] and sims[i, j] > DUPLICATE_TREND_SIMILARITY:
+                    assigned[j] = True
+                    duplicates.setdefault(trend.get("id", ""), []).append(
+                        trends[j].get("id", ""),
+                    )
+                    logger.info(
+                        "Trend '%s' duplicates '%s'; skipping generation",
+                        trends[j].get("topic", "")[:50], trend.get("topic", "")[:50],
+                    )
+        return kept, duplicates
+
+    def _mark_duplicates(
+        self, duplicates: Dict[str, List[str]], generated: List[str],
+    ) -> None:
+        """Point duplicates of successfully generated trends at their leader."""
+        generated_ids = set(generated)
+        for leader_id, trend_ids in duplicates.items():
+            # Duplicates of a failed or skipped leader stay 'discovered'
+            if leader_id not in generated_ids:
+                continue
+            try:
+                self._db.update_trends(
+                    trend_ids, {"status": "generated", "canonical_trend_id": leader_id},
+                )
+            except DatabaseError as exc:
+                logger.error(
+                    "Failed to link %d duplicate trends to %s: %s",
+                    len(trend_ids), leader_id, exc,
+                )
+
     def run(self) -> int:
         """
         Process all discovered trends, generating sticker images.
@@ -327,15 +867,10 @@ class ImageGenerator:
                 return 0
 
             logger.info("Processing %d discovered trends", len(trends))
+            self._load_prompt_cache()
 
-            for trend in trends:
-                stickers = self.generate_for_trend(trend, run_id=run_id)
-                total_stickers += len(stickers)
-                total_images += len(stickers)
-
-                if total_images >= self._max_images_per_day:
-                    logger.info("Daily image cap reached (%d)", self._max_images_per_day)
-                    break
+            total_stickers = asyncio.run(self._generate_all(trends, run_id))
+            total_images = total_stickers
 
             ai_cost = estimate_replicate_cost(total_images)
             self._pipeline_logger.complete_run(
@@ -359,6 +894,17 @@ class ImageGenerator:
         except DatabaseError as exc:
             logger.error("Failed to update trend %s status: %s", trend_id, exc)
 
+    def _flush_trend_statuses(self, status_updates: Dict[str, List[str]]) -> None:
+        """Write queued trend statuses with one update per status."""
+        for status, trend_ids in status_updates.items():
+            try:
+                self._db.update_trends_status(trend_ids, status)
+            except DatabaseError as exc:
+                logger.error(
+                    "Failed to set status '%s' on %d trends: %s",
+                    status, len(trend_ids), exc,
+                )
+
 
 def main() -> None:
     """Entry point for `python -m src.stickers.image_generator`."""
@@ -371,14 +917,19 @@ def main() -> None:
         logger.critical("Failed to load config: %s", exc)
         sys.exit(1)
 
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     db = SupabaseClient()
     generator = ImageGenerator(
         db=db,
-        prompt_generator=PromptGenerator(),
+        prompt_generator=PromptGenerator(db=db),
         storage=R2StorageClient(),
         alerter=EmailAlerter(),
         spend_tracker=SpendTracker(db=db),
         max_images_per_day=cfg.caps.max_images_per_day,
+        max_concurrent_trends=cfg.caps.max_concurrent_trends,
+        prompt_cache=SemanticPromptCache.create(),
     )
 
     try:
@@ -388,6 +939,8 @@ def main() -> None:
     except Exception as exc:
         logger.critical("Sticker generator failed: %s", exc)
         sys.exit(1)
+    finally:
+        generator.close()
 
 
 if __name__ == "__main__":
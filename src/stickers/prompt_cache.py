@@ -0,0 +1,141 @@
+"""
+Semantic prompt cache for Sticker Trendz.
+
+Embeds image prompts and matches new prompts against previously generated
+ones by cosine similarity, so a near-duplicate prompt (common across
+related trends) can reuse an existing image instead of calling Replicate.
+
+Embeddings come from a small local SentenceTransformer model when the
+optional ``sentence-transformers`` package is installed; otherwise the
+cache is disabled and every prompt goes to Replicate.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer  # optional
+except ImportError:  # pragma: no cover - cache disabled without it
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+ENCODE_BATCH_SIZE = 64
+SIMILARITY_THRESHOLD = 0.93
+MAX_ENTRIES = 5000
+
+# Maps a list of prompts to an (N, D) array of L2-normalized embeddings
+Encoder = Callable[[List[str]], np.ndarray]
+
+
+class SemanticPromptCache:
+    """
+    Bounded in-memory vector store of prompt embeddings -> R2 keys.
+
+    Vectors are normalized, so cosine similarity is a single matrix-vector
+    product. At MAX_ENTRIES rows a brute-force scan stays well under a
+    millisecond, so no ANN index is needed. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        encoder: Encoder,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries: int = MAX_ENTRIES,
+    ) -> None:
+        self._encoder = encoder
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._vecs: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, **kwargs: Any) -> Optional["SemanticPromptCache"]:
+        """Build a cache backed by the local embedding model, or None if unavailable."""
+        if SentenceTransformer is None:
+            logger.info("sentence-transformers not installed; semantic prompt cache disabled")
+            return None
+        try:
+            model = SentenceTransformer(EMBEDDING_MODEL)
+        except Exception as exc:
+            logger.warning("Failed to load embedding model '%s': %s", EMBEDDING_MODEL, exc)
+            return None
+
+        def encode(prompts: List[str]) -> np.ndarray:
+            return model.encode(
+                prompts, batch_size=ENCODE_BATCH_SIZE,
+                convert_to_numpy=True, normalize_embeddings=True,
+            )
+
+        return cls(encode, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def encode(self, prompts: List[str]) -> np.ndarray:
+        return np.asarray(self._encoder(prompts), dtype=np.float32)
+
+    def load(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Seed the cache from image_cache rows with 'prompt' and 'r2_key'.
+
+        Rows carrying a stored 'embedding' are loaded as-is; only the rest
+        are encoded. If stored and fresh embeddings disagree in dimension
+        (e.g. the model changed), everything is re-encoded.
+        """
+        rows = [r for r in rows if r.get("prompt") and r.get("r2_key")]
+        if not rows:
+            return
+        stored = [r.get("embedding") for r in rows]
+        missing = [r["prompt"] for r, vec in zip(rows, stored) if not vec]
+        try:
+            fresh = iter(self.encode(missing) if missing else ())
+            vecs = np.asarray(
+                [vec if vec else next(fresh) for vec in stored], dtype=np.float32,
+            )
+        except ValueError:  # ragged: stored vectors from a different model
+            vecs = self.encode([r["prompt"] for r in rows])
+        self._append(vecs, [r["r2_key"] for r in rows])
+        logger.info(
+            "Loaded %d prompts into semantic cache (%d embedded)", len(rows), len(missing),
+        )
+
+    def lookup(self, prompt: str) -> Optional[str]:
+        """Return the R2 key of the most similar cached prompt above threshold."""
+        return self.lookup_vector(self.encode([prompt])[0])
+
+    def lookup_vector(self, vec: np.ndarray) -> Optional[str]:
+        with self._lock:
+            if self._vecs is None:
+                return None
+            sims = self._vecs @ vec
+            best = int(np.argmax(sims))
+            if sims[best] <= self._threshold:
+                return None
+            return self._keys[best]
+
+    def add(self, prompt: str, r2_key: str) -> None:
+        self.add_vector(self.encode([prompt])[0], r2_key)
+
+    def add_vector(self, vec: np.ndarray, r2_key: str) -> None:
+        self._append(np.asarray(vec, dtype=np.float32).reshape(1, -1), [r2_key])
+
+    def _append(self, vecs: np.ndarray, keys: List[str]) -> None:
+        """Append embeddings, evicting the oldest entries past max_entries."""
+        with self._lock:
+            if self._vecs is None:
+                self._vecs = vecs
+            else:
+                self._vecs = np.vstack((self._vecs, vecs))
+            self._keys.extend(keys)
+            overflow = len(self._keys) - self._max_entries
+            if overflow > 0:
+                self._vecs = self._vecs[overflow:]
+                del self._keys[:overflow]
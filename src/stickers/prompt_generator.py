@@ -7,16 +7,35 @@ Each prompt follows the die-cut vinyl sticker template from the spec.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
 from src.config import load_config
 from src.resilience import retry, RetryExhaustedError
 
+if TYPE_CHECKING:
+    from src.db import SupabaseClient
+
+try:
+    # orjson accepts str directly and raises a json.JSONDecodeError subclass
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - stdlib fallback
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 PROMPTS_PER_TREND = 3
+# Trends per batched request; larger batches start to lose per-item accuracy
+MAX_BATCH_SIZE = 16
+MAX_CONCURRENT_REQUESTS = 8
+MAX_SHAPE_ATTEMPTS = 3  # re-asks for short/malformed replies (no circuit breaker)
+PROMPT_CACHE_SIZE = 1024
+PROMPT_CACHE_TTL = timedelta(days=1)
 
 STYLE_DIRECTIVES = (
     "die-cut vinyl sticker design, bold black outlines, vibrant colors, "
@@ -50,6 +69,33 @@ Requirements for each prompt:
 Return a JSON object with a "prompts" array containing exactly 3 prompt strings.
 Each prompt should be 1-2 sentences describing the visual design."""
 
+BATCH_USER_PROMPT_TEMPLATE = """Generate exactly {count} image prompts for die-cut vinyl stickers inspired by EACH of the numbered trends below.
+
+{trends}
+
+Requirements for each prompt:
+- Must describe a die-cut vinyl sticker design
+- Bold black outlines, vibrant colors, white background
+- Cartoon illustration style, simple and clean
+- Suitable for laptop or water bottle sticker
+- NO text, words, letters, brand names, logos, or recognizable characters
+- Each prompt should be a unique visual interpretation of its own trend
+- High contrast, fun and trendy aesthetic
+
+Return a JSON object of the form
+{{"results": [{{"index": 1, "prompts": ["...", ...]}}, {{"index": 2, "prompts": [...]}}, ...]}}
+with one entry per trend, using the trend's number as "index".
+Each prompt should be 1-2 sentences describing the visual design."""
+
+
+class PromptShapeError(Exception):
+    """
+    Raised when a response has fewer usable prompts than requested.
+
+    Re-asked up to MAX_SHAPE_ATTEMPTS times outside @retry, so a bad reply
+    never counts toward the openai circuit breaker.
+    """
+
 
 class PromptGenerator:
     """
@@ -64,8 +110,15 @@ class PromptGenerator:
         openai_api_key: Optional[str] = None,
         model: Optional[str] = None,
         openai_client: Optional[Any] = None,
+        async_openai_client: Optional[Any] = None,
+        db: Optional["SupabaseClient"] = None,
     ) -> None:
         self._client = openai_client
+        self._aclient = async_openai_client
+        # Generated prompts by cache key: in-process LRU, backed by the
+        # prompt_cache table when a db is given
+        self._db = db
+        self._cache: OrderedDict[str, List[str]] = OrderedDict()
 
         if not self._client:
             cfg = load_config(require_all=False)
@@ -73,15 +126,129 @@ class PromptGenerator:
             self._model = model or cfg.openai.prompt_model
 
             try:
-                from openai import OpenAI
+                from openai import AsyncOpenAI, OpenAI
                 base_url = cfg.openai.base_url or None
                 self._client = OpenAI(api_key=api_key, base_url=base_url)
+                if not self._aclient:
+                    self._aclient = AsyncOpenAI(api_key=api_key, base_url=base_url)
             except Exception as exc:
                 logger.error("Failed to initialize OpenAI client: %s", exc)
                 self._client = None
         else:
             self._model = model or "gemini-2.5-flash"
 
+    def _cache_key(self, topic: str, context: str, num_prompts: int) -> str:
+        raw = f"{self._model}|{topic}|{context}|{num_prompts}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cached(self, keys: List[str]) -> Dict[str, List[str]]:
+        """Fresh cached prompts for the given keys (memory first, then Supabase)."""
+        found = {k: self._cache[k] for k in keys if k in self._cache}
+        missing = [k for k in keys if k not in found]
+        if self._db is None or not missing:
+            return found
+        try:
+            rows = self._db.get_prompt_cache(missing)
+        except Exception as exc:
+            logger.warning("Prompt cache lookup failed: %s", exc)
+            return found
+        cutoff = datetime.now(timezone.utc) - PROMPT_CACHE_TTL
+        for row in rows:
+            try:
+                created = datetime.fromisoformat(row["created_at"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if created >= cutoff and isinstance(row.get("prompts"), list):
+                found[row["hash"]] = row["prompts"]
+                self._remember(row["hash"], row["prompts"])
+        return found
+
+    def _remember(self, key: str, prompts: List[str]) -> None:
+        self._cache[key] = prompts
+        self._cache.move_to_end(key)
+        while len(self._cache) > PROMPT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _store(self, entries: Dict[str, List[str]]) -> None:
+        """Cache generated (non-fallback) prompts in memory and Supabase."""
+        if not entries:
+            return
+        for key, prompts in entries.items():
+            self._remember(key, prompts)
+        if self._db is None:
+            return
+        try:
+            self._db.upsert_prompt_cache(entries)
+        except Exception as exc:
+            logger.warning("Failed to store %d prompt cache entries: %s", len(entries), exc)
+
+    @staticmethod
+    def _build_messages(topic: str, context: str = "") -> List[Dict[str, str]]:
+        """Chat messages requesting prompts for one trend."""
+        user_prompt = USER_PROMPT_TEMPLATE.format(
+            topic=topic,
+            context=context or "No additional context.",
+        )
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+
+    def _styled_prompts(self, raw: str, num_prompts: int) -> List[str]:
+        """Styled prompts from a response; PromptShapeError if it had too few."""
+        prompts = self._parse_prompts(raw, num_prompts)
+        if len(prompts) < num_prompts:
+            raise PromptShapeError(
+                f"got {len(prompts)} prompts instead of {num_prompts}"
+            )
+        return self._with_style(prompts, num_prompts)
+
+    @retry(max_retries=3, service="openai")
+    def _complete(self, messages: List[Dict[str, str]]) -> str:
+        """Raw JSON reply for one chat completion (API errors retried)."""
+        response = self._client.chat.completions.create(
+            model=self._model,
+            response_format={"type": "json_object"},
+            messages=messages,
+            temperature=0.8,
+        )
+        return response.choices[0].message.content or ""
+
+    @retry(max_retries=3, service="openai")
+    async def _acomplete(self, messages: List[Dict[str, str]]) -> str:
+        """Async variant of _complete() using the AsyncOpenAI client."""
+        response = await self._aclient.chat.completions.create(
+            model=self._model,
+            response_format={"type": "json_object"},
+            messages=messages,
+            temperature=0.8,
+        )
+        return response.choices[0].message.content or ""
+
+    def _request_prompts(
+        self, messages: List[Dict[str, str]], num_prompts: int,
+    ) -> List[str]:
+        """Styled prompts, re-asking on short replies; RetryExhaustedError if none."""
+        for attempt in range(1, MAX_SHAPE_ATTEMPTS + 1):
+            try:
+                return self._styled_prompts(self._complete(messages), num_prompts)
+            except PromptShapeError as exc:
+                logger.warning("Prompt reply rejected (attempt %d): %s", attempt, exc)
+                last_exc = exc
+        raise RetryExhaustedError(last_exc, MAX_SHAPE_ATTEMPTS)
+
+    async def _arequest_prompts(
+        self, messages: List[Dict[str, str]], num_prompts: int,
+    ) -> List[str]:
+        """Async variant of _request_prompts()."""
+        for attempt in range(1, MAX_SHAPE_ATTEMPTS + 1):
+            try:
+                return self._styled_prompts(await self._acomplete(messages), num_prompts)
+            except PromptShapeError as exc:
+                logger.warning("Prompt reply rejected (attempt %d): %s", attempt, exc)
+                last_exc = exc
+        raise RetryExhaustedError(last_exc, MAX_SHAPE_ATTEMPTS)
+
     def generate_prompts(
         self,
         topic: str,
@@ -105,56 +272,243 @@ class PromptGenerator:
         if not self._client:
             raise RuntimeError("OpenAI client not available for prompt generation")
 
-        user_prompt = USER_PROMPT_TEMPLATE.format(
-            topic=topic,
-            context=context or "No additional context.",
+        key = self._cache_key(topic, context, num_prompts)
+        cached = self._cached([key])
+        if key in cached:
+            logger.info("Prompt cache hit for trend '%s'", topic[:50])
+            return list(cached[key])
+
+        try:
+            prompts = self._request_prompts(self._build_messages(topic, context), num_prompts)
+        except RetryExhaustedError as exc:
+            logger.error("Prompt generation failed for '%s': %s", topic[:50], exc)
+            # Fallback: generate simple template-based prompts
+            logger.warning("Using fallback template prompts for '%s'", topic[:50])
+            return self._fallback_prompts(topic, num_prompts)
+
+        logger.info("Generated %d prompts for trend '%s'", len(prompts), topic[:50])
+        self._store({key: prompts})
+        return list(prompts)
+
+    async def agenerate_prompts(
+        self,
+        topic: str,
+        context: str = "",
+        num_prompts: int = PROMPTS_PER_TREND,
+    ) -> List[str]:
+        """
+        Async variant of generate_prompts() using the AsyncOpenAI client.
+
+        Raises:
+            RuntimeError: If the async OpenAI client is not available.
+        """
+        if not self._aclient:
+            raise RuntimeError("Async OpenAI client not available for prompt generation")
+
+        key = self._cache_key(topic, context, num_prompts)
+        cached = await asyncio.to_thread(self._cached, [key])
+        if key in cached:
+            logger.info("Prompt cache hit for trend '%s'", topic[:50])
+            return list(cached[key])
+
+        try:
+            prompts = await self._arequest_prompts(
+                self._build_messages(topic, context), num_prompts,
+            )
+        except RetryExhaustedError as exc:
+            logger.error("Prompt generation failed for '%s': %s", topic[:50], exc)
+            logger.warning("Using fallback template prompts for '%s'", topic[:50])
+            return self._fallback_prompts(topic, num_prompts)
+
+        logger.info("Generated %d prompts for trend '%s'", len(prompts), topic[:50])
+        await asyncio.to_thread(self._store, {key: prompts})
+        return list(prompts)
+
+    async def agenerate_many(
+        self,
+        trends: Sequence[Tuple[str, str]],
+        num_prompts: int = PROMPTS_PER_TREND,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ) -> List[List[str]]:
+        """
+        Generate prompts for several (topic, context) trends concurrently.
+
+        At most max_concurrency requests are in flight; a trend whose
+        request raises gets template prompts. Results are in input order.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def one(topic: str, context: str) -> List[str]:
+            async with semaphore:
+                return await self.agenerate_prompts(topic, context, num_prompts)
+
+        results = await asyncio.gather(
+            *(one(topic, context) for topic, context in trends),
+            return_exceptions=True,
         )
+        prompts: List[List[str]] = []
+        for (topic, _), result in zip(trends, results):
+            if isinstance(result, BaseException):
+                logger.error("Prompt generation failed for '%s': %s", topic[:50], result)
+                prompts.append(self._fallback_prompts(topic, num_prompts))
+            else:
+                prompts.append(result)
+        return prompts
+
+    def generate_many(
+        self,
+        trends: Sequence[Tuple[str, str]],
+        num_prompts: int = PROMPTS_PER_TREND,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ) -> List[List[str]]:
+        """
+        Synchronous wrapper around agenerate_many(); must not be called from
+        inside a running event loop.
+        """
+        return asyncio.run(self.agenerate_many(trends, num_prompts, max_concurrency))
 
-        for attempt in range(3):
-            try:
-                response = self._client.chat.completions.create(
-                    model=self._model,
-                    response_format={"type": "json_object"},
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=0.8,
-                )
-                raw = response.choices[0].message.content or ""
-                prompts = self._parse_prompts(raw, num_prompts)
-
-                if len(prompts) >= num_prompts:
-                    # Append style directives to each prompt
-                    full_prompts = [
-                        f"A {STYLE_DIRECTIVES} {p}" for p in prompts[:num_prompts]
-                    ]
-                    logger.info(
-                        "Generated %d prompts for trend '%s'",
-                        len(full_prompts), topic[:50],
-                    )
-                    return full_prompts
-
-                logger.warning(
-                    "Got %d prompts instead of %d for '%s' (attempt %d), retrying",
-                    len(prompts), num_prompts, topic[:50], attempt + 1,
-                )
+    def generate_prompts_batch(
+        self,
+        trends: Sequence[Tuple[str, str]],
+        num_prompts: int = PROMPTS_PER_TREND,
+    ) -> List[List[str]]:
+        """
+        Generate image prompts for several trends with one request per batch.
 
-            except Exception as exc:
-                logger.error(
-                    "Prompt generation failed for '%s' (attempt %d): %s",
-                    topic[:50], attempt + 1, exc,
-                )
+        Trends are sent MAX_BATCH_SIZE at a time under a single system
+        prompt, each tagged with its [index]. A trend missing from the
+        response (or returned with too few prompts) gets template prompts.
+
+        Args:
+            trends: (topic, context) pairs.
+            num_prompts: Number of prompts per trend (default 3).
+
+        Returns:
+            One list of prompt strings per trend, in input order.
+
+        Raises:
+            RuntimeError: If the OpenAI client is not available.
+        """
+        if not self._client:
+            raise RuntimeError("OpenAI client not available for prompt generation")
+
+        keys = [self._cache_key(topic, context, num_prompts) for topic, context in trends]
+        cached = self._cached(keys)
+        misses = [i for i, key in enumerate(keys) if key not in cached]
+        if len(misses) < len(trends):
+            logger.info("Prompt cache hits for %d of %d trends", len(trends) - len(misses), len(trends))
+
+        generated: Dict[int, Optional[List[str]]] = {}
+        for start in range(0, len(misses), MAX_BATCH_SIZE):
+            chunk = misses[start:start + MAX_BATCH_SIZE]
+            batch = self._generate_batch([trends[i] for i in chunk], num_prompts)
+            generated.update(zip(chunk, batch))
+        self._store({keys[i]: p for i, p in generated.items() if p is not None})
+
+        results: List[List[str]] = []
+        for i, (topic, _) in enumerate(trends):
+            if keys[i] in cached:
+                results.append(list(cached[keys[i]]))
+            elif generated[i] is not None:
+                results.append(list(generated[i]))
+            else:
+                logger.warning("Using fallback template prompts for '%s'", topic[:50])
+                results.append(self._fallback_prompts(topic, num_prompts))
+        return results
+
+    def _generate_batch(
+        self,
+        trends: Sequence[Tuple[str, str]],
+        num_prompts: int,
+    ) -> List[Optional[List[str]]]:
+        """
+        Generate prompts for at most MAX_BATCH_SIZE trends in one call.
+
+        Returns one styled prompt list per trend, or None for a trend the
+        response did not cover.
+        """
+        user_prompt = BATCH_USER_PROMPT_TEMPLATE.format(
+            count=num_prompts,
+            trends="\n\n".join(
+                f"Trend [{i}]: {topic}\nContext [{i}]: {context or 'No additional context.'}"
+                for i, (topic, context) in enumerate(trends, start=1)
+            ),
+        )
+
+        try:
+            parsed = self._request_batch(user_prompt, len(trends), num_prompts)
+        except RetryExhaustedError as exc:
+            logger.error(
+                "Batch prompt generation failed for %d trends: %s", len(trends), exc,
+            )
+            parsed = [[] for _ in trends]
+
+        logger.info("Generated prompts for %d trends in one batch", len(trends))
+        return [
+            self._with_style(prompts, num_prompts) if len(prompts) >= num_prompts else None
+            for prompts in parsed
+        ]
+
+    def _request_batch(
+        self, user_prompt: str, count: int, num_prompts: int,
+    ) -> List[List[str]]:
+        """Parsed batch reply, re-asking when no trend got enough prompts."""
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt},
+        ]
+        for attempt in range(1, MAX_SHAPE_ATTEMPTS + 1):
+            parsed = self._parse_batch(self._complete(messages), count)
+            if any(len(p) >= num_prompts for p in parsed):
+                return parsed
+            logger.warning(
+                "Batch of %d trends returned no usable prompts (attempt %d)", count, attempt,
+            )
+        raise RetryExhaustedError(
+            PromptShapeError(f"batch of {count} trends returned no usable prompts"),
+            MAX_SHAPE_ATTEMPTS,
+        )
+
+    @staticmethod
+    def _with_style(prompts: List[str], count: int) -> List[str]:
+        """Append the sticker style directives to each prompt."""
+        return [f"A {STYLE_DIRECTIVES} {p}" for p in prompts[:count]]
+
+    @staticmethod
+    def _parse_batch(raw_json: str, count: int) -> List[List[str]]:
+        """
+        Parse a batched response into one prompt list per trend.
 
-        # Fallback: generate simple template-based prompts
-        logger.warning("Using fallback template prompts for '%s'", topic[:50])
-        return self._fallback_prompts(topic, num_prompts)
+        Entries are matched by their 1-based "index"; trends with no valid
+        entry get an empty list.
+        """
+        prompts: List[List[str]] = [[] for _ in range(count)]
+        try:
+            data = _json_loads(raw_json)
+        except json.JSONDecodeError:
+            return prompts
+
+        entries = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(entries, list):
+            return prompts
+
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("index"))
+            except (TypeError, ValueError):
+                continue
+            values = entry.get("prompts")
+            if 1 <= index <= count and isinstance(values, list):
+                prompts[index - 1] = [str(p) for p in values if p]
+        return prompts
 
     @staticmethod
     def _parse_prompts(raw_json: str, expected_count: int) -> List[str]:
         """Parse the JSON response and extract prompt strings."""
         try:
-            data = json.loads(raw_json)
+            data = _json_loads(raw_json)
         except json.JSONDecodeError:
             return []
 
@@ -10,7 +10,9 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Dict, List, Optional, Set
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from src.db import SupabaseClient, DatabaseError
 
@@ -19,6 +21,12 @@ logger = logging.getLogger(__name__)
 # Jaccard similarity threshold for merging trends
 SIMILARITY_THRESHOLD = 0.6
 
+# Only the fields check_existing_trends reads from existing rows
+EXISTING_TREND_COLUMNS = "id,topic,topic_normalized,sources"
+
+# Characters dropped by normalize_topic (anything but word chars, spaces, hyphens)
+_NORMALIZE_RE = re.compile(r"[^\w\s-]")
+
 # Simple suffix-stripping stemmer rules
 _SUFFIX_RULES = [
     ("ying", "y"),
@@ -53,7 +61,14 @@ _SUFFIX_RULES = [
     ("s", ""),
 ]
 
+# Rules grouped by the suffix's last character, keeping rule order, so a
+# word is only checked against rules that can match its final letter.
+_RULES_BY_LAST_CHAR: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+for _suffix, _replacement in _SUFFIX_RULES:
+    _RULES_BY_LAST_CHAR[_suffix[-1]].append((_suffix, _replacement))
+
 
+@lru_cache(maxsize=8192)
 def simple_stem(word: str) -> str:
     """
     Apply simple suffix-stripping stemming to a word.
@@ -63,12 +78,13 @@ def simple_stem(word: str) -> str:
     """
     if len(word) <= 3:
         return word
-    for suffix, replacement in _SUFFIX_RULES:
+    for suffix, replacement in _RULES_BY_LAST_CHAR.get(word[-1], ()):
         if word.endswith(suffix) and len(word) - len(suffix) + len(replacement) >= 3:
             return word[: -len(suffix)] + replacement
     return word
 
 
+@lru_cache(maxsize=8192)
 def normalize_topic(topic: str) -> str:
     """
     Normalize a topic string for deduplication matching.
@@ -85,7 +101,7 @@ def normalize_topic(topic: str) -> str:
     if not topic:
         return ""
     # Lowercase and remove non-alphanumeric (keep spaces and hyphens)
-    text = re.sub(r"[^\w\s-]", "", topic.lower())
+    text = _NORMALIZE_RE.sub("", topic.lower())
     # Split, stem, filter empty
     words = [simple_stem(w) for w in text.split() if len(w) > 1]
     # Sort for order-independent matching
@@ -116,6 +132,14 @@ def jaccard_similarity(set_a: Set[str], set_b: Set[str]) -> float:
     return len(intersection) / len(union)
 
 
+def _jaccard_bits(mask_a: int, mask_b: int) -> float:
+    """jaccard_similarity for keyword sets encoded as int bitmaps."""
+    union = (mask_a | mask_b).bit_count()
+    if not union:
+        return 0.0
+    return (mask_a & mask_b).bit_count() / union
+
+
 def _keyword_set(keywords: List[str]) -> Set[str]:
     """Convert a keyword list to a stemmed set for comparison."""
     return {simple_stem(k.lower()) for k in keywords if k}
@@ -141,6 +165,20 @@ def deduplicate_trends(
     if not trends:
         return []
 
+    # Stem each trend's keywords once, and index trends by keyword so each
+    # trend is only compared with trends it shares a keyword with (any
+    # pair with no overlap has similarity 0 and can never merge).
+    keyword_sets = [_keyword_set(t.get("keywords", [])) for t in trends]
+    index: Dict[str, List[int]] = defaultdict(list)
+    for i, keywords in enumerate(keyword_sets):
+        for kw in keywords:
+            index[kw].append(i)
+
+    # Encode each set as an int bitmap over the batch vocabulary, so
+    # Jaccard is two popcounts instead of two set allocations
+    bit = {kw: 1 << n for n, kw in enumerate(index)}
+    masks = [sum(bit[kw] for kw in keywords) for keywords in keyword_sets]
+
     # Track which trends have been merged
     merged_flags = [False] * len(trends)
     canonical: List[Dict[str, Any]] = []
@@ -152,17 +190,23 @@ def deduplicate_trends(
         # Start a new canonical trend
         merged = _copy_trend(trend_a)
         sources = _ensure_list(merged.get("source", ""))
-        keyword_pool = set(merged.get("keywords", []))
+        keyword_pool = dict.fromkeys(merged.get("keywords", []))
+        # Candidates are always compared with the leader's own stemmed set;
+        # merged keywords only feed the output pool, so set_a never changes
+        # inside the loop and is looked up once.
+        set_a = keyword_sets[i]
+
+        if similarity_threshold >= 0:
+            candidates = sorted({j for kw in set_a for j in index[kw] if j > i})
+        else:
+            candidates = list(range(i + 1, len(trends)))
 
-        for j in range(i + 1, len(trends)):
+        for j in candidates:
             if merged_flags[j]:
                 continue
 
             trend_b = trends[j]
-            set_a = _keyword_set(merged.get("keywords", []))
-            set_b = _keyword_set(trend_b.get("keywords", []))
-
-            sim = jaccard_similarity(set_a, set_b)
+            sim = _jaccard_bits(masks[i], masks[j])
 
             if sim > similarity_threshold:
                 # Merge trend_b into merged
@@ -172,7 +216,7 @@ def deduplicate_trends(
                     sources.extend(b_source)
                 elif b_source:
                     sources.append(b_source)
-                keyword_pool.update(trend_b.get("keywords", []))
+                keyword_pool.update(dict.fromkeys(trend_b.get("keywords", [])))
                 # Keep the higher score_hint
                 if trend_b.get("score_hint", 0) > merged.get("score_hint", 0):
                     merged["topic"] = trend_b["topic"]
@@ -186,7 +230,8 @@ def deduplicate_trends(
                 )
 
         # Finalize the canonical trend
-        merged["sources"] = list(set(sources))
+        # Order-preserving dedup: first-seen source/keyword first
+        merged["sources"] = list(dict.fromkeys(sources))
         merged["keywords"] = list(keyword_pool)
         merged["topic_normalized"] = normalize_topic(merged.get("topic", ""))
         canonical.append(merged)
@@ -218,25 +263,30 @@ def check_existing_trends(
     new_trends: List[Dict[str, Any]] = []
 
     for trend in canonical_trends:
-        normalized = trend.get("topic_normalized", "")
-        if not normalized:
-            normalized = normalize_topic(trend.get("topic", ""))
-            trend["topic_normalized"] = normalized
-
-        try:
-            existing = db.get_trend_by_normalized_topic(normalized)
-        except DatabaseError as exc:
-            logger.error("Failed to check existing trend: %s", exc)
-            new_trends.append(trend)
-            continue
+        if not trend.get("topic_normalized"):
+            trend["topic_normalized"] = normalize_topic(trend.get("topic", ""))
+
+    # One IN-list query for every candidate instead of one per trend
+    try:
+        existing_map = db.get_trends_by_normalized_topics(
+            [t["topic_normalized"] for t in canonical_trends],
+            columns=EXISTING_TREND_COLUMNS,
+        )
+    except DatabaseError as exc:
+        logger.error("Failed to check existing trends: %s", exc)
+        return list(canonical_trends)
+
+    for trend in canonical_trends:
+        normalized = trend["topic_normalized"]
+        existing = existing_map.get(normalized)
 
         if existing:
             # Update the existing trend's sources array
             existing_sources = existing.get("sources", []) or []
             new_sources = trend.get("sources", [])
-            merged_sources = list(set(existing_sources + new_sources))
 
-            if set(merged_sources) != set(existing_sources):
+            if not set(existing_sources).issuperset(new_sources):
+                merged_sources = list(dict.fromkeys(existing_sources + new_sources))
                 try:
                     db.update_trend(existing["id"], {"sources": merged_sources})
                     logger.info(
@@ -262,14 +312,18 @@ def check_existing_trends(
 
 
 def _copy_trend(trend: Dict[str, Any]) -> Dict[str, Any]:
-    """Create a shallow copy of a trend dict."""
-    return {
-        "topic": trend.get("topic", ""),
-        "keywords": list(trend.get("keywords", [])),
-        "source": trend.get("source", ""),
-        "source_data": trend.get("source_data", {}),
-        "score_hint": trend.get("score_hint", 0),
-    }
+    """
+    Create a shallow copy of a trend dict.
+
+    Extra fields are carried over as-is; only the keywords list, which the
+    merge rebuilds, is copied so the input is never mutated.
+    """
+    merged = trend.copy()
+    merged["keywords"] = list(trend.get("keywords") or ())
+    merged.setdefault("topic", "")
+    merged.setdefault("source", "")
+    merged.setdefault("score_hint", 0)
+    return merged
 
 
 def _ensure_list(value: Any) -> List[str]:
@@ -2,9 +2,9 @@
 Trend monitor orchestrator for Sticker Trendz.
 
 Orchestrates the 2-hour trend detection cycle:
-  1. Fetch from Reddit and Google Trends
-  2. Deduplicate
-  3. Check blocklists
+  1. Fetch from Reddit and Google Trends, checking topics against blocklists
+  2. Deduplicate, dropping trends led by a blocklisted topic
+  3. Check against existing trends
   4. Score with GPT-4o-mini
   5. Store qualifying trends in Supabase
 
@@ -14,18 +14,22 @@ Sets GitHub Actions output for conditional job execution.
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import heapq
 import logging
 import os
 import sys
 from datetime import datetime, timezone, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from src.config import load_config, setup_logging
-from src.db import SupabaseClient, DatabaseError
+from src.db import SupabaseClient, DatabaseError, MissingFunctionError
 from src.monitoring.pipeline_logger import PipelineRunLogger
 from src.monitoring.error_logger import ErrorLogger
 from src.monitoring.alerter import EmailAlerter
 from src.monitoring.spend_tracker import SpendTracker
+from src.monitoring.openai_rate_limiter import OpenAIRateLimiter
 from src.publisher.etsy_rate_limiter import EtsyRateLimiter
 from src.trends.sources.reddit import RedditSource
 from src.trends.sources.google_trends import GoogleTrendsSource
@@ -33,11 +37,46 @@ from src.trends.dedup import deduplicate_trends, check_existing_trends
 from src.trends.scorer import TrendScorer, OVERALL_THRESHOLD
 from src.moderation.blocklist import check_all as check_blocklists
 
+try:
+    import uvloop  # optional libuv event loop for the async fetch/score paths
+except ImportError:  # pragma: no cover - stdlib asyncio loop
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
 WORKFLOW_NAME = "trend_monitor"
 
 
+def _is_blocked(trend: Dict[str, Any]) -> bool:
+    """Return True (and log) if the trend's topic matches a blocklist."""
+    topic = trend.get("topic", "")
+    is_blocked, match_term, blocklist_type = check_blocklists(topic)
+    if is_blocked:
+        logger.info(
+            "Trend '%.50s' blocked by %s blocklist (matched '%s')",
+            topic, blocklist_type, match_term,
+        )
+    return is_blocked
+
+
+def _trend_row(trend: Dict[str, Any], status: str) -> Dict[str, Any]:
+    """Build the trends table row for a scored trend."""
+    return {
+        "topic": trend.get("topic", ""),
+        "topic_normalized": trend.get("topic_normalized", ""),
+        "keywords": trend.get("keywords", []),
+        "sources": trend.get("sources", [trend.get("source", "")]),
+        "score_velocity": trend.get("score_velocity"),
+        "score_commercial": trend.get("score_commercial"),
+        "score_safety": trend.get("score_safety"),
+        "score_uniqueness": trend.get("score_uniqueness"),
+        "score_overall": trend.get("score_overall"),
+        "reasoning": trend.get("reasoning", ""),
+        "status": status,
+        "source_data": trend.get("source_data", {}),
+    }
+
+
 class TrendMonitor:
     """
     Main trend monitor that orchestrates the 2-hour trend detection cycle.
@@ -72,6 +111,119 @@ class TrendMonitor:
         self._max_per_cycle = max_trends_per_cycle
         self._max_daily_scored = max_daily_scored
 
+    async def _fetch_sources(
+        self,
+    ) -> List[Tuple[str, str, List[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Fetch every configured source concurrently.
+
+        Returns:
+            One (display name, service, trends, exception) tuple per source,
+            in a fixed order. exception is None on success; a failed source
+            yields an empty trend list.
+        """
+        sources = [
+            ("Reddit", "reddit", self._reddit),
+            ("Google Trends", "google_trends", self._google),
+        ]
+
+        async def fetch(
+            name: str, service: str, source: Any,
+        ) -> Tuple[str, str, List[Dict[str, Any]], Optional[Exception]]:
+            try:
+                trends = await asyncio.to_thread(source.fetch_trends)
+            except Exception as exc:
+                return name, service, [], exc
+            return name, service, trends, None
+
+        return await asyncio.gather(
+            *(fetch(name, service, src) for name, service, src in sources if src is not None)
+        )
+
+    def _store_trends(
+        self, qualified: List[Dict[str, Any]], run_id: Optional[str],
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Store a cycle's qualifying trends, ranked into discovered and queued.
+
+        Ranking and insert run as one SQL call. Only if the function is
+        missing (migration not applied yet) are the trends ranked here and
+        bulk inserted, retrying row by row so one bad trend doesn't lose the
+        rest. Any other failure may have happened after the call committed,
+        so it is logged and nothing is inserted again.
+
+        Returns:
+            Tuple of (stored rows, number of rows that failed to store).
+        """
+        try:
+            return self._db.insert_ranked_trends(
+                [_trend_row(trend, "queued") for trend in qualified],
+                self._max_per_cycle,
+            ), 0
+        except MissingFunctionError as exc:
+            logger.warning("Ranked trend insert unavailable, ranking client-side: %s", exc)
+        except DatabaseError as exc:
+            logger.error("Ranked trend insert failed: %s", exc)
+            self._error_logger.log_error(
+                workflow=WORKFLOW_NAME,
+                step="trend_store",
+                error_type="api_error",
+                error_message=str(exc),
+                service="supabase",
+                pipeline_run_id=run_id,
+            )
+            return [], len(qualified)
+
+        # The rest are queued in scoring order, so only the top N need ranking
+        top_trends = heapq.nlargest(
+            self._max_per_cycle,
+            qualified,
+            key=lambda t: t.get("score_overall", 0),
+        )
+        top_ids = {id(t) for t in top_trends}
+
+        rows = [_trend_row(trend, "discovered") for trend in top_trends]
+        rows.extend(
+            _trend_row(trend, "queued") for trend in qualified if id(trend) not in top_ids
+        )
+        try:
+            self._db.insert_trends(rows)
+            return rows, 0
+        except DatabaseError as exc:
+            logger.warning("Bulk trend insert failed, retrying per row: %s", exc)
+
+        stored: List[Dict[str, Any]] = []
+        errors = 0
+        for row in rows:
+            try:
+                self._db.insert_trend(row)
+                stored.append(row)
+            except DatabaseError as row_exc:
+                errors += 1
+                logger.error("Failed to store trend '%.50s': %s", row["topic"], row_exc)
+                self._error_logger.log_error(
+                    workflow=WORKFLOW_NAME,
+                    step="trend_store",
+                    error_type="api_error",
+                    error_message=str(row_exc),
+                    service="supabase",
+                    pipeline_run_id=run_id,
+                )
+        return stored, errors
+
+    def _log_run_with_ai_cost(
+        self, log_run: Callable[..., None], run_id: str, **kwargs: Any,
+    ) -> None:
+        """
+        Write the run via log_run with the scoring spend not yet in
+        pipeline_runs, then mark that spend stored. If the write raises,
+        the spend stays unstored and keeps counting toward the budget.
+        """
+        ai_cost = self._spend_tracker.unstored_spend if self._spend_tracker else 0.0
+        log_run(run_id, ai_cost_estimate_usd=ai_cost, **kwargs)
+        if self._spend_tracker:
+            self._spend_tracker.mark_stored(ai_cost)
+
     def run(self) -> bool:
         """
         Execute one trend monitoring cycle.
@@ -107,51 +259,42 @@ class TrendMonitor:
                     )
                     return False
 
-            # Step 1: Fetch from all sources
+            # Step 1: Fetch from all sources, checking each topic against the
+            # blocklists as it arrives. Blocked candidates still go through
+            # dedup so a clean trend merged into a blocked one is dropped
+            # with it, as a post-dedup check alone would do.
             all_candidates: List[Dict[str, Any]] = []
+            blocked_topics: Set[str] = set()
+            fetched_count = 0
             source_failures = 0
 
-            # Reddit
-            if self._reddit:
-                try:
-                    reddit_trends = self._reddit.fetch_trends()
-                    all_candidates.extend(reddit_trends)
-                    logger.info("Reddit returned %d candidates", len(reddit_trends))
-                except Exception as exc:
-                    source_failures += 1
-                    errors_count += 1
-                    logger.error("Reddit source failed: %s", exc)
-                    self._error_logger.log_error(
-                        workflow=WORKFLOW_NAME,
-                        step="trend_fetch",
-                        error_type="api_error",
-                        error_message=str(exc),
-                        service="reddit",
-                        pipeline_run_id=run_id,
-                    )
-
-            # Google Trends
-            if self._google:
-                try:
-                    google_trends = self._google.fetch_trends()
-                    all_candidates.extend(google_trends)
-                    logger.info("Google Trends returned %d candidates", len(google_trends))
-                except Exception as exc:
-                    source_failures += 1
-                    errors_count += 1
-                    logger.error("Google Trends source failed: %s", exc)
-                    self._error_logger.log_error(
-                        workflow=WORKFLOW_NAME,
-                        step="trend_fetch",
-                        error_type="api_error",
-                        error_message=str(exc),
-                        service="google_trends",
-                        pipeline_run_id=run_id,
+            # Both sources are network-bound and independent, so fetch them
+            # concurrently and handle each outcome in source order
+            results = asyncio.run(self._fetch_sources())
+            for name, service, trends, exc in results:
+                if exc is None:
+                    fetched_count += len(trends)
+                    all_candidates.extend(trends)
+                    blocked_topics.update(
+                        t.get("topic", "") for t in trends if _is_blocked(t)
                     )
+                    logger.info("%s returned %d candidates", name, len(trends))
+                    continue
+                source_failures += 1
+                errors_count += 1
+                logger.error("%s source failed: %s", name, exc)
+                self._error_logger.log_error(
+                    workflow=WORKFLOW_NAME,
+                    step="trend_fetch",
+                    error_type="api_error",
+                    error_message=str(exc),
+                    service=service,
+                    pipeline_run_id=run_id,
+                )
 
-            # If all sources failed, alert and exit
-            active_sources = sum(1 for s in [self._reddit, self._google] if s is not None)
-            if source_failures >= active_sources and active_sources > 0:
+            # If all sources failed, alert and exit (there is one result
+            # per configured source)
+            if results and source_failures == len(results):
                 logger.error("All trend sources failed")
                 if self._alerter:
                     self._alerter.send_alert(
@@ -165,17 +308,20 @@ class TrendMonitor:
                 )
                 return False
 
-            trends_found = len(all_candidates)
-            if not all_candidates:
-                logger.info("No trend candidates found from any source")
+            trends_found = fetched_count
+            if all(t.get("topic", "") in blocked_topics for t in all_candidates):
+                logger.info("No unblocked trend candidates found from any source")
                 self._pipeline_logger.complete_run(
-                    run_id, counts={"trends_found": 0},
+                    run_id, counts={"trends_found": trends_found},
                 )
                 return False
 
-            # Step 2: Deduplicate across sources
+            # Step 2: Deduplicate across sources, then drop canonical trends
+            # with a blocked topic (every canonical topic is one of the raw
+            # topics checked above)
             canonical = deduplicate_trends(all_candidates)
-            logger.info("Dedup: %d -> %d canonical trends", trends_found, len(canonical))
+            logger.info("Dedup: %d -> %d canonical trends", len(all_candidates), len(canonical))
+            canonical = [t for t in canonical if t.get("topic", "") not in blocked_topics]
 
             # Step 3: Check against existing trends in DB
             new_candidates = check_existing_trends(canonical, self._db)
@@ -189,88 +335,32 @@ class TrendMonitor:
                 )
                 return False
 
-            # Step 4: Check blocklists (pre-filter before spending on scoring)
-            clean_candidates: List[Dict[str, Any]] = []
-            for trend in new_candidates:
-                topic = trend.get("topic", "")
-                is_blocked, match_term, blocklist_type = check_blocklists(topic)
-                if is_blocked:
-                    logger.info(
-                        "Trend '%s' blocked by %s blocklist (matched '%s')",
-                        topic[:50], blocklist_type, match_term,
-                    )
-                    continue
-                clean_candidates.append(trend)
-
-            if not clean_candidates:
-                logger.info("All trends blocked by blocklists")
-                self._pipeline_logger.complete_run(
-                    run_id,
-                    counts={"trends_found": trends_found, "trends_scored": 0},
-                )
-                return False
-
-            # Step 5: Score with GPT-4o-mini
+            # Step 4: Score with GPT-4o-mini
             if self._scorer:
                 qualified = self._scorer.score_and_filter(
-                    clean_candidates[:self._max_daily_scored],
+                    new_candidates[:self._max_daily_scored],
                     threshold=OVERALL_THRESHOLD,
                 )
-                trends_scored = len(clean_candidates[:self._max_daily_scored])
+                trends_scored = len(new_candidates[:self._max_daily_scored])
             else:
-                qualified = clean_candidates
+                qualified = new_candidates
                 trends_scored = 0
 
             if not qualified:
                 logger.info("No qualifying trends found (all below %.1f threshold)", OVERALL_THRESHOLD)
-                self._pipeline_logger.complete_run(
-                    run_id,
+                self._log_run_with_ai_cost(
+                    self._pipeline_logger.complete_run, run_id,
                     counts={"trends_found": trends_found, "trends_scored": trends_scored},
                 )
                 return False
 
-            # Step 6: Store top N trends (per-cycle cap)
-            top_trends = sorted(
-                qualified,
-                key=lambda t: t.get("score_overall", 0),
-                reverse=True,
-            )
+            # Step 5: Store qualifying trends; the top N (per-cycle cap) are
+            # discovered and the rest queued
+            stored, store_errors = self._store_trends(qualified, run_id)
+            errors_count += store_errors
 
-            stored_count = 0
-            queued_count = 0
-
-            for i, trend in enumerate(top_trends):
-                status = "discovered" if i < self._max_per_cycle else "queued"
-                try:
-                    self._db.insert_trend({
-                        "topic": trend.get("topic", ""),
-                        "topic_normalized": trend.get("topic_normalized", ""),
-                        "keywords": trend.get("keywords", []),
-                        "sources": trend.get("sources", [trend.get("source", "")]),
-                        "score_velocity": trend.get("score_velocity"),
-                        "score_commercial": trend.get("score_commercial"),
-                        "score_safety": trend.get("score_safety"),
-                        "score_uniqueness": trend.get("score_uniqueness"),
-                        "score_overall": trend.get("score_overall"),
-                        "reasoning": trend.get("reasoning", ""),
-                        "status": status,
-                        "source_data": trend.get("source_data", {}),
-                    })
-                    if status == "discovered":
-                        stored_count += 1
-                    else:
-                        queued_count += 1
-                except DatabaseError as exc:
-                    errors_count += 1
-                    logger.error("Failed to store trend '%s': %s", trend.get("topic", "")[:50], exc)
-                    self._error_logger.log_error(
-                        workflow=WORKFLOW_NAME,
-                        step="trend_store",
-                        error_type="api_error",
-                        error_message=str(exc),
-                        service="supabase",
-                        pipeline_run_id=run_id,
-                    )
+            stored_count = sum(1 for row in stored if row["status"] == "discovered")
+            queued_count = len(stored) - stored_count
 
             new_trends_found = stored_count > 0
             logger.info(
@@ -281,8 +371,8 @@ class TrendMonitor:
             # Complete the run
             status = "completed" if errors_count == 0 else "partial"
             if status == "partial":
-                self._pipeline_logger.partial_run(
-                    run_id,
+                self._log_run_with_ai_cost(
+                    self._pipeline_logger.partial_run, run_id,
                     counts={
                         "trends_found": trends_found,
                         "trends_scored": trends_scored,
@@ -290,8 +380,8 @@ class TrendMonitor:
                     },
                 )
             else:
-                self._pipeline_logger.complete_run(
-                    run_id,
+                self._log_run_with_ai_cost(
+                    self._pipeline_logger.complete_run, run_id,
                     counts={
                         "trends_found": trends_found,
                         "trends_scored": trends_scored,
@@ -300,8 +390,8 @@ class TrendMonitor:
 
         except Exception as exc:
             logger.error("Trend monitor failed: %s", exc)
-            self._pipeline_logger.fail_run(
-                run_id,
+            self._log_run_with_ai_cost(
+                self._pipeline_logger.fail_run, run_id,
                 error_message=str(exc),
                 counts={"trends_found": trends_found, "errors_count": errors_count + 1},
             )
@@ -318,15 +408,33 @@ class TrendMonitor:
         return new_trends_found
 
 
+# GitHub Actions outputs, written to GITHUB_OUTPUT in one append at exit
+_pending_outputs: Dict[str, str] = {}
+
+
 def _set_github_output(key: str, value: str) -> None:
-    """Set a GitHub Actions output variable."""
-    github_output = os.environ.get("GITHUB_OUTPUT")
-    if github_output:
-        with open(github_output, "a") as f:
-            f.write(f"{key}={value}\n")
-        logger.info("Set GitHub output: %s=%s", key, value)
-    else:
+    """Set a GitHub Actions output variable (flushed when the process exits)."""
+    if not os.environ.get("GITHUB_OUTPUT"):
         logger.debug("GITHUB_OUTPUT not set (not running in GitHub Actions)")
+        return
+    if not _pending_outputs:
+        atexit.register(_flush_github_outputs)
+    _pending_outputs[key] = value
+    logger.info("Set GitHub output: %s=%s", key, value)
+
+
+def _flush_github_outputs() -> None:
+    """Append every pending output to GITHUB_OUTPUT with a single write."""
+    github_output = os.environ.get("GITHUB_OUTPUT")
+    if not github_output or not _pending_outputs:
+        return
+    data = "".join(f"{k}={v}\n" for k, v in _pending_outputs.items()).encode()
+    fd = os.open(github_output, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+    _pending_outputs.clear()
 
 
 def main() -> None:
@@ -340,16 +448,24 @@ def main() -> None:
         logger.critical("Failed to load config: %s", exc)
         sys.exit(1)
 
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     db = SupabaseClient()
+    spend_tracker = SpendTracker(db=db)
 
     monitor = TrendMonitor(
         db=db,
         reddit_source=RedditSource(),
         google_source=GoogleTrendsSource(),
-        scorer=TrendScorer(),
+        scorer=TrendScorer(
+            db=db,
+            rate_limiter=OpenAIRateLimiter(rpm=cfg.openai.requests_per_minute),
+            spend_tracker=spend_tracker,
+        ),
         rate_limiter=EtsyRateLimiter(),
         alerter=EmailAlerter(),
-        spend_tracker=SpendTracker(db=db),
+        spend_tracker=spend_tracker,
         max_trends_per_cycle=cfg.caps.max_trends_per_cycle,
     )
 
@@ -3,30 +3,53 @@ GPT-4o-mini trend scorer for Sticker Trendz.
 
 Scores trends on 4 dimensions (velocity, commercial viability, content
 safety, uniqueness) plus an overall composite score. Uses structured
-output (response_format=json_object) for reliable JSON parsing.
+output (a strict JSON schema, or json_object mode) for reliable JSON
+parsing.
 Only trends scoring 7.0+ overall qualify for sticker generation.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import re
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
 from src.config import load_config
+from src.moderation.blocklist import check_all as check_blocklists
 from src.resilience import retry, RetryExhaustedError
 
+if TYPE_CHECKING:
+    from src.db import SupabaseClient
+    from src.monitoring.openai_rate_limiter import OpenAIRateLimiter
+    from src.monitoring.spend_tracker import SpendTracker
+
+try:
+    # orjson accepts str directly and raises a json.JSONDecodeError subclass
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - stdlib fallback
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 OVERALL_THRESHOLD = 7.0
 MAX_JSON_RETRIES = 2
+SCORE_BATCH_SIZE = 10
+MAX_CONCURRENT_REQUESTS = 8
+SCORE_CACHE_TTL = timedelta(days=7)
 
 SYSTEM_PROMPT = (
     "You are a trend analyst for a sticker business. "
     "Score trends on four dimensions."
 )
 
+# Shared by every request; the SDK serializes messages without mutating them
+SYSTEM_MESSAGE: Dict[str, str] = {"role": "system", "content": SYSTEM_PROMPT}
+
 USER_PROMPT_TEMPLATE = """Score this trend for sticker commercial viability.
 
 Trend: {topic}
@@ -66,6 +89,63 @@ Reference calibration:
 
 Return a JSON object with a single key "scores" containing an array of score objects."""
 
+# The batch template has a single placeholder, so split it once and join
+# around the trend list instead of running str.format per batch
+_BATCH_PROMPT_HEAD, _BATCH_PROMPT_TAIL = BATCH_PROMPT_TEMPLATE.split("{trends_block}")
+
+
+_SCORE_PROPERTIES: Dict[str, Any] = {
+    "velocity": {"type": "integer"},
+    "commercial": {"type": "integer"},
+    "safety": {"type": "integer"},
+    "uniqueness": {"type": "integer"},
+    "overall": {"type": "number"},
+    "reasoning": {"type": "string"},
+}
+
+# Strict JSON-schema response formats: the API then guarantees parseable,
+# complete objects, so malformed-JSON retries become rare. Ranges are
+# still clamped locally by _validate_score_field.
+SCORE_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "trend_score",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": _SCORE_PROPERTIES,
+            "required": list(_SCORE_PROPERTIES),
+            "additionalProperties": False,
+        },
+    },
+}
+
+BATCH_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "trend_scores",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "scores": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"index": {"type": "integer"}, **_SCORE_PROPERTIES},
+                        "required": ["index", *_SCORE_PROPERTIES],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["scores"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+JSON_OBJECT_FORMAT: Dict[str, str] = {"type": "json_object"}
+
 
 @dataclass
 class TrendScore:
@@ -108,19 +188,25 @@ def _validate_score_field(value: Any, field: str, is_float: bool = False) -> Any
         return 1.0 if is_float else 1
 
 
+# (field, is_float) for every numeric TrendScore field
+_SCORE_FIELDS = (
+    ("velocity", False),
+    ("commercial", False),
+    ("safety", False),
+    ("uniqueness", False),
+    ("overall", True),
+)
+_REQUIRED_FIELDS = frozenset(name for name, _ in _SCORE_FIELDS) | {"reasoning"}
+
+
 def _parse_single_score(data: Dict[str, Any]) -> TrendScore:
     """Parse a single score dict into a TrendScore. Raises ValueError on bad data."""
-    required_fields = {"velocity", "commercial", "safety", "uniqueness", "overall", "reasoning"}
-    missing = required_fields - set(data.keys())
+    missing = _REQUIRED_FIELDS.difference(data)
     if missing:
-        raise ValueError(f"Missing required fields: {missing}")
+        raise ValueError(f"Missing required fields: {set(missing)}")
 
     return TrendScore(
-        velocity=_validate_score_field(data["velocity"], "velocity"),
-        commercial=_validate_score_field(data["commercial"], "commercial"),
-        safety=_validate_score_field(data["safety"], "safety"),
-        uniqueness=_validate_score_field(data["uniqueness"], "uniqueness"),
-        overall=_validate_score_field(data["overall"], "overall", is_float=True),
+        **{name: _validate_score_field(data[name], name, is_float) for name, is_float in _SCORE_FIELDS},
         reasoning=str(data.get("reasoning", "")),
     )
 
@@ -139,7 +225,7 @@ def parse_score_response(raw_json: str) -> TrendScore:
         ValueError: If the JSON is malformed or missing required fields.
     """
     try:
-        data = json.loads(raw_json)
+        data = _json_loads(raw_json)
     except json.JSONDecodeError as exc:
         raise ValueError(f"Malformed JSON response: {exc}") from exc
 
@@ -149,6 +235,28 @@ def parse_score_response(raw_json: str) -> TrendScore:
     return _parse_single_score(data)
 
 
+# Start of the "scores" array, for salvaging responses cut off mid-array
+_SCORES_ARRAY_RE = re.compile(r'"scores"\s*:\s*\[')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _truncated_scores(raw_json: str) -> List[Any]:
+    """Return the complete items of a "scores" array that was cut off mid-response."""
+    match = _SCORES_ARRAY_RE.search(raw_json)
+    if not match:
+        return []
+    items: List[Any] = []
+    pos = match.end()
+    while True:
+        while pos < len(raw_json) and raw_json[pos] in " \t\r\n,":
+            pos += 1
+        try:
+            item, pos = _JSON_DECODER.raw_decode(raw_json, pos)
+        except json.JSONDecodeError:
+            return items
+        items.append(item)
+
+
 def parse_batch_response(raw_json: str, expected_count: int) -> Dict[int, TrendScore]:
     """
     Parse a batch JSON response into a dict of index -> TrendScore.
@@ -158,15 +266,22 @@ def parse_batch_response(raw_json: str, expected_count: int) -> Dict[int, TrendS
         expected_count: How many trends were sent (for logging).
 
     Returns:
-        Dict mapping 0-based trend index to TrendScore.
+        Dict mapping 0-based trend index to TrendScore. A response truncated
+        mid-array yields the scores that were completed before the cut.
 
     Raises:
         ValueError: If the JSON is malformed or the scores array is missing.
     """
     try:
-        data = json.loads(raw_json)
+        data = _json_loads(raw_json)
     except json.JSONDecodeError as exc:
-        raise ValueError(f"Malformed JSON response: {exc}") from exc
+        # Keep the complete scores of a truncated response instead of
+        # paying for a retry of the whole batch
+        salvaged = _truncated_scores(raw_json)
+        if not salvaged:
+            raise ValueError(f"Malformed JSON response: {exc}") from exc
+        logger.warning("Batch response truncated, kept %d complete scores", len(salvaged))
+        data = {"scores": salvaged}
 
     if not isinstance(data, dict) or "scores" not in data:
         raise ValueError(f"Expected JSON object with 'scores' key, got: {list(data.keys()) if isinstance(data, dict) else type(data).__name__}")
@@ -196,6 +311,31 @@ def parse_batch_response(raw_json: str, expected_count: int) -> Dict[int, TrendS
     return result
 
 
+def _prefiltered_score(topic: str, keywords: Iterable[str] = ()) -> Optional[TrendScore]:
+    """
+    Score a blocklisted trend locally instead of asking the model.
+
+    Checks the topic together with its keywords, which can carry terms the
+    topic alone doesn't (e.g. from a Reddit post body). A blocklisted trend
+    could never pass the safety dimension, so it gets the minimum score.
+    """
+    is_blocked, match_term, blocklist_type = check_blocklists(" ".join([topic, *keywords]))
+    if not is_blocked:
+        return None
+    logger.info(
+        "Trend '%.50s' prefiltered by %s blocklist (matched '%s')",
+        topic, blocklist_type, match_term,
+    )
+    return TrendScore(
+        velocity=1,
+        commercial=1,
+        safety=1,
+        uniqueness=1,
+        overall=1.0,
+        reasoning=f"Prefiltered: matched {blocklist_type} blocklist term '{match_term}'.",
+    )
+
+
 class TrendScorer:
     """
     Scores trends using GPT-4o-mini with structured output.
@@ -208,30 +348,55 @@ class TrendScorer:
         openai_api_key: Optional[str] = None,
         model: Optional[str] = None,
         openai_client: Optional[Any] = None,
+        async_openai_client: Optional[Any] = None,
+        db: Optional["SupabaseClient"] = None,
+        rate_limiter: Optional["OpenAIRateLimiter"] = None,
+        spend_tracker: Optional["SpendTracker"] = None,
+        structured_output: Optional[bool] = None,
     ) -> None:
         """
         Args:
             openai_api_key: OpenAI API key. Falls back to config.
             model: Model name. Defaults to gpt-4o-mini.
             openai_client: Pre-built OpenAI client (for testing).
+            async_openai_client: Pre-built AsyncOpenAI client, used to score
+                several batches concurrently.
+            db: Supabase client for the scored_trends_cache table. Without
+                it every trend is scored.
+            rate_limiter: Shared requests-per-minute limiter awaited before
+                every LLM call.
+            spend_tracker: Receives the estimated cost of every response,
+                from its token usage.
+            structured_output: Request strict JSON-schema output instead of
+                plain JSON mode. Defaults to config (on), or off when a
+                pre-built client is passed.
         """
         self._client = openai_client
+        self._aclient = async_openai_client
+        self._db = db
+        self._rate_limiter = rate_limiter
+        self._spend_tracker = spend_tracker
 
         if not self._client:
             cfg = load_config(require_all=False)
             api_key = openai_api_key or cfg.openai.api_key
             self._model = model or cfg.openai.scoring_model
+            if structured_output is None:
+                structured_output = cfg.openai.structured_output
 
             try:
-                from openai import OpenAI
+                from openai import AsyncOpenAI, OpenAI
                 base_url = cfg.openai.base_url or None
                 self._client = OpenAI(api_key=api_key, base_url=base_url)
+                if not self._aclient:
+                    self._aclient = AsyncOpenAI(api_key=api_key, base_url=base_url)
                 logger.info("LLM client initialized for scoring")
             except Exception as exc:
                 logger.error("Failed to initialize LLM client: %s", exc)
                 self._client = None
         else:
             self._model = model or "gemini-2.5-flash"
+        self._structured = bool(structured_output)
 
     def score_trend(
         self,
@@ -254,62 +419,200 @@ class TrendScorer:
             logger.error("OpenAI client not available, cannot score trend")
             return None
 
+        prefiltered = _prefiltered_score(topic)
+        if prefiltered:
+            return prefiltered
+
         user_prompt = USER_PROMPT_TEMPLATE.format(
             topic=topic,
             sample_posts=sample_posts or "No additional context available.",
             source_list=source_list or "unknown",
         )
+        messages = [SYSTEM_MESSAGE, {"role": "user", "content": user_prompt}]
 
         for attempt in range(1, MAX_JSON_RETRIES + 2):  # 1 initial + 2 retries
             try:
+                self._throttle()
                 response = self._client.chat.completions.create(
                     model=self._model,
-                    response_format={"type": "json_object"},
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prompt},
-                    ],
+                    response_format=self._response_format(single=True),
+                    messages=messages,
                     temperature=0.3,
                 )
+                self._record_usage(response)
                 raw_content = response.choices[0].message.content or ""
                 score = parse_score_response(raw_content)
                 logger.info(
-                    "Scored trend '%s': overall=%.1f (%s)",
-                    topic[:50], score.overall,
+                    "Scored trend '%.50s': overall=%.1f (%s)",
+                    topic, score.overall,
                     "QUALIFIES" if score.qualifies() else "below threshold",
                 )
                 return score
 
             except ValueError as exc:
                 logger.warning(
-                    "JSON parse failed for trend '%s' (attempt %d/%d): %s",
-                    topic[:50], attempt, MAX_JSON_RETRIES + 1, exc,
+                    "JSON parse failed for trend '%.50s' (attempt %d/%d): %s",
+                    topic, attempt, MAX_JSON_RETRIES + 1, exc,
                 )
                 if attempt > MAX_JSON_RETRIES:
                     logger.error(
-                        "All JSON retries exhausted for trend '%s'", topic[:50]
+                        "All JSON retries exhausted for trend '%.50s'", topic
                     )
                     return None
 
             except Exception as exc:
                 logger.error(
-                    "OpenAI API error scoring trend '%s' (attempt %d): %s",
-                    topic[:50], attempt, exc,
+                    "OpenAI API error scoring trend '%.50s' (attempt %d): %s",
+                    topic, attempt, exc,
                 )
                 if attempt > MAX_JSON_RETRIES:
                     return None
 
         return None
 
+    def _response_format(self, single: bool) -> Dict[str, Any]:
+        if not self._structured:
+            return JSON_OBJECT_FORMAT
+        return SCORE_RESPONSE_FORMAT if single else BATCH_RESPONSE_FORMAT
+
+    def _throttle(self) -> None:
+        if self._rate_limiter:
+            self._rate_limiter.acquire(f"openai:{self._model}")
+
+    async def _athrottle(self) -> None:
+        if self._rate_limiter:
+            await self._rate_limiter.aacquire(f"openai:{self._model}")
+
+    def _record_usage(self, response: Any) -> None:
+        usage = getattr(response, "usage", None)
+        if self._spend_tracker is None or usage is None:
+            return
+        from src.monitoring.spend_tracker import estimate_llm_cost
+
+        self._spend_tracker.record_spend(estimate_llm_cost(
+            int(getattr(usage, "prompt_tokens", 0) or 0),
+            int(getattr(usage, "completion_tokens", 0) or 0),
+        ))
+
+    def _score_key(self, trend: Dict[str, Any]) -> str:
+        topic = trend.get("topic_normalized") or trend.get("topic", "").lower().strip()
+        keywords = ",".join(sorted(trend.get("keywords") or ()))
+        return hashlib.sha256(f"{self._model}|{topic}|{keywords}".encode()).hexdigest()
+
+    def _cached_scores(self, keys: List[str]) -> Dict[str, TrendScore]:
+        """Scores cached within SCORE_CACHE_TTL for the given keys."""
+        if self._db is None or not keys:
+            return {}
+        try:
+            rows = self._db.get_score_cache(list(dict.fromkeys(keys)))
+        except Exception as exc:
+            logger.warning("Score cache lookup failed: %s", exc)
+            return {}
+        cutoff = datetime.now(timezone.utc) - SCORE_CACHE_TTL
+        found: Dict[str, TrendScore] = {}
+        for row in rows:
+            try:
+                if datetime.fromisoformat(row["created_at"]) < cutoff:
+                    continue
+                found[row["hash"]] = _parse_single_score(row["score"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return found
+
+    def _store_scores(self, entries: Dict[str, TrendScore]) -> None:
+        if self._db is None or not entries:
+            return
+        try:
+            self._db.upsert_score_cache({k: asdict(v) for k, v in entries.items()})
+        except Exception as exc:
+            logger.warning("Failed to store %d cached scores: %s", len(entries), exc)
+
+    @staticmethod
+    def _batch_messages(trends: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Build the chat messages scoring a numbered list of trends."""
+        trends_block = "\n".join(
+            f"{i}. [{trend.get('source', 'unknown')}] {trend.get('topic', '')}"
+            for i, trend in enumerate(trends, start=1)
+        )
+        user_prompt = "".join((_BATCH_PROMPT_HEAD, trends_block, _BATCH_PROMPT_TAIL))
+        return [SYSTEM_MESSAGE, {"role": "user", "content": user_prompt}]
+
+    @staticmethod
+    def _batch_attempt_failed(attempt: int, exc: Exception) -> bool:
+        """Log a failed batch attempt; return True once retries are exhausted."""
+        if isinstance(exc, ValueError):
+            logger.warning("Batch JSON parse failed (attempt %d/%d): %s", attempt, MAX_JSON_RETRIES + 1, exc)
+            if attempt > MAX_JSON_RETRIES:
+                logger.error("All batch JSON retries exhausted, skipping scoring")
+        else:
+            logger.error("LLM API error during batch scoring (attempt %d): %s", attempt, exc)
+        return attempt > MAX_JSON_RETRIES
+
+    def _score_batch(self, trends: List[Dict[str, Any]]) -> Optional[Dict[int, TrendScore]]:
+        """Score up to SCORE_BATCH_SIZE trends in one call; None if all attempts fail."""
+        messages = self._batch_messages(trends)
+        for attempt in range(1, MAX_JSON_RETRIES + 2):
+            try:
+                self._throttle()
+                response = self._client.chat.completions.create(
+                    model=self._model,
+                    response_format=self._response_format(single=False),
+                    messages=messages,
+                    temperature=0.3,
+                )
+                self._record_usage(response)
+                raw_content = response.choices[0].message.content or ""
+                return parse_batch_response(raw_content, expected_count=len(trends))
+            except Exception as exc:
+                if self._batch_attempt_failed(attempt, exc):
+                    return None
+        return None
+
+    async def _ascore_batch(
+        self, trends: List[Dict[str, Any]], semaphore: asyncio.Semaphore,
+    ) -> Optional[Dict[int, TrendScore]]:
+        """Async twin of _score_batch, bounded by semaphore."""
+        messages = self._batch_messages(trends)
+        async with semaphore:
+            for attempt in range(1, MAX_JSON_RETRIES + 2):
+                try:
+                    await self._athrottle()
+                    response = await self._aclient.chat.completions.create(
+                        model=self._model,
+                        response_format=self._response_format(single=False),
+                        messages=messages,
+                        temperature=0.3,
+                    )
+                    self._record_usage(response)
+                    raw_content = response.choices[0].message.content or ""
+                    return parse_batch_response(raw_content, expected_count=len(trends))
+                except Exception as exc:
+                    if self._batch_attempt_failed(attempt, exc):
+                        return None
+        return None
+
+    async def _ascore_batches(
+        self, batches: List[List[Dict[str, Any]]],
+    ) -> List[Optional[Dict[int, TrendScore]]]:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        results = await asyncio.gather(
+            *(self._ascore_batch(batch, semaphore) for batch in batches),
+            return_exceptions=True,
+        )
+        return [None if isinstance(r, BaseException) else r for r in results]
+
     def score_and_filter(
         self,
         trends: List[Dict[str, Any]],
         threshold: float = OVERALL_THRESHOLD,
     ) -> List[Dict[str, Any]]:
         """
-        Score a list of trends in a single batch API call and return qualifying ones.
+        Score a list of trends in batched API calls and return qualifying ones.
 
-        Sends all trends in one prompt to minimize API quota usage.
+        Trends are sent SCORE_BATCH_SIZE per prompt to keep quota usage low.
+        When there are several batches and an async client is available,
+        the batches are scored concurrently (at most MAX_CONCURRENT_REQUESTS
+        in flight), so latency tracks the slowest batch rather than the sum.
         Each qualifying trend dict gets score fields added directly.
 
         Args:
@@ -322,60 +625,70 @@ class TrendScorer:
         if not trends:
             return []
 
-        if not self._client:
-            logger.error("LLM client not available, cannot score trends")
-            return []
-
-        # Build numbered trend block for the prompt
-        lines = []
-        for i, trend in enumerate(trends, start=1):
-            topic = trend.get("topic", "")
-            source = trend.get("source", "unknown")
-            lines.append(f"{i}. [{source}] {topic}")
-        trends_block = "\n".join(lines)
-
-        user_prompt = BATCH_PROMPT_TEMPLATE.format(trends_block=trends_block)
-
-        for attempt in range(1, MAX_JSON_RETRIES + 2):
-            try:
-                response = self._client.chat.completions.create(
-                    model=self._model,
-                    response_format={"type": "json_object"},
-                    messages=[
-                        {"role": "system", "content": SYSTEM_PROMPT},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=0.3,
-                )
-                raw_content = response.choices[0].message.content or ""
-                scores_by_index = parse_batch_response(raw_content, expected_count=len(trends))
-                break
-
-            except ValueError as exc:
-                logger.warning("Batch JSON parse failed (attempt %d/%d): %s", attempt, MAX_JSON_RETRIES + 1, exc)
-                if attempt > MAX_JSON_RETRIES:
-                    logger.error("All batch JSON retries exhausted, skipping scoring")
-                    return []
+        # Trends scored in a recent cycle reuse their cached score
+        keys = [self._score_key(trend) for trend in trends]
+        cached = self._cached_scores(keys)
+        scores_by_index: Dict[int, TrendScore] = {
+            i: cached[key] for i, key in enumerate(keys) if key in cached
+        }
+        if cached:
+            logger.info("Score cache hits for %d of %d trends", len(scores_by_index), len(trends))
 
-            except Exception as exc:
-                logger.error("LLM API error during batch scoring (attempt %d): %s", attempt, exc)
-                if attempt > MAX_JSON_RETRIES:
-                    return []
+        # Blocklisted trends are scored locally, without an API call
+        for i, trend in enumerate(trends):
+            if i not in scores_by_index:
+                prefiltered = _prefiltered_score(trend.get("topic", ""), trend.get("keywords") or ())
+                if prefiltered:
+                    scores_by_index[i] = prefiltered
+
+        # Trends sharing a score key (same normalized topic and keywords) are
+        # sent once and share the result
+        first_by_key: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            if i not in scores_by_index:
+                first_by_key.setdefault(key, i)
+        pending = list(first_by_key.values())
+        if pending and not self._client:
+            # Cached and prefiltered scores still apply without a client
+            logger.error("LLM client not available, cannot score %d trends", len(pending))
+            pending = []
+
+        batches = [
+            pending[start:start + SCORE_BATCH_SIZE]
+            for start in range(0, len(pending), SCORE_BATCH_SIZE)
+        ]
+        batch_trends = [[trends[i] for i in batch] for batch in batches]
+        if len(batches) > 1 and self._aclient:
+            batch_scores = asyncio.run(self._ascore_batches(batch_trends))
         else:
+            batch_scores = [self._score_batch(batch) for batch in batch_trends]
+
+        if not scores_by_index and all(scores is None for scores in batch_scores):
             return []
 
+        fresh: Dict[str, TrendScore] = {}
+        for batch, scores in zip(batches, batch_scores):
+            for i, score in (scores or {}).items():
+                if 0 <= i < len(batch):
+                    scores_by_index[batch[i]] = score
+                    fresh[keys[batch[i]]] = score
+        self._store_scores(fresh)
+        for i, key in enumerate(keys):
+            if i not in scores_by_index and key in fresh:
+                scores_by_index[i] = fresh[key]
+
         qualified: List[Dict[str, Any]] = []
         for i, trend in enumerate(trends):
             topic = trend.get("topic", "")
             score = scores_by_index.get(i)
 
             if score is None:
-                logger.warning("No score returned for trend '%s', skipping", topic[:50])
+                logger.warning("No score returned for trend '%.50s', skipping", topic)
                 continue
 
             logger.info(
-                "Scored trend '%s': overall=%.1f (%s)",
-                topic[:50], score.overall,
+                "Scored trend '%.50s': overall=%.1f (%s)",
+                topic, score.overall,
                 "QUALIFIES" if score.qualifies(threshold) else "below threshold",
             )
 
@@ -10,9 +10,10 @@ from __future__ import annotations
 
 import logging
 import xml.etree.ElementTree as ET
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
-import requests
+import httpx
 
 from src.trends.sources.reddit import extract_keywords, sanitize_external_text
 
@@ -33,20 +34,24 @@ class GoogleTrendsSource:
 
     def __init__(
         self,
-        session: Optional[requests.Session] = None,
+        session: Optional[httpx.Client] = None,
     ) -> None:
         """
         Args:
-            session: Pre-built requests.Session (for testing).
+            session: Pre-built httpx.Client (for testing).
         """
         if session is not None:
             self._session = session
         else:
-            self._session = requests.Session()
-            self._session.headers.update({
-                "User-Agent": "sticker-trendz/1.0 (trend monitoring)",
-                "Accept": "application/rss+xml, application/xml, text/xml",
-            })
+            self._session = httpx.Client(
+                http2=True,
+                headers={
+                    "User-Agent": "sticker-trendz/1.0 (trend monitoring)",
+                    "Accept": "application/rss+xml, application/xml, text/xml",
+                },
+                timeout=_REQUEST_TIMEOUT,
+                follow_redirects=True,
+            )
 
     def fetch_trends(self) -> List[Dict[str, Any]]:
         """
@@ -109,7 +114,7 @@ class GoogleTrendsSource:
             })
 
         # Sort by approx traffic descending
-        all_trends.sort(key=lambda t: t.get("score_hint", 0), reverse=True)
+        all_trends.sort(key=itemgetter("score_hint"), reverse=True)
         logger.info("Google Trends RSS returned %d trend candidates", len(all_trends))
         return all_trends
 
@@ -8,11 +8,14 @@ Extracts keywords and topics from post titles and content.
 
 from __future__ import annotations
 
+import heapq
 import logging
 import re
-from typing import Any, Dict, List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, List, Optional
 
-import requests
+import httpx
 
 from src.config import load_config
 from src.resilience import retry, RetryExhaustedError
@@ -29,20 +32,35 @@ MAX_SELFTEXT_LENGTH = 1000
 # Reddit public JSON API — no auth needed
 _REDDIT_BASE_URL = "https://www.reddit.com"
 _REQUEST_TIMEOUT = 10  # seconds
+# Subreddits fetched in parallel; each is one request, so this stays well
+# under Reddit's unauthenticated rate limit
+MAX_FETCH_WORKERS = 8
 
-# Regex for stripping HTML tags and control characters
+# Regex for stripping HTML tags, and a str.translate table deleting
+# control characters (C0, DEL and C1)
 _HTML_TAG_RE = re.compile(r"<[^>]*>")
-_CONTROL_CHAR_RE = re.compile(r"[\x00-\x1f\x7f-\x9f]")
+_CONTROL_CHAR_TABLE = dict.fromkeys([*range(0x00, 0x20), *range(0x7F, 0xA0)])
+
+# Regexes for keyword extraction: URLs, and candidate words (runs of word
+# chars and hyphens, 3+ long; anything else separates words)
+_URL_RE = re.compile(r"https?://\S+")
+_WORD_RE = re.compile(r"[\w-]{3,}")
 
 
 def sanitize_external_text(text: str, max_length: int = MAX_TOPIC_LENGTH) -> str:
     """Strip HTML tags, control characters, and enforce max length on external text."""
-    text = _HTML_TAG_RE.sub("", text)
-    text = _CONTROL_CHAR_RE.sub("", text)
+    # A '<' with no '>' after it can't start a tag; leaving that tail out of
+    # the regex keeps runs of unclosed '<' from rescanning to the end of the
+    # text once per '<' (quadratic on long selftexts)
+    end = text.rfind(">") + 1
+    head = text[:end]
+    if "<" in head:
+        text = _HTML_TAG_RE.sub("", head) + text[end:]
+    text = text.translate(_CONTROL_CHAR_TABLE)
     return text.strip()[:max_length]
 
 
-STOP_WORDS: Set[str] = {
+STOP_WORDS: FrozenSet[str] = frozenset({
     "a", "an", "and", "are", "as", "at", "be", "but", "by", "for",
     "from", "had", "has", "have", "he", "her", "his", "how", "i",
     "if", "in", "into", "is", "it", "its", "just", "me", "my", "no",
@@ -63,7 +81,7 @@ STOP_WORDS: Set[str] = {
     "come", "think", "tell", "work", "give", "take", "find", "try",
     "let", "put", "keep", "thing", "people", "yeah", "okay", "right",
     "really", "im", "dont", "cant", "ive", "thats",
-}
+})
 
 
 def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
@@ -80,27 +98,15 @@ def extract_keywords(text: str, max_keywords: int = 10) -> List[str]:
     Returns:
         List of lowercase keyword strings.
     """
-    # Remove URLs
-    text = re.sub(r"https?://\S+", "", text)
-    # Remove special characters but keep spaces and hyphens
-    text = re.sub(r"[^\w\s-]", " ", text.lower())
-    # Split into words
-    words = text.split()
-    # Filter stop words and very short words
-    keywords = [
-        w for w in words
-        if w not in STOP_WORDS and len(w) > 2 and not w.isdigit()
-    ]
-    # Deduplicate while preserving order
-    seen: set[str] = set()
-    unique: list[str] = []
-    for kw in keywords:
-        if kw not in seen:
-            seen.add(kw)
-            unique.append(kw)
-    # Sort by length descending (prefer more specific terms)
-    unique.sort(key=len, reverse=True)
-    return unique[:max_keywords]
+    # Remove URLs, then tokenize in one pass; punctuation splits words and
+    # words shorter than 3 characters are never emitted
+    words = _WORD_RE.findall(_URL_RE.sub("", text).lower())
+    # Filter stop words and numbers, deduplicating in order
+    unique = dict.fromkeys(
+        w for w in words if w not in STOP_WORDS and not w.isdigit()
+    )
+    # Longest first (prefer more specific terms); ties keep their order
+    return heapq.nlargest(max_keywords, unique, key=len)
 
 
 class RedditSource:
@@ -116,13 +122,13 @@ class RedditSource:
         self,
         user_agent: Optional[str] = None,
         subreddits: Optional[List[str]] = None,
-        session: Optional[requests.Session] = None,
+        session: Optional[httpx.Client] = None,
     ) -> None:
         """
         Args:
             user_agent: User-Agent header value. Falls back to config/default.
             subreddits: List of subreddit names to monitor.
-            session: Pre-built requests.Session (for testing / connection reuse).
+            session: Pre-built httpx.Client (for testing / connection reuse).
         """
         self._subreddits = subreddits or DEFAULT_SUBREDDITS
 
@@ -132,8 +138,14 @@ class RedditSource:
         if session is not None:
             self._session = session
         else:
-            self._session = requests.Session()
-            self._session.headers.update({"User-Agent": self._user_agent})
+            # One HTTP/2 connection to reddit.com carries every concurrent
+            # subreddit fetch
+            self._session = httpx.Client(
+                http2=True,
+                headers={"User-Agent": self._user_agent},
+                timeout=_REQUEST_TIMEOUT,
+                follow_redirects=True,
+            )
 
         logger.info("RedditSource initialized (unauthenticated public API)")
 
@@ -184,17 +196,28 @@ class RedditSource:
         """
         all_trends: List[Dict[str, Any]] = []
 
-        for sub_name in self._subreddits:
+        def fetch(sub_name: str) -> Optional[List[Dict[str, Any]]]:
             try:
                 posts = self._fetch_subreddit_hot(sub_name, limit=posts_per_sub)
-                logger.info(
-                    "Fetched %d posts from r/%s", len(posts), sub_name
-                )
             except (RetryExhaustedError, Exception) as exc:
                 logger.error(
                     "Failed to fetch from r/%s (graceful degradation): %s",
                     sub_name, exc,
                 )
+                return None
+            logger.info(
+                "Fetched %d posts from r/%s", len(posts), sub_name
+            )
+            return posts
+
+        # Subreddits are independent I/O-bound requests; fetch them
+        # concurrently and handle the results in subreddit order
+        workers = max(1, min(MAX_FETCH_WORKERS, len(self._subreddits)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(fetch, self._subreddits))
+
+        for sub_name, posts in zip(self._subreddits, results):
+            if posts is None:
                 continue
 
             for post in posts:
@@ -220,6 +243,6 @@ class RedditSource:
                 })
 
         # Sort by Reddit score (most upvoted first)
-        all_trends.sort(key=lambda t: t.get("score_hint", 0), reverse=True)
+        all_trends.sort(key=itemgetter("score_hint"), reverse=True)
         logger.info("Reddit source returned %d trend candidates", len(all_trends))
         return all_trends
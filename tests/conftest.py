@@ -170,7 +170,7 @@ def cleanup_r2_objects(storage, prefix: str) -> None:
         objects = storage.list_objects(prefix)
         for obj in objects:
             try:
-                storage.delete_object(obj["Key"])
+                storage.delete_object(obj.key)
             except Exception:
                 pass
     except Exception as exc:
@@ -65,7 +65,7 @@ class TestR2StorageIntegration:
         key = f"{r2_test_prefix}/test-list.png"
         storage.upload_image(key, TINY_PNG)
         objects = storage.list_objects(r2_test_prefix)
-        keys = [obj["Key"] for obj in objects]
+        keys = [obj.key for obj in objects]
         assert key in keys
 
     def test_delete_object_removes_it(self, storage, r2_test_prefix):
@@ -74,7 +74,7 @@ class TestR2StorageIntegration:
         storage.upload_image(key, TINY_PNG)
         storage.delete_object(key)
         objects = storage.list_objects(r2_test_prefix)
-        keys = [obj["Key"] for obj in objects]
+        keys = [obj.key for obj in objects]
         assert key not in keys
 
     def test_public_url_format(self, storage, r2_test_prefix):
@@ -72,6 +72,21 @@ class TestTrendsCRUD:
         assert found is not None
         assert found["topic_normalized"] == normalized
 
+    def test_get_trends_by_normalized_topics(self, db, prefix):
+        """Retrieve several trends by normalized topic in one query."""
+        normalized = [f"{prefix.lower()}-batch-{i}" for i in range(2)]
+        for i, norm in enumerate(normalized):
+            db.insert_trend({
+                "topic": f"[{prefix}] Batch {i}",
+                "topic_normalized": norm,
+                "sources": ["reddit"],
+                "keywords": ["test"],
+                "status": "discovered",
+                "score_overall": 50.0,
+            })
+        found = db.get_trends_by_normalized_topics(normalized + [f"{prefix.lower()}-missing"])
+        assert set(found) == set(normalized)
+
     def test_update_trend(self, db, prefix):
         """Update a trend's status."""
         result = db.insert_trend({
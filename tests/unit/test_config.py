@@ -4,7 +4,7 @@ import os
 import pytest
 from unittest.mock import patch
 
-from src.config import load_config, ConfigError, _optional_int, _optional_float
+from src.config import load_config, ConfigError, _optional_int, _optional_float, _optional_bool
 
 
 class TestLoadConfig:
@@ -26,6 +26,8 @@ class TestLoadConfig:
             assert config.openai.prompt_model == "gpt-4o-mini"
             assert config.openai.seo_model == "gpt-4o-mini"
             assert config.openai.moderation_api_key == ""
+            assert config.openai.structured_output is True
+            assert config.openai.requests_per_minute == 500
             assert config.replicate.model_id == "black-forest-labs/flux-schnell"
             assert config.replicate.model_version == ""
             assert config.replicate.image_size == 1024
@@ -178,6 +180,7 @@ class TestLoadConfig:
             assert config.caps.max_images_per_day == 50
             assert config.caps.max_active_listings == 300
             assert config.caps.ai_monthly_budget_cap_usd == 150.0
+            assert config.caps.max_concurrent_trends == 2
 
 
 class TestOptionalHelpers:
@@ -206,3 +209,19 @@ class TestOptionalHelpers:
     def test_optional_float_returns_default_on_bad_value(self):
         with patch.dict(os.environ, {"MY_FLOAT": "nope"}, clear=True):
             assert _optional_float("MY_FLOAT", 3.14) == 3.14
+
+
+class TestOptionalBool:
+    """Tests for the _optional_bool helper."""
+
+    @pytest.mark.parametrize("raw,expected", [
+        ("1", True), ("true", True), ("YES", True), ("on", True),
+        ("0", False), ("false", False), ("", False),
+    ])
+    def test_parses_value(self, raw, expected):
+        with patch.dict(os.environ, {"TEST_BOOL": raw}):
+            assert _optional_bool("TEST_BOOL", not expected) is expected
+
+    def test_missing_returns_default(self):
+        with patch.dict(os.environ, {}, clear=True):
+            assert _optional_bool("TEST_BOOL", True) is True
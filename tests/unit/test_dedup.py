@@ -47,6 +47,25 @@ class TestJaccardSimilarity:
         assert jaccard_similarity(small, large) == 0.5
 
 
+class TestJaccardBits:
+    """Test that the bitmap Jaccard matches the set version."""
+
+    @pytest.mark.parametrize("set_a,set_b", [
+        ({"a", "b", "c"}, {"b", "c", "d"}),
+        ({"a"}, {"a"}),
+        ({"a"}, {"b"}),
+        (set(), set()),
+        (set(), {"a"}),
+    ])
+    def test_matches_set_jaccard(self, set_a, set_b):
+        from src.trends.dedup import _jaccard_bits
+
+        bit = {kw: 1 << n for n, kw in enumerate(sorted(set_a | set_b))}
+        mask_a = sum(bit[k] for k in set_a)
+        mask_b = sum(bit[k] for k in set_b)
+        assert _jaccard_bits(mask_a, mask_b) == jaccard_similarity(set_a, set_b)
+
+
 class TestTopicNormalization:
     """Test topic normalization (lowercase, stemming)."""
 
@@ -152,6 +171,16 @@ class TestMergeSourcesArray:
         assert "twitter" in sources
         assert "google" in sources
 
+    def test_merged_sources_keep_first_seen_order(self):
+        """Duplicate sources are dropped without reordering."""
+        trends = [
+            {"topic": "A", "keywords": ["x", "y", "z"], "source": ["twitter", "reddit"]},
+            {"topic": "B", "keywords": ["x", "y", "z"], "source": "twitter"},
+            {"topic": "C", "keywords": ["x", "y", "z"], "source": "google"},
+        ]
+        result = deduplicate_trends(trends, similarity_threshold=0.5)
+        assert result[0]["sources"] == ["twitter", "reddit", "google"]
+
 
 class TestDeduplicateEdgeCases:
     """Edge cases for deduplication."""
@@ -167,3 +196,67 @@ class TestDeduplicateEdgeCases:
         assert len(result) == 1
         assert result[0]["topic"] == "Solo"
         assert result[0]["sources"] == ["reddit"]
+
+    def test_extra_fields_kept_and_input_unchanged(self):
+        """Canonical trends keep extra input fields; input keywords aren't mutated."""
+        keywords = ["hippo", "baby"]
+        trends = [
+            {"topic": "Baby Hippo", "keywords": keywords, "source": "reddit", "region": "US"},
+            {"topic": "Baby Hippo", "keywords": ["hippo", "zoo"], "source": "google_trends"},
+        ]
+        result = deduplicate_trends(trends, similarity_threshold=0.1)
+        assert len(result) == 1
+        assert result[0]["region"] == "US"
+        assert result[0]["keywords"] == ["hippo", "baby", "zoo"]
+        assert keywords == ["hippo", "baby"]
+
+
+class TestDeduplicateCandidateIndex:
+    """Test that only trends sharing a keyword are compared."""
+
+    def test_disjoint_trends_not_compared(self, monkeypatch):
+        """Trends with no keyword in common skip the similarity computation."""
+        from src.trends import dedup
+
+        calls = []
+        real = dedup._jaccard_bits
+        monkeypatch.setattr(
+            dedup, "_jaccard_bits", lambda a, b: calls.append((a, b)) or real(a, b),
+        )
+        trends = [
+            {"topic": f"T{i}", "keywords": [f"kw{i}", f"other{i}"], "source": "reddit"}
+            for i in range(10)
+        ]
+        trends.append({"topic": "Dup", "keywords": ["kw3", "other3"], "source": "google"})
+
+        result = deduplicate_trends(trends)
+
+        assert len(result) == 10
+        assert len(calls) == 1
+        assert sorted(result[3]["sources"]) == ["google", "reddit"]
+
+
+class TestCheckExistingTrends:
+    """Test the batched lookup of existing trends."""
+
+    def test_single_lookup_for_all_candidates(self):
+        """All candidates are checked with one query; only new trends are returned."""
+        from unittest.mock import MagicMock
+        from src.trends.dedup import check_existing_trends, EXISTING_TREND_COLUMNS
+
+        db = MagicMock()
+        db.get_trends_by_normalized_topics.return_value = {
+            "cat space": {"id": "t1", "topic": "Space Cat", "sources": ["reddit"]},
+        }
+        candidates = [
+            {"topic": "Space Cats", "sources": ["reddit", "google"]},
+            {"topic": "Moon Dog", "sources": ["reddit"]},
+        ]
+
+        new = check_existing_trends(candidates, db)
+
+        db.get_trends_by_normalized_topics.assert_called_once_with(
+            ["cat space", "dog moon"], columns=EXISTING_TREND_COLUMNS,
+        )
+        assert [t["topic"] for t in new] == ["Moon Dog"]
+        db.update_trend.assert_called_once_with("t1", {"sources": ["reddit", "google"]})
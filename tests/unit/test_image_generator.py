@@ -0,0 +1,623 @@
+"""Tests for src/stickers/image_generator.py -- concurrent generation orchestration."""
+
+import asyncio
+import io
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.db import DatabaseError
+from src.resilience import CircuitBreakerRegistry
+from src.stickers.image_generator import ImageGenerator, IMAGES_PER_TREND
+from src.stickers.post_processor import ProcessedImage
+from src.stickers.prompt_cache import SemanticPromptCache
+from src.stickers.quality_validator import ValidationResult
+
+
+class FakeReplicate:
+    """Replicate client stub that records peak concurrency of async_run."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = []
+
+    async def async_run(self, model_ref, input):
+        self.calls.append(input["prompt"])
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return [f"https://replicate.example/{len(self.calls)}.png"]
+
+
+def _make_generator(replicate_client, db=None, **kwargs) -> ImageGenerator:
+    db = db or MagicMock()
+    db.insert_stickers.side_effect = lambda rows: [{"id": "s", **r} for r in rows]
+    db.get_image_cache.return_value = None
+    kwargs.setdefault("post_process_workers", 0)
+    gen = ImageGenerator(
+        db=db,
+        pipeline_logger=MagicMock(),
+        error_logger=MagicMock(),
+        replicate_client=replicate_client,
+        **kwargs,
+    )
+
+    async def fake_download(url):
+        return b"png-bytes"
+
+    gen._download = fake_download
+    return gen
+
+
+@pytest.fixture(autouse=True)
+def _stub_image_pipeline():
+    """Skip real validation/post-processing and isolate circuit breaker state."""
+    processed = ProcessedImage(
+        print_ready=b"print", thumbnail=b"thumb",
+        print_ready_size=(900, 900), thumbnail_size=(300, 300),
+    )
+    with patch(
+        "src.stickers.image_generator.validate_image",
+        return_value=ValidationResult(passed=True),
+    ), patch(
+        "src.stickers.image_generator.process_image", return_value=processed,
+    ), patch(
+        "src.resilience.circuit_breakers", CircuitBreakerRegistry(),
+    ):
+        yield
+
+
+class TestGenerateForTrend:
+    """Test per-trend generation fan-out."""
+
+    def test_prompts_generated_concurrently(self):
+        """All prompts for a trend are in flight at the same time."""
+        fake = FakeReplicate()
+        gen = _make_generator(fake)
+
+        stickers = gen.generate_for_trend({"id": "t1", "topic": "space cat"})
+
+        assert len(stickers) == IMAGES_PER_TREND
+        assert fake.peak == IMAGES_PER_TREND
+
+    def test_stickers_keep_prompt_order(self):
+        """Sticker records are created in prompt order."""
+        gen = _make_generator(FakeReplicate())
+        prompt_gen = MagicMock()
+        prompt_gen.generate_prompts.return_value = ["p1", "p2", "p3"]
+        gen._prompt_gen = prompt_gen
+
+        stickers = gen.generate_for_trend({"id": "t1", "topic": "space cat"})
+
+        assert [s["generation_prompt"] for s in stickers] == ["p1", "p2", "p3"]
+
+    def test_post_processing_overlaps_slow_generation(self):
+        """A fast image is post-processed while a slower one is still generating."""
+        gen = _make_generator(FakeReplicate())
+        prompt_gen = MagicMock()
+        prompt_gen.generate_prompts.return_value = ["fast", "slow", "slow"]
+        gen._prompt_gen = prompt_gen
+        events = []
+
+        async def generate(prompt):
+            await asyncio.sleep(0 if prompt == "fast" else 0.05)
+            events.append(f"generated {prompt}")
+            return b"png-bytes"
+
+        real_post_process = gen._post_process
+
+        async def post_process(image_bytes, topic, index):
+            events.append(f"processed {index}")
+            return await real_post_process(image_bytes, topic, index)
+
+        gen._generate_single_image = generate
+        gen._post_process = post_process
+
+        stickers = gen.generate_for_trend({"id": "t1", "topic": "space cat"})
+
+        assert len(stickers) == IMAGES_PER_TREND
+        assert events.index("processed 0") < events.index("generated slow")
+
+    def test_marks_trend_failed_when_all_images_fail(self):
+        """Trend status is generation_failed when no image survives."""
+        db = MagicMock()
+        gen = _make_generator(FakeReplicate(), db=db)
+
+        async def failing(prompt):
+            raise RuntimeError("replicate down")
+
+        gen._generate_single_image = failing
+
+        stickers = gen.generate_for_trend({"id": "t1", "topic": "space cat"})
+
+        assert stickers == []
+        db.update_trend.assert_called_with("t1", {"status": "generation_failed"})
+
+    def test_insert_failure_leaves_trend_status(self):
+        """Images that were produced but not recorded don't fail the trend."""
+        db = MagicMock()
+        alerter = MagicMock()
+        gen = _make_generator(FakeReplicate(), db=db, alerter=alerter)
+        db.insert_stickers.side_effect = DatabaseError("connection reset")
+
+        stickers = gen.generate_for_trend({"id": "t1", "topic": "space cat"})
+
+        assert stickers == []
+        db.update_trend.assert_not_called()
+        alerter.send_alert.assert_not_called()
+        assert gen._error_logger.log_error.call_args.kwargs["step"] == "sticker_insert"
+
+
+class TestRun:
+    """Test run()-level trend concurrency and caps."""
+
+    def test_trend_concurrency_bounded(self):
+        """No more than max_concurrent_trends trends generate at once."""
+        fake = FakeReplicate()
+        db = MagicMock()
+        db.get_trends_by_status.return_value = [
+            {"id": f"t{i}", "topic": f"topic {i}"} for i in range(4)
+        ]
+        gen = _make_generator(fake, db=db, max_concurrent_trends=2)
+
+        total = gen.run()
+
+        assert total == 4 * IMAGES_PER_TREND
+        assert fake.peak == 2 * IMAGES_PER_TREND
+
+    def test_db_writes_batched(self):
+        """One sticker insert per trend and one status update per run."""
+        db = MagicMock()
+        db.get_trends_by_status.return_value = [
+            {"id": f"t{i}", "topic": f"topic {i}"} for i in range(4)
+        ]
+        gen = _make_generator(FakeReplicate(), db=db)
+
+        gen.run()
+
+        assert db.insert_stickers.call_count == 4
+        assert all(len(c.args[0]) == IMAGES_PER_TREND for c in db.insert_stickers.call_args_list)
+        db.update_trends_status.assert_called_once()
+        ids, status = db.update_trends_status.call_args.args
+        assert sorted(ids) == ["t0", "t1", "t2", "t3"]
+        assert status == "generated"
+        db.update_trend.assert_not_called()
+
+    @pytest.mark.parametrize("concurrency", [1, 3])
+    def test_daily_cap_stops_new_trends(self, concurrency):
+        """Trends are not started once in-flight trends could reach the daily cap."""
+        fake = FakeReplicate()
+        db = MagicMock()
+        db.get_trends_by_status.return_value = [
+            {"id": f"t{i}", "topic": f"topic {i}"} for i in range(4)
+        ]
+        gen = _make_generator(
+            fake, db=db, max_concurrent_trends=concurrency,
+            max_images_per_day=IMAGES_PER_TREND,
+        )
+
+        assert gen.run() == IMAGES_PER_TREND
+
+
+class TestUploads:
+    """Test R2 upload fan-out."""
+
+    def test_uploads_run_in_parallel(self):
+        """original/print/thumbnail PUTs overlap rather than run serially."""
+        barrier = threading.Barrier(3, timeout=2)
+        storage = MagicMock()
+
+        def upload_image(key, data):
+            barrier.wait()  # only passes if all three uploads are in flight
+            return f"https://cdn.example/{key}"
+
+        storage.upload_image.side_effect = upload_image
+        gen = _make_generator(FakeReplicate(), storage=storage)
+
+        stickers = gen.generate_for_trend({"id": "t1", "topic": "space cat"})
+
+        assert len(stickers) == IMAGES_PER_TREND
+        sticker = stickers[0]
+        assert sticker["original_url"].endswith("/original.png")
+        assert sticker["image_url"].endswith("/print_ready.png")
+        assert sticker["thumbnail_url"].endswith("/thumbnail.png")
+
+
+def _mock_client(handler):
+    """AsyncClient factory that serves every request from handler."""
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(handler))
+    return factory
+
+
+class TestDownload:
+    """Test streaming download of Replicate output."""
+
+    def test_streams_body_over_shared_client(self):
+        """_download returns the full body and raises on HTTP errors."""
+        body = bytes(range(256)) * 1024
+
+        def handler(request):
+            if request.url.path == "/missing.png":
+                return httpx.Response(404)
+            return httpx.Response(200, content=body)
+
+        gen = ImageGenerator(
+            db=MagicMock(), pipeline_logger=MagicMock(), error_logger=MagicMock(),
+            replicate_client=FakeReplicate(),
+        )
+
+        async def fetch(path):
+            return await gen._download(f"https://replicate.example{path}")
+
+        with patch("src.stickers.image_generator.httpx.AsyncClient", _mock_client(handler)):
+            assert asyncio.run(fetch("/out.png")) == body
+            with pytest.raises(httpx.HTTPStatusError):
+                asyncio.run(fetch("/missing.png"))
+        assert gen._http is None
+
+    def test_concurrent_sessions_share_client_until_last_exits(self):
+        """A session exiting first must not close the client under another."""
+        clients = []
+        make_client = _mock_client(lambda request: httpx.Response(200, content=b"ok"))
+
+        def factory(**kwargs):
+            clients.append(make_client())
+            return clients[-1]
+
+        gen = ImageGenerator(
+            db=MagicMock(), pipeline_logger=MagicMock(), error_logger=MagicMock(),
+            replicate_client=FakeReplicate(),
+        )
+
+        async def run():
+            second_entered, first_done = asyncio.Event(), asyncio.Event()
+
+            async def first():
+                async with gen._http_session():
+                    await second_entered.wait()
+                first_done.set()
+
+            async def second():
+                async with gen._http_session():
+                    second_entered.set()
+                    await first_done.wait()
+                    return await gen._download("https://replicate.example/a.png")
+
+            return await asyncio.gather(first(), second())
+
+        with patch("src.stickers.image_generator.httpx.AsyncClient", side_effect=factory):
+            assert asyncio.run(run())[1] == b"ok"
+
+        assert len(clients) == 1
+        assert clients[0].is_closed
+        assert gen._http is None
+
+
+class TestImageCache:
+    """Test prompt-hash caching of Replicate output."""
+
+    def test_repeated_prompt_skips_replicate(self):
+        """A prompt generated once in-process is served from memory."""
+        fake = FakeReplicate()
+        gen = _make_generator(fake)
+
+        first = asyncio.run(gen._generate_cached_image("a space cat"))
+        second = asyncio.run(gen._generate_cached_image("a space cat"))
+
+        assert first == second == b"png-bytes"
+        assert fake.calls == ["a space cat"]
+
+    def test_persisted_hit_loads_from_r2(self):
+        """A cache row from a previous run is fetched from R2 instead of Replicate."""
+        fake = FakeReplicate()
+        db = MagicMock()
+        storage = MagicMock()
+        storage.get_object.return_value = b"cached-bytes"
+        gen = _make_generator(fake, db=db, storage=storage)
+        db.get_image_cache.return_value = {"r2_key": "stickers/old/original.png"}
+
+        image = asyncio.run(gen._generate_cached_image("a space cat"))
+
+        assert image == b"cached-bytes"
+        assert fake.calls == []
+        db.get_image_cache.assert_called_once_with(gen._image_cache_key("a space cat"))
+        storage.get_object.assert_called_once_with("stickers/old/original.png")
+
+    def test_upload_records_cache_entry(self):
+        """The uploaded original is registered under the prompt hash."""
+        db = MagicMock()
+        storage = MagicMock()
+        storage.upload_image.side_effect = lambda key, data: f"https://cdn.example/{key}"
+        gen = _make_generator(FakeReplicate(), db=db, storage=storage)
+        prompt_gen = MagicMock()
+        prompt_gen.generate_prompts.return_value = ["p1", "p2", "p3"]
+        gen._prompt_gen = prompt_gen
+
+        gen.generate_for_trend({"id": "t1", "topic": "space cat"})
+
+        recorded = {c.args[0]: c.args[1] for c in db.upsert_image_cache.call_args_list}
+        assert set(recorded) == {gen._image_cache_key(p) for p in ["p1", "p2", "p3"]}
+        assert all(key.endswith("/original.png") for key in recorded.values())
+
+
+    def test_cached_original_not_reuploaded(self):
+        """A cache hit points original_url at the existing object instead of re-uploading."""
+        db = MagicMock()
+        storage = MagicMock()
+        storage.get_object.return_value = b"cached-bytes"
+        storage.upload_image.side_effect = lambda key, data: f"https://cdn.example/{key}"
+        storage.public_url.side_effect = lambda key: f"https://cdn.example/{key}"
+        fake = FakeReplicate()
+        gen = _make_generator(fake, db=db, storage=storage)
+        db.get_image_cache.return_value = {"r2_key": "stickers/old/original.png"}
+
+        stickers = gen.generate_for_trend({"id": "t1", "topic": "space cat"})
+
+        assert fake.calls == []
+        uploaded = [c.args[0] for c in storage.upload_image.call_args_list]
+        assert not any(key.endswith("/original.png") for key in uploaded)
+        assert len(uploaded) == 2 * IMAGES_PER_TREND
+        assert all(
+            s["original_url"] == "https://cdn.example/stickers/old/original.png"
+            for s in stickers
+        )
+
+
+class TestSemanticPromptCache:
+    """Test near-duplicate prompt reuse via the semantic cache."""
+
+    @staticmethod
+    def _encoder(prompts):
+        # Prompts sharing a first letter embed identically
+        vecs = np.zeros((len(prompts), 4), dtype=np.float32)
+        for i, p in enumerate(prompts):
+            vecs[i, ord(p[0]) % 4] = 1.0
+        return vecs
+
+    def test_lookup_respects_threshold(self):
+        """Only prompts above the similarity threshold match."""
+        cache = SemanticPromptCache(self._encoder)
+        cache.add("cat in space", "k1")
+
+        assert cache.lookup("cat on the moon") == "k1"
+        assert cache.lookup("dog in space") is None
+        assert SemanticPromptCache(self._encoder).lookup("cat") is None
+
+    def test_bounded_evicts_oldest(self):
+        """Entries past max_entries drop the oldest."""
+        cache = SemanticPromptCache(self._encoder, max_entries=2)
+        for i in range(3):
+            cache.add_vector(np.eye(4, dtype=np.float32)[i], f"k{i}")
+
+        assert len(cache) == 2
+        assert cache.lookup_vector(np.eye(4, dtype=np.float32)[0]) is None
+        assert cache.lookup_vector(np.eye(4, dtype=np.float32)[2]) == "k2"
+
+    def test_similar_prompt_reuses_existing_image(self):
+        """A near-duplicate prompt loads the prior original from R2."""
+        fake = FakeReplicate()
+        db = MagicMock()
+        db.get_recent_image_cache.return_value = [
+            {"prompt": "cat in space", "r2_key": "stickers/old/original.png"},
+        ]
+        storage = MagicMock()
+        storage.get_object.return_value = b"reused"
+        cache = SemanticPromptCache(self._encoder)
+        gen = _make_generator(fake, db=db, storage=storage, prompt_cache=cache)
+        gen._load_prompt_cache()
+
+        image = asyncio.run(gen._generate_cached_image("cat on the moon"))
+
+        assert image == b"reused"
+        assert fake.calls == []
+        storage.get_object.assert_called_once_with("stickers/old/original.png")
+
+    def test_load_uses_stored_embeddings(self):
+        """Warm start only encodes rows without a stored embedding."""
+        encoded = []
+
+        def encoder(prompts):
+            encoded.extend(prompts)
+            return self._encoder(prompts)
+
+        cache = SemanticPromptCache(encoder)
+        cache.load([
+            {"prompt": "cat in space", "r2_key": "k1", "embedding": [0.0, 0.0, 1.0, 0.0]},
+            {"prompt": "dog in space", "r2_key": "k2"},
+        ])
+
+        assert encoded == ["dog in space"]
+        assert cache.lookup_vector(np.eye(4, dtype=np.float32)[2]) == "k1"
+        assert cache.lookup("dog on the moon") == "k2"
+
+    def test_load_reencodes_mismatched_embeddings(self):
+        """Stored vectors of another dimension are discarded and re-encoded."""
+        cache = SemanticPromptCache(self._encoder)
+        cache.load([
+            {"prompt": "cat in space", "r2_key": "k1", "embedding": [1.0, 0.0]},
+            {"prompt": "dog in space", "r2_key": "k2"},
+        ])
+
+        assert cache.lookup("cat on the moon") == "k1"
+
+    def test_upload_stores_embedding(self):
+        """New image_cache rows carry the prompt embedding for the next warm start."""
+        db = MagicMock()
+        db.get_recent_image_cache.return_value = []
+        storage = MagicMock()
+        storage.upload_image.side_effect = lambda key, data: f"https://r2/{key}"
+        gen = _make_generator(
+            FakeReplicate(), db=db, storage=storage,
+            prompt_cache=SemanticPromptCache(self._encoder),
+        )
+
+        asyncio.run(gen.generate_for_trend_async({"id": "t1", "topic": "cats"}))
+
+        assert db.upsert_image_cache.call_args_list
+        for call in db.upsert_image_cache.call_args_list:
+            assert len(call.kwargs["embedding"]) == 4
+
+    def test_run_embeds_all_prompts_in_one_batch(self):
+        """run() encodes every trend's prompts with a single encoder call."""
+        batches = []
+
+        def encoder(prompts):
+            batches.append(list(prompts))
+            return self._encoder(prompts)
+
+        db = MagicMock()
+        db.get_trends_by_status.return_value = [
+            {"id": f"t{i}", "topic": topic} for i, topic in enumerate(["alpha", "bravo", "cosmic"])
+        ]
+        db.get_recent_image_cache.return_value = []
+        gen = _make_generator(
+            FakeReplicate(), db=db, prompt_cache=SemanticPromptCache(encoder),
+        )
+
+        assert gen.run() == 3 * IMAGES_PER_TREND
+        # One batch for trend topics (dedupe), one for all prompts
+        assert [len(b) for b in batches] == [3, 3 * IMAGES_PER_TREND]
+
+
+class TestPromptBatching:
+    """Test that run() requests prompts for several trends at once."""
+
+    def test_run_batches_prompt_requests(self):
+        from src.stickers.image_generator import PROMPT_BATCH_SIZE
+
+        db = MagicMock()
+        db.get_trends_by_status.return_value = [
+            {"id": f"t{i}", "topic": f"topic {i}"} for i in range(PROMPT_BATCH_SIZE + 1)
+        ]
+        prompt_gen = MagicMock()
+        prompt_gen.generate_prompts_batch.side_effect = (
+            lambda trends: [[f"{topic} {j}" for j in range(3)] for topic, _ in trends]
+        )
+        gen = _make_generator(
+            FakeReplicate(), db=db, prompt_generator=prompt_gen, max_images_per_day=100,
+        )
+
+        assert gen.run() == (PROMPT_BATCH_SIZE + 1) * IMAGES_PER_TREND
+        assert prompt_gen.generate_prompts_batch.call_count == 2
+        prompt_gen.generate_prompts.assert_not_called()
+
+
+class TestDuplicateTrends:
+    """Test near-duplicate trend detection by topic embedding."""
+
+    @staticmethod
+    def _encoder(prompts):
+        # Topics sharing a first letter embed identically
+        vecs = np.zeros((len(prompts), 4), dtype=np.float32)
+        for i, p in enumerate(prompts):
+            vecs[i, ord(p[0]) % 4] = 1.0
+        return vecs
+
+    def _run(self, trends, fail_topics=()):
+        db = MagicMock()
+        db.get_trends_by_status.return_value = trends
+        db.get_recent_image_cache.return_value = []
+        gen = _make_generator(
+            FakeReplicate(), db=db, prompt_cache=SemanticPromptCache(self._encoder),
+        )
+        real_generate = gen.generate_for_trend_async
+
+        async def generate(trend, **kwargs):
+            if trend["topic"] in fail_topics:
+                kwargs["status_updates"].setdefault("generation_failed", []).append(trend["id"])
+                return []
+            return await real_generate(trend, **kwargs)
+
+        gen.generate_for_trend_async = generate
+        return gen.run(), db
+
+    def test_duplicates_skipped_and_linked_to_leader(self):
+        """Only the first trend of a cluster is generated; the rest point at it."""
+        count, db = self._run([
+            {"id": "t1", "topic": "eras tour taylor swift"},
+            {"id": "t2", "topic": "space cat"},
+            {"id": "t3", "topic": "eras tour"},
+        ])
+
+        assert count == 2 * IMAGES_PER_TREND
+        db.update_trends.assert_called_once_with(
+            ["t3"], {"status": "generated", "canonical_trend_id": "t1"},
+        )
+
+    def test_duplicates_of_failed_leader_left_discovered(self):
+        """If the leader fails, its duplicates are retried on a later run."""
+        count, db = self._run(
+            [{"id": "t1", "topic": "eras tour"}, {"id": "t2", "topic": "eras again"}],
+            fail_topics=("eras tour",),
+        )
+
+        assert count == 0
+        db.update_trends.assert_not_called()
+
+
+class TestPostProcessPool:
+    """Test post-processing in the worker process pool."""
+
+    def test_process_pool_runs_real_post_processor(self, monkeypatch):
+        """Images are processed in a worker process; errors come back as None."""
+        import src.stickers.image_generator as image_generator
+        from src.stickers import post_processor
+
+        monkeypatch.setattr(image_generator, "process_image", post_processor.process_image)
+        img = Image.new("RGBA", (256, 256), (0, 0, 0, 0))
+        img.paste((200, 40, 40, 255), (64, 64, 192, 192))
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        blank = io.BytesIO()
+        Image.new("RGBA", (64, 64), (0, 0, 0, 0)).save(blank, format="PNG")
+
+        gen = _make_generator(FakeReplicate(), post_process_workers=1)
+        try:
+            processed = asyncio.run(gen._post_process(buf.getvalue(), "topic", 0))
+            failed = asyncio.run(gen._post_process(blank.getvalue(), "topic", 1))
+        finally:
+            gen.close()
+
+        assert processed.print_ready_size == (900, 900)
+        assert failed is None
+
+    def test_broken_pool_fails_one_image_and_is_replaced(self):
+        """A dead worker costs one image; the next call gets a fresh pool."""
+        from concurrent.futures.process import BrokenProcessPool
+
+        class BrokenPool:
+            shut_down = False
+
+            def submit(self, fn, *args):
+                raise BrokenProcessPool("worker killed")
+
+            def shutdown(self, wait=True):
+                self.shut_down = True
+
+        gen = _make_generator(FakeReplicate(), post_process_workers=1)
+        broken = BrokenPool()
+        gen._process_pool = broken
+
+        assert asyncio.run(gen._post_process(b"png", "topic", 0)) is None
+        assert gen._process_pool is None
+        assert broken.shut_down
+
+    def test_unexpected_error_fails_one_image(self):
+        """Errors other than PostProcessingError (e.g. pickling) return None."""
+        gen = _make_generator(FakeReplicate())
+
+        with patch(
+            "src.stickers.image_generator.process_image",
+            side_effect=TypeError("cannot pickle"),
+        ):
+            assert asyncio.run(gen._post_process(b"png", "topic", 0)) is None
@@ -0,0 +1,282 @@
+"""Tests for src/trends/monitor.py -- trend monitor orchestration."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.db import DatabaseError, MissingFunctionError
+from src.monitoring.spend_tracker import SpendTracker
+from src.trends.monitor import TrendMonitor
+
+
+def _monitor(**kwargs) -> TrendMonitor:
+    return TrendMonitor(
+        db=MagicMock(),
+        pipeline_logger=MagicMock(),
+        error_logger=MagicMock(),
+        **kwargs,
+    )
+
+
+class TestFetchSources:
+    """Test concurrent fetching from Reddit and Google Trends."""
+
+    def test_sources_fetched_concurrently(self):
+        """Each source waits for the other, so a sequential fetch would time out."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fetch(topic):
+            def inner():
+                barrier.wait()
+                return [{"topic": topic}]
+            return inner
+
+        reddit, google = MagicMock(), MagicMock()
+        reddit.fetch_trends.side_effect = fetch("from reddit")
+        google.fetch_trends.side_effect = fetch("from google")
+        monitor = _monitor(reddit_source=reddit, google_source=google)
+
+        results = asyncio.run(monitor._fetch_sources())
+
+        assert [(r[1], r[2]) for r in results] == [
+            ("reddit", [{"topic": "from reddit"}]),
+            ("google_trends", [{"topic": "from google"}]),
+        ]
+
+    def test_partial_failure_keeps_other_source(self):
+        reddit, google = MagicMock(), MagicMock()
+        reddit.fetch_trends.side_effect = RuntimeError("reddit down")
+        google.fetch_trends.return_value = [{"topic": "ok"}]
+        monitor = _monitor(reddit_source=reddit, google_source=google)
+
+        results = asyncio.run(monitor._fetch_sources())
+
+        assert results[0][1:3] == ("reddit", [])
+        assert str(results[0][3]) == "reddit down"
+        assert results[1][2:] == ([{"topic": "ok"}], None)
+
+    def test_missing_source_skipped(self):
+        google = MagicMock()
+        google.fetch_trends.return_value = []
+        monitor = _monitor(google_source=google)
+
+        assert [r[1] for r in asyncio.run(monitor._fetch_sources())] == ["google_trends"]
+
+
+class TestStoreTrends:
+    """Test that qualifying trends are ranked and stored in one call."""
+
+    def _run(self, db, trends, max_per_cycle=1):
+        google = MagicMock()
+        google.fetch_trends.return_value = trends
+        monitor = TrendMonitor(
+            db=db,
+            google_source=google,
+            pipeline_logger=MagicMock(),
+            error_logger=MagicMock(),
+            max_trends_per_cycle=max_per_cycle,
+        )
+        with patch("src.trends.monitor.check_existing_trends", side_effect=lambda c, _db: c):
+            return monitor.run()
+
+    def _trends(self):
+        return [
+            {"topic": "baby hippo", "keywords": ["hippo"], "source": "google_trends"},
+            {"topic": "pickleball", "keywords": ["pickleball"], "source": "google_trends"},
+        ]
+
+    def test_ranked_in_one_sql_call(self):
+        db = MagicMock()
+        db.insert_ranked_trends.side_effect = lambda rows, limit: [
+            dict(row, status="discovered" if i < limit else "queued")
+            for i, row in enumerate(rows)
+        ]
+
+        assert self._run(db, self._trends()) is True
+
+        rows, limit = db.insert_ranked_trends.call_args.args
+        assert [r["topic"] for r in rows] == ["baby hippo", "pickleball"]
+        assert limit == 1
+        db.insert_trends.assert_not_called()
+        db.insert_trend.assert_not_called()
+
+    def test_missing_function_falls_back_to_bulk_insert(self):
+        db = MagicMock()
+        db.insert_ranked_trends.side_effect = MissingFunctionError("PGRST202")
+
+        assert self._run(db, self._trends()) is True
+
+        rows = db.insert_trends.call_args.args[0]
+        assert [r["status"] for r in rows] == ["discovered", "queued"]
+        db.insert_trend.assert_not_called()
+
+    def test_other_rpc_failure_not_inserted_again(self):
+        """A timeout may come after the RPC committed, so nothing is re-inserted."""
+        db = MagicMock()
+        db.insert_ranked_trends.side_effect = DatabaseError("read timed out")
+
+        assert self._run(db, self._trends()) is False
+
+        db.insert_trends.assert_not_called()
+        db.insert_trend.assert_not_called()
+
+    def test_bulk_failure_falls_back_per_row(self):
+        db = MagicMock()
+        db.insert_ranked_trends.side_effect = MissingFunctionError("PGRST202")
+        db.insert_trends.side_effect = DatabaseError("bad row")
+        db.insert_trend.side_effect = [DatabaseError("bad row"), {}]
+
+        assert self._run(db, self._trends(), max_per_cycle=2) is True
+        assert db.insert_trend.call_count == 2
+
+    def test_top_scores_discovered_rest_queued(self):
+        db = MagicMock()
+        db.insert_ranked_trends.side_effect = MissingFunctionError("PGRST202")
+        scorer = MagicMock()
+        scorer.score_and_filter.side_effect = lambda trends, threshold: [
+            dict(t, score_overall=score) for t, score in zip(trends, [7.5, 9.0, 8.0])
+        ]
+        google = MagicMock()
+        google.fetch_trends.return_value = [
+            {"topic": topic, "keywords": [topic], "source": "google_trends"}
+            for topic in ("axolotl", "pickleball", "capybara")
+        ]
+        monitor = TrendMonitor(
+            db=db, google_source=google, scorer=scorer,
+            pipeline_logger=MagicMock(), error_logger=MagicMock(),
+            max_trends_per_cycle=2,
+        )
+        with patch("src.trends.monitor.check_existing_trends", side_effect=lambda c, _db: c):
+            monitor.run()
+
+        rows = db.insert_trends.call_args.args[0]
+        assert [(r["topic"], r["status"]) for r in rows] == [
+            ("pickleball", "discovered"),
+            ("capybara", "discovered"),
+            ("axolotl", "queued"),
+        ]
+
+
+class TestBlocklistPrefilter:
+    """Test that blocklisted topics never reach the DB check or scoring."""
+
+    def test_blocked_topics_never_reach_db_check(self):
+        google = MagicMock()
+        google.fetch_trends.return_value = [
+            {"topic": "Mickey Mouse sticker", "keywords": ["mickey"], "source": "google_trends"},
+            {"topic": "axolotl", "keywords": ["axolotl"], "source": "google_trends"},
+        ]
+        pipeline_logger = MagicMock()
+        monitor = TrendMonitor(
+            db=MagicMock(), google_source=google,
+            pipeline_logger=pipeline_logger, error_logger=MagicMock(),
+        )
+        seen = []
+
+        def check(candidates, _db):
+            seen.extend(c["topic"] for c in candidates)
+            return []
+
+        with patch("src.trends.monitor.check_existing_trends", side_effect=check):
+            monitor.run()
+
+        assert seen == ["axolotl"]
+        counts = pipeline_logger.complete_run.call_args.kwargs["counts"]
+        assert counts["trends_found"] == 2
+
+    def test_clean_trend_merged_into_blocked_one_dropped(self):
+        """A clean trend whose merge partner leads with a blocked topic goes too."""
+        google = MagicMock()
+        google.fetch_trends.return_value = [
+            {"topic": "cartoon mouse", "keywords": ["cartoon", "mouse"],
+             "source": "google_trends", "score_hint": 10},
+            {"topic": "Mickey Mouse sticker", "keywords": ["cartoon", "mouse"],
+             "source": "google_trends", "score_hint": 90},
+            {"topic": "axolotl", "keywords": ["axolotl"], "source": "google_trends"},
+        ]
+        monitor = TrendMonitor(
+            db=MagicMock(), google_source=google,
+            pipeline_logger=MagicMock(), error_logger=MagicMock(),
+        )
+        seen = []
+
+        def check(candidates, _db):
+            seen.extend(c["topic"] for c in candidates)
+            return []
+
+        with patch("src.trends.monitor.check_existing_trends", side_effect=check):
+            monitor.run()
+
+        assert seen == ["axolotl"]
+
+
+class TestScoringSpend:
+    """Test that scoring spend recorded in-process is written with the run."""
+
+    def _run(self, pipeline_logger):
+        google = MagicMock()
+        google.fetch_trends.return_value = [
+            {"topic": "axolotl", "keywords": ["axolotl"], "source": "google_trends"},
+        ]
+        tracker = SpendTracker(db=MagicMock(), alerter=MagicMock())
+        tracker.get_monthly_spend = MagicMock(return_value=10.0)
+        scorer = MagicMock()
+
+        def score(candidates, threshold):
+            tracker.record_spend(0.05)
+            return []
+
+        scorer.score_and_filter.side_effect = score
+        monitor = TrendMonitor(
+            db=MagicMock(), google_source=google, scorer=scorer,
+            spend_tracker=tracker, pipeline_logger=pipeline_logger,
+            error_logger=MagicMock(),
+        )
+        with patch("src.trends.monitor.check_existing_trends", side_effect=lambda c, _db: c):
+            monitor.run()
+        return tracker
+
+    def test_unstored_spend_logged_and_marked_stored(self):
+        pipeline_logger = MagicMock()
+
+        tracker = self._run(pipeline_logger)
+
+        assert pipeline_logger.complete_run.call_args.kwargs["ai_cost_estimate_usd"] == 0.05
+        assert tracker.unstored_spend == 0.0
+
+    def test_spend_kept_when_run_write_fails(self):
+        """A failed write leaves the spend unstored for the next log attempt."""
+        pipeline_logger = MagicMock()
+        pipeline_logger.complete_run.side_effect = DatabaseError("write failed")
+        pipeline_logger.fail_run.side_effect = DatabaseError("write failed")
+
+        with pytest.raises(DatabaseError):
+            self._run(pipeline_logger)
+
+        assert pipeline_logger.fail_run.call_args.kwargs["ai_cost_estimate_usd"] == 0.05
+
+
+class TestGithubOutput:
+    """Test that GitHub Actions outputs are flushed in one write."""
+
+    def test_outputs_flushed_once(self, tmp_path, monkeypatch):
+        from src.trends import monitor
+
+        out = tmp_path / "github_output"
+        out.write_text("existing=1\n")
+        monkeypatch.setenv("GITHUB_OUTPUT", str(out))
+        monkeypatch.setattr(monitor, "_pending_outputs", {})
+        registered = []
+        monkeypatch.setattr(monitor.atexit, "register", registered.append)
+
+        monitor._set_github_output("new_trends", "false")
+        monitor._set_github_output("new_trends", "true")
+        monitor._set_github_output("stored", "3")
+        assert out.read_text() == "existing=1\n"
+
+        registered[0]()
+
+        assert len(registered) == 1
+        assert out.read_text() == "existing=1\nnew_trends=true\nstored=3\n"
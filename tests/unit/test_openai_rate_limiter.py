@@ -0,0 +1,61 @@
+"""Tests for src/monitoring/openai_rate_limiter.py -- sliding-window LLM rate limiting."""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from src.monitoring.openai_rate_limiter import OpenAIRateLimiter, WINDOW_MS
+
+
+class TestTryAcquire:
+    """Test the single-EVAL window check."""
+
+    def test_eval_args(self):
+        redis = MagicMock()
+        redis.eval.return_value = 0
+        limiter = OpenAIRateLimiter(rpm=100, redis_client=redis, clock=lambda: 12.5)
+
+        assert limiter.try_acquire("openai:model") == 0
+
+        _, numkeys, key, now_ms, window, limit, member = redis.eval.call_args.args
+        assert (numkeys, key) == (1, "ratelimit:openai:model")
+        assert (now_ms, window, limit) == (12_500, WINDOW_MS, 100)
+        assert member.startswith("12500-")
+
+    def test_redis_error_fails_open(self):
+        redis = MagicMock()
+        redis.eval.side_effect = ConnectionError("down")
+        limiter = OpenAIRateLimiter(redis_client=redis)
+
+        assert limiter.try_acquire("openai:model") == 0
+
+
+class TestAcquire:
+    """Test waiting for a free slot."""
+
+    def test_sleeps_for_reported_wait(self):
+        redis = MagicMock()
+        redis.eval.side_effect = [250, 100, 0]
+        limiter = OpenAIRateLimiter(redis_client=redis)
+
+        with patch("src.monitoring.openai_rate_limiter.time.sleep") as sleep:
+            limiter.acquire("openai:model")
+
+        assert [c.args[0] for c in sleep.call_args_list] == [0.25, 0.1]
+
+    def test_gives_up_after_max_wait(self):
+        redis = MagicMock()
+        redis.eval.return_value = 1000
+        limiter = OpenAIRateLimiter(redis_client=redis)
+
+        limiter.acquire("openai:model", max_wait=0)
+
+        assert redis.eval.call_count == 1
+
+    def test_async_acquire(self):
+        redis = MagicMock()
+        redis.eval.side_effect = [5, 0]
+        limiter = OpenAIRateLimiter(redis_client=redis)
+
+        asyncio.run(limiter.aacquire("openai:model"))
+
+        assert redis.eval.call_count == 2
@@ -24,7 +24,7 @@ def _png_bytes_from_image(img: Image.Image) -> bytes:
 def make_1024_rgba_with_content() -> bytes:
     """1024x1024 RGBA with central non-white content (survives background clean)."""
     img = Image.new("RGBA", (1024, 1024), (255, 255, 255, 0))
-    # Non-white content so _clean_background doesn't remove it
+    # Non-white content so the background clean in _scan_alpha keeps it
     left, top = 200, 200
     right, bottom = 824, 824
     for y in range(top, bottom):
@@ -45,6 +45,8 @@ def make_1024_mostly_white() -> bytes:
 
 def _image_has_alpha_channel(png_bytes: bytes) -> bool:
     img = Image.open(io.BytesIO(png_bytes))
+    if img.mode == "P":
+        return "transparency" in img.info
     return img.mode in ("RGBA", "LA", "PA")
 
 
@@ -64,6 +66,183 @@ class TestProcessImageDimensions:
         assert (thumb_img.width, thumb_img.height) == (300, 300)
 
 
+class TestResizeBackends:
+    """Test that the OpenCV and Pillow resize paths agree on geometry."""
+
+    @pytest.mark.parametrize("use_cv2", [True, False])
+    def test_resize_centers_content_on_exact_canvas(self, monkeypatch, use_cv2):
+        """A 2:1 image is letterboxed onto an exact, transparent square canvas."""
+        from src.stickers import post_processor
+
+        if use_cv2 and post_processor.cv2 is None:
+            pytest.skip("opencv not installed")
+        if not use_cv2:
+            monkeypatch.setattr(post_processor, "cv2", None)
+
+        img = Image.new("RGBA", (600, 300), (200, 50, 50, 255))
+        out = post_processor._resize_with_padding(img, PRINT_READY_SIZE)
+
+        assert out.size == PRINT_READY_SIZE
+        assert out.getpixel((450, 0))[3] == 0        # top padding transparent
+        assert out.getpixel((450, 450)) == (200, 50, 50, 255)
+
+    @pytest.mark.parametrize("use_cv2", [True, False])
+    def test_square_input_fills_canvas(self, monkeypatch, use_cv2):
+        """A square image needs no padding and comes back at the exact size."""
+        from src.stickers import post_processor
+
+        if use_cv2 and post_processor.cv2 is None:
+            pytest.skip("opencv not installed")
+        if not use_cv2:
+            monkeypatch.setattr(post_processor, "cv2", None)
+
+        img = Image.new("RGBA", (1024, 1024), (20, 120, 220, 255))
+        out = post_processor._resize_with_padding(img, THUMBNAIL_SIZE)
+
+        assert out.size == THUMBNAIL_SIZE
+        assert out.mode == "RGBA"
+        assert out.getpixel((0, 0)) == (20, 120, 220, 255)
+
+    @pytest.mark.parametrize("use_cv2", [True, False])
+    def test_semi_transparent_edge_keeps_alpha(self, monkeypatch, use_cv2):
+        """Padding copies alpha unchanged instead of squaring it (128 -> 64)."""
+        from src.stickers import post_processor
+
+        if use_cv2 and post_processor.cv2 is None:
+            pytest.skip("opencv not installed")
+        if not use_cv2:
+            monkeypatch.setattr(post_processor, "cv2", None)
+
+        img = Image.new("RGBA", (600, 300), (200, 50, 50, 128))
+        out = post_processor._resize_with_padding(img, PRINT_READY_SIZE)
+
+        assert out.getpixel((450, 224))[3] == 0
+        assert abs(out.getpixel((450, 225))[3] - 128) <= 1
+
+
+class TestAlphaScan:
+    """Test that the Numba and NumPy alpha scans agree."""
+
+    def test_jit_matches_numpy(self):
+        import numpy as np
+        from src.stickers import post_processor
+
+        if post_processor._scan_alpha_jit is None:
+            pytest.skip("numba not installed")
+
+        rng = np.random.default_rng(0)
+        arr = rng.integers(0, 256, (64, 48, 4), dtype=np.uint8)
+        arr[:8] = 255                     # white rows
+        arr[:, :4, 3] = 5                 # near-transparent columns
+
+        alpha, rows_any, cols_any, blank = post_processor._scan_alpha_jit(arr)
+        ref_alpha = post_processor._cleaned_alpha(arr)
+        ref_rows, ref_cols, ref_blank = post_processor._prep_alpha(ref_alpha)
+
+        assert np.array_equal(alpha, ref_alpha)
+        assert np.array_equal(rows_any, ref_rows)
+        assert np.array_equal(cols_any, ref_cols)
+        assert blank == ref_blank
+
+
+class TestPngEncoders:
+    """Test that PNG encoding and oxipng recompression are lossless and keep DPI."""
+
+    def test_encode_png_is_lossless(self):
+        from src.stickers import post_processor
+
+        img = Image.new("RGBA", (120, 80), (0, 0, 0, 0))
+        img.paste((30, 160, 90, 255), (20, 10, 100, 70))
+        data = post_processor._encode_png(img)
+
+        decoded = Image.open(io.BytesIO(data))
+        assert decoded.convert("RGBA").tobytes() == img.tobytes()
+        assert round(decoded.info["dpi"][0]) == 300
+
+    def test_recompress_png_is_lossless(self):
+        from src.stickers import post_processor
+
+        if post_processor.oxipng is None:
+            pytest.skip("pyoxipng not installed")
+
+        img = Image.new("RGBA", (120, 80), (0, 0, 0, 0))
+        for x in range(120):
+            img.putpixel((x, 40), (x * 2, 255 - x, 90, 255))
+        buf = io.BytesIO()
+        img.save(buf, format="PNG", compress_level=1, dpi=(300, 300))
+
+        data = post_processor._recompress_png(buf.getvalue())
+
+        decoded = Image.open(io.BytesIO(data))
+        assert len(data) <= len(buf.getvalue())
+        assert decoded.convert("RGBA").tobytes() == img.tobytes()
+        assert round(decoded.info["dpi"][0]) == 300
+
+
+class TestOptimizePng:
+    """Test the fast-path and fallback behaviour of _optimize_png."""
+
+    def test_fast_path_used_when_under_limit(self, monkeypatch):
+        """optimize=False skips the full encoder when the fast save fits."""
+        from src.stickers import post_processor
+
+        calls = []
+        monkeypatch.setattr(post_processor, "_encode_png", lambda img: calls.append(img) or b"")
+        img = Image.new("RGBA", THUMBNAIL_SIZE, (10, 200, 10, 255))
+
+        data = post_processor._optimize_png(img, MAX_THUMBNAIL_BYTES, optimize=False)
+
+        assert calls == []
+        assert Image.open(io.BytesIO(data)).size == THUMBNAIL_SIZE
+
+    def test_fast_path_falls_back_when_over_limit(self, monkeypatch):
+        """optimize=False still runs the full encoder if the fast save is too big."""
+        from src.stickers import post_processor
+
+        calls = []
+        monkeypatch.setattr(post_processor, "_encode_png", lambda img: calls.append(img) or b"x")
+        img = Image.new("RGBA", THUMBNAIL_SIZE, (10, 200, 10, 255))
+
+        assert post_processor._optimize_png(img, 1, optimize=False) == b"x"
+        assert len(calls) >= 1
+
+
+class TestPaletteEncoding:
+    """Test palette-mode output for flat-color images."""
+
+    def test_flat_image_encoded_as_lossless_palette(self):
+        from src.stickers import post_processor
+
+        img = Image.new("RGBA", PRINT_READY_SIZE, (0, 0, 0, 0))
+        img.paste((200, 30, 30, 255), (200, 200, 700, 700))
+        img.paste((20, 30, 230, 128), (300, 300, 400, 400))
+
+        data = post_processor._optimize_png(img, MAX_PRINT_READY_BYTES)
+
+        decoded = Image.open(io.BytesIO(data))
+        assert decoded.mode == "P"
+        assert decoded.convert("RGBA").tobytes() == img.tobytes()
+
+    def test_quantize_fallback_keeps_alpha(self):
+        """Oversize many-color images fall back to an alpha-aware quantized palette."""
+        import numpy as np
+        from src.stickers import post_processor
+
+        rng = np.random.default_rng(0)
+        arr = np.zeros((300, 300, 4), dtype=np.uint8)
+        arr[50:250, 50:250, :3] = rng.integers(0, 255, (200, 200, 3))
+        arr[50:250, 50:250, 3] = 255
+        img = Image.fromarray(arr, "RGBA")
+        full = post_processor._encode_png(img)
+
+        data = post_processor._optimize_png(img, len(full) - 1)
+
+        decoded = Image.open(io.BytesIO(data)).convert("RGBA")
+        assert len(data) < len(full)
+        assert decoded.getpixel((0, 0))[3] == 0
+        assert decoded.getpixel((150, 150))[3] == 255
+
+
 class TestProcessImageTransparency:
     """Test that output images have alpha channel."""
 
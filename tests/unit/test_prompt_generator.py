@@ -0,0 +1,269 @@
+"""Tests for src/stickers/prompt_generator.py -- batched prompt generation."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src import resilience
+from src.resilience import CircuitBreakerRegistry
+from src.stickers.prompt_generator import (
+    PromptGenerator,
+    PromptShapeError,
+    MAX_BATCH_SIZE,
+    MAX_SHAPE_ATTEMPTS,
+    STYLE_DIRECTIVES,
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_circuit_breakers():
+    """Fresh breakers per test; openai trips on the first failure so retries don't sleep."""
+    with patch("src.resilience.circuit_breakers", CircuitBreakerRegistry({"openai": 1})):
+        yield
+
+
+def _response(content: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+    )
+
+
+def _batch_json(indices, count=3) -> str:
+    return json.dumps({"results": [
+        {"index": i, "prompts": [f"design {i}.{j}" for j in range(count)]}
+        for i in indices
+    ]})
+
+
+class TestParseBatch:
+    """Test parsing of batched JSON responses."""
+
+    def test_results_matched_by_index(self):
+        raw = json.dumps({"results": [
+            {"index": 2, "prompts": ["b1", "b2"]},
+            {"index": 1, "prompts": ["a1", ""]},
+        ]})
+
+        assert PromptGenerator._parse_batch(raw, 2) == [["a1"], ["b1", "b2"]]
+
+    def test_invalid_entries_ignored(self):
+        raw = json.dumps({"results": [
+            {"index": 9, "prompts": ["x"]},
+            {"index": "one", "prompts": ["x"]},
+            {"index": 1, "prompts": "not a list"},
+            "junk",
+        ]})
+
+        assert PromptGenerator._parse_batch(raw, 2) == [[], []]
+        assert PromptGenerator._parse_batch("not json", 2) == [[], []]
+
+
+class TestGeneratePromptsBatch:
+    """Test that several trends share one chat completion."""
+
+    def test_one_request_for_batch(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = _response(_batch_json([1, 2, 3]))
+        gen = PromptGenerator(openai_client=client)
+
+        results = gen.generate_prompts_batch([("cats", ""), ("dogs", "ctx"), ("owls", "")])
+
+        assert client.chat.completions.create.call_count == 1
+        user_msg = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "Trend [2]: dogs\nContext [2]: ctx" in user_msg
+        assert results[1] == [f"A {STYLE_DIRECTIVES} design 2.{j}" for j in range(3)]
+
+    def test_missing_trend_falls_back(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = _response(_batch_json([1]))
+        gen = PromptGenerator(openai_client=client)
+
+        results = gen.generate_prompts_batch([("cats", ""), ("dogs", "")])
+
+        assert client.chat.completions.create.call_count == 1
+        assert results[1] == PromptGenerator._fallback_prompts("dogs", 3)
+
+    def test_large_input_split_into_batches(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = _response(
+            _batch_json(range(1, MAX_BATCH_SIZE + 1)),
+        )
+        gen = PromptGenerator(openai_client=client)
+
+        results = gen.generate_prompts_batch([(f"t{i}", "") for i in range(MAX_BATCH_SIZE + 1)])
+
+        assert len(results) == MAX_BATCH_SIZE + 1
+        assert client.chat.completions.create.call_count == 2
+
+    def test_no_client_raises(self):
+        gen = PromptGenerator(openai_client=MagicMock())
+        gen._client = None
+
+        with pytest.raises(RuntimeError):
+            gen.generate_prompts_batch([("cats", "")])
+
+
+class FakeAsyncCompletions:
+    """AsyncOpenAI completions stub that records peak concurrency."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, messages, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return _response(json.dumps({"prompts": ["a", "b", "c"]}))
+
+
+class TestAsyncGeneration:
+    """Test concurrent prompt generation with the async client."""
+
+    def _generator(self, completions):
+        aclient = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        return PromptGenerator(openai_client=MagicMock(), async_openai_client=aclient)
+
+    def test_requests_bounded_by_semaphore(self):
+        completions = FakeAsyncCompletions()
+        gen = self._generator(completions)
+
+        results = gen.generate_many([(f"t{i}", "") for i in range(6)], max_concurrency=3)
+
+        assert results == [[f"A {STYLE_DIRECTIVES} {p}" for p in "abc"]] * 6
+        assert completions.peak == 3
+
+    def test_failed_trend_falls_back(self):
+        gen = self._generator(FakeAsyncCompletions())
+        real = gen.agenerate_prompts
+
+        async def agenerate(topic, context, num_prompts):
+            if topic == "dogs":
+                raise RuntimeError("unexpected")
+            return await real(topic, context, num_prompts)
+
+        gen.agenerate_prompts = agenerate
+
+        results = gen.generate_many([("cats", ""), ("dogs", "")])
+
+        assert results[0][0] == f"A {STYLE_DIRECTIVES} a"
+        assert results[1] == PromptGenerator._fallback_prompts("dogs", 3)
+
+    def test_no_async_client_falls_back(self):
+        gen = PromptGenerator(openai_client=MagicMock())
+
+        assert gen.generate_many([("cats", "")]) == [PromptGenerator._fallback_prompts("cats", 3)]
+
+
+class TestRetries:
+    """Test API retries (with circuit breaker) and short-reply re-asks (without)."""
+
+    def test_short_response_is_retryable(self):
+        """Too few prompts raises PromptShapeError for the shape-retry loop."""
+        gen = PromptGenerator(openai_client=MagicMock())
+
+        with pytest.raises(PromptShapeError):
+            gen._styled_prompts(json.dumps({"prompts": ["a"]}), 3)
+
+    def test_short_responses_do_not_trip_circuit_breaker(self):
+        """Re-asked bad replies fall back without recording breaker failures."""
+        client = MagicMock()
+        client.chat.completions.create.return_value = _response(json.dumps({"prompts": ["a"]}))
+        gen = PromptGenerator(openai_client=client)
+
+        assert gen.generate_prompts("cats") == PromptGenerator._fallback_prompts("cats", 3)
+        assert gen.generate_prompts_batch([("dogs", "")]) == [
+            PromptGenerator._fallback_prompts("dogs", 3)
+        ]
+        assert client.chat.completions.create.call_count == 2 * MAX_SHAPE_ATTEMPTS
+        assert resilience.circuit_breakers.get("openai").can_proceed()
+
+    def test_exhausted_retries_fall_back(self):
+        client = MagicMock()
+        client.chat.completions.create.side_effect = RuntimeError("rate limited")
+        gen = PromptGenerator(openai_client=client)
+
+        assert gen.generate_prompts("cats") == PromptGenerator._fallback_prompts("cats", 3)
+        assert gen.generate_prompts_batch([("dogs", "")]) == [
+            PromptGenerator._fallback_prompts("dogs", 3)
+        ]
+
+
+def _single_json(count=3) -> str:
+    return json.dumps({"prompts": [f"single {j}" for j in range(count)]})
+
+
+class TestPromptCache:
+    """Test that cached topics skip the OpenAI call."""
+
+    def test_repeat_topic_served_from_memory(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = _response(_single_json())
+        gen = PromptGenerator(openai_client=client)
+
+        first = gen.generate_prompts("cats", "ctx")
+        second = gen.generate_prompts("cats", "ctx")
+
+        assert first == second
+        assert client.chat.completions.create.call_count == 1
+
+    def test_batch_sends_only_misses(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = _response(_batch_json([1]))
+        gen = PromptGenerator(openai_client=client)
+        gen._store({gen._cache_key("cats", "", 3): ["cached 1", "cached 2", "cached 3"]})
+
+        results = gen.generate_prompts_batch([("cats", ""), ("dogs", "")])
+
+        user_msg = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "cats" not in user_msg and "Trend [1]: dogs" in user_msg
+        assert results[0] == ["cached 1", "cached 2", "cached 3"]
+        assert results[1][0] == f"A {STYLE_DIRECTIVES} design 1.0"
+
+    def test_fallbacks_not_cached(self):
+        client = MagicMock()
+        client.chat.completions.create.return_value = _response(_batch_json([]))
+        db = MagicMock()
+        db.get_prompt_cache.return_value = []
+        gen = PromptGenerator(openai_client=client, db=db)
+
+        gen.generate_prompts_batch([("cats", "")])
+
+        db.upsert_prompt_cache.assert_not_called()
+        assert len(gen._cache) == 0
+
+    def test_stale_db_rows_ignored(self):
+        from datetime import datetime, timedelta, timezone
+
+        client = MagicMock()
+        client.chat.completions.create.return_value = _response(_single_json())
+        gen = PromptGenerator(openai_client=client, db=MagicMock())
+        key = gen._cache_key("cats", "", 3)
+        old = datetime.now(timezone.utc) - timedelta(days=2)
+        gen._db.get_prompt_cache.return_value = [
+            {"hash": key, "prompts": ["stale"], "created_at": old.isoformat()},
+        ]
+
+        prompts = gen.generate_prompts("cats")
+
+        assert prompts != ["stale"]
+        assert client.chat.completions.create.call_count == 1
+        gen._db.upsert_prompt_cache.assert_called_once_with({key: prompts})
+
+    def test_fresh_db_row_skips_client(self):
+        from datetime import datetime, timezone
+
+        client = MagicMock()
+        gen = PromptGenerator(openai_client=client, db=MagicMock())
+        key = gen._cache_key("cats", "", 3)
+        gen._db.get_prompt_cache.return_value = [
+            {"hash": key, "prompts": ["a", "b", "c"],
+             "created_at": datetime.now(timezone.utc).isoformat()},
+        ]
+
+        assert gen.generate_prompts("cats") == ["a", "b", "c"]
+        client.chat.completions.create.assert_not_called()
@@ -17,6 +17,14 @@ from src.stickers.quality_validator import (
 )
 
 
+@pytest.fixture
+def no_min_file_size(monkeypatch):
+    """Let small, highly compressible samples reach the pixel checks."""
+    from src.stickers import quality_validator
+
+    monkeypatch.setattr(quality_validator, "MIN_FILE_SIZE_BYTES", 0)
+
+
 def _png_bytes_from_image(img: Image.Image) -> bytes:
     """Encode PIL Image to PNG bytes."""
     buf = io.BytesIO()
@@ -87,7 +95,7 @@ class TestValidateImageDimensions:
         assert result.height == 1024
         assert "wrong_dimensions" not in "; ".join(result.failures)
 
-    def test_non_1024_fails_dimension_check(self):
+    def test_non_1024_fails_dimension_check(self, no_min_file_size):
         """Image that is not 1024x1024 fails with wrong_dimensions."""
         img = Image.new("RGBA", (800, 800), (100, 100, 100, 255))
         data = _png_bytes_from_image(img)
@@ -115,6 +123,23 @@ class TestValidateFileSize:
         assert result.passed is False
         assert any("file_too_large" in f for f in result.failures)
 
+    def test_size_failure_skips_pixel_analysis(self, monkeypatch):
+        """A size failure returns header dimensions without decoding pixels."""
+        from src.stickers import quality_validator
+
+        def fail(*args, **kwargs):
+            raise AssertionError("pixels decoded")
+
+        monkeypatch.setattr(quality_validator, "_downsample", fail)
+        data = make_tiny_png_under_50kb()
+        result = validate_image(data)
+
+        img = Image.open(io.BytesIO(data))
+        assert result.failures == [
+            f"file_too_small: {len(data)} bytes < {MIN_FILE_SIZE_BYTES} bytes"
+        ]
+        assert (result.width, result.height) == img.size
+
     def test_valid_size_passes(self):
         """Image with size between 50KB and 5MB passes size check (no file_too_small/large)."""
         data = make_1024_rgba_with_content()
@@ -131,7 +156,7 @@ class TestValidateFileSize:
 class TestValidateMostlyBlank:
     """Test that mostly blank image (>80% white/transparent) is rejected."""
 
-    def test_mostly_blank_rejected(self):
+    def test_mostly_blank_rejected(self, no_min_file_size):
         """Image with >80% white/transparent pixels is rejected."""
         data = make_1024_mostly_blank()
         result = validate_image(data)
@@ -146,11 +171,28 @@ class TestValidateMostlyBlank:
         assert result.blank_ratio <= MAX_BLANK_RATIO
         assert any("mostly_blank" in f for f in result.failures) is False
 
+    @pytest.mark.parametrize("mode", ["RGBA", "RGB"])
+    def test_analyze_counts_transparent_and_white(self, mode):
+        """Transparent and white pixels count as blank; the rest bounds the crop."""
+        from src.stickers.quality_validator import _analyze_image
+
+        img = Image.new("RGBA", (100, 100), (30, 90, 160, 255))
+        img.paste((255, 255, 255, 255), (0, 0, 100, 25))   # white
+        img.paste((255, 255, 255, 0), (0, 25, 100, 50))    # transparent white
+        img.paste((10, 10, 10, 5), (0, 50, 100, 60))       # near-transparent
+        if mode == "RGB":
+            img = img.convert("RGB")
+
+        expected = 0.60 if mode == "RGBA" else 0.50
+        blank_ratio, aspect_ratio = _analyze_image(img)
+        assert blank_ratio == pytest.approx(expected)
+        assert aspect_ratio == pytest.approx(100 / (40 if mode == "RGBA" else 50))
+
 
 class TestValidateAspectRatio:
     """Test aspect ratio after crop must be between 0.5 and 2.0."""
 
-    def test_extreme_aspect_ratio_tall_rejected(self):
+    def test_extreme_aspect_ratio_tall_rejected(self, no_min_file_size):
         """Aspect ratio < 0.5 (very tall content) is rejected."""
         data = make_1024_extreme_aspect_tall()
         result = validate_image(data)
@@ -158,7 +200,7 @@ class TestValidateAspectRatio:
         assert any("bad_aspect_ratio" in f for f in result.failures)
         assert result.aspect_ratio < MIN_ASPECT_RATIO
 
-    def test_extreme_aspect_ratio_wide_rejected(self):
+    def test_extreme_aspect_ratio_wide_rejected(self, no_min_file_size):
         """Aspect ratio > 2.0 (very wide content) is rejected."""
         data = make_1024_extreme_aspect_wide()
         result = validate_image(data)
@@ -174,6 +216,53 @@ class TestValidateAspectRatio:
         assert any("bad_aspect_ratio" in f for f in result.failures) is False
 
 
+class TestDownsampledAnalysis:
+    """Test that metrics on the downsampled image track full resolution."""
+
+    @pytest.mark.parametrize("size", [(1024, 1024), (1024, 512)])
+    def test_downsampled_metrics_match_full_resolution(self, size):
+        from src.stickers.quality_validator import (
+            ANALYSIS_SIZE, _analyze_image, _downsample,
+        )
+
+        img = Image.new("RGBA", size, (255, 255, 255, 0))
+        img.paste((40, 90, 200, 255), (150, 100, 700, 400))
+        small = _downsample(img)
+
+        assert max(small.size) == ANALYSIS_SIZE
+        full_blank, full_ar = _analyze_image(img)
+        small_blank, small_ar = _analyze_image(small)
+        assert small_blank == pytest.approx(full_blank, abs=0.01)
+        assert small_ar == pytest.approx(full_ar, rel=0.02)
+
+
+class TestAnalyzeKernel:
+    """Test that the Numba and NumPy blank/bbox scans agree."""
+
+    @pytest.mark.parametrize("shape", [(64, 64, 4), (40, 90, 4), (8, 8, 4), (40, 90, 3)])
+    def test_jit_matches_numpy(self, shape):
+        import numpy as np
+        from src.stickers import quality_validator
+
+        if quality_validator._analyze_jit is None:
+            pytest.skip("numba not installed")
+
+        rng = np.random.default_rng(0)
+        arr = rng.integers(0, 256, shape, dtype=np.uint8)
+        arr[:3] = 255                     # white rows
+        arr[:, :2, -1] = 0                # transparent (or black) columns
+        if shape[0] == 8:
+            arr[..., 3] = 0               # fully blank
+
+        blank = quality_validator._blank_mask(arr)
+        expected = (
+            quality_validator._blank_ratio(blank),
+            quality_validator._cropped_aspect_ratio(~blank),
+        )
+
+        assert quality_validator._analyze_jit(arr) == pytest.approx(expected)
+
+
 class TestValidateAlphaChannel:
     """Test alpha channel detection."""
 
@@ -203,6 +292,50 @@ class TestValidImagePassesAllChecks:
         assert MIN_ASPECT_RATIO <= result.aspect_ratio <= MAX_ASPECT_RATIO
 
 
+class TestValidateImagePath:
+    """Test validation of image files on disk."""
+
+    def test_file_matches_bytes_validation(self, tmp_path):
+        import numpy as np
+        from src.stickers.quality_validator import validate_image_path
+
+        arr = np.zeros((1024, 1024, 4), dtype=np.uint8)
+        arr[200:800, 200:800] = np.random.default_rng(0).integers(0, 200, (600, 600, 4))
+        arr[200:800, 200:800, 3] = 255
+        data = _png_bytes_from_image(Image.fromarray(arr, "RGBA"))
+        path = tmp_path / "sticker.png"
+        path.write_bytes(data)
+
+        result = validate_image_path(path)
+        assert result.passed is True
+        assert result == validate_image(data)
+
+    def test_oversize_file_not_decoded(self, tmp_path, monkeypatch):
+        """A file over the size limit fails on stat alone."""
+        from src.stickers import quality_validator
+
+        path = tmp_path / "huge.png"
+        path.write_bytes(b"\0" * (MAX_FILE_SIZE_BYTES + 1))
+        monkeypatch.setattr(
+            quality_validator.Image, "open",
+            lambda *a, **k: pytest.fail("image should not be opened"),
+        )
+
+        result = quality_validator.validate_image_path(path)
+
+        assert result.passed is False
+        assert result.failures == [
+            f"file_too_large: {MAX_FILE_SIZE_BYTES + 1} bytes > {MAX_FILE_SIZE_BYTES} bytes"
+        ]
+
+    def test_missing_file_fails(self, tmp_path):
+        from src.stickers.quality_validator import validate_image_path
+
+        result = validate_image_path(tmp_path / "missing.png")
+        assert result.passed is False
+        assert "invalid_image" in result.failures[0]
+
+
 class TestGetModifiedPrompt:
     """Test retry prompt modification."""
 
@@ -0,0 +1,28 @@
+"""Tests for src/trends/sources/reddit.py -- text sanitizing and keyword extraction."""
+
+import time
+
+from src.trends.sources.reddit import extract_keywords, sanitize_external_text
+
+
+class TestSanitizeExternalText:
+    """Test HTML/control-character stripping of external text."""
+
+    def test_tags_and_control_chars_removed(self):
+        assert sanitize_external_text("<b>Moo\x00 Deng</b>\n") == "Moo Deng"
+
+    def test_unclosed_tag_kept_after_last_close(self):
+        assert sanitize_external_text("a <i>b</i> c < d") == "a b c < d"
+
+    def test_unclosed_tag_run_is_linear(self):
+        start = time.perf_counter()
+        sanitize_external_text("<" * 40_000, max_length=10)
+        assert time.perf_counter() - start < 0.1
+
+
+class TestExtractKeywords:
+    """Test keyword extraction from post text."""
+
+    def test_longest_first_ties_in_order(self):
+        text = "The capybara and axolotl meme https://x.co/abc 2024"
+        assert extract_keywords(text) == ["capybara", "axolotl", "meme"]
@@ -0,0 +1,159 @@
+"""Tests for src/resilience.py -- circuit breaker registry and retry decorator."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.resilience import (
+    CircuitBreakerRegistry,
+    DEFAULT_THRESHOLDS,
+    RetryExhaustedError,
+    retry,
+)
+
+
+class TestCircuitBreakerRegistry:
+    """Test registry pre-population and thread-safe lookups."""
+
+    def test_default_services_prepopulated(self):
+        """Every service in DEFAULT_THRESHOLDS has a state at construction."""
+        registry = CircuitBreakerRegistry()
+        for service, threshold in DEFAULT_THRESHOLDS.items():
+            state = registry.get(service)
+            assert state.service == service
+            assert state.threshold == threshold
+
+    def test_unknown_service_gets_default_threshold(self):
+        """Unknown services are created lazily with threshold 5."""
+        registry = CircuitBreakerRegistry()
+        assert registry.get("unknown_svc").threshold == 5
+
+    def test_concurrent_get_returns_single_state(self):
+        """Concurrent lookups of a new service share one state object."""
+        registry = CircuitBreakerRegistry()
+        barrier = threading.Barrier(8)
+        seen = []
+
+        def worker():
+            barrier.wait()
+            seen.append(registry.get("new_service"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(s) for s in seen}) == 1
+
+    def test_concurrent_failures_not_lost(self):
+        """Failure counts from many threads are all recorded."""
+        registry = CircuitBreakerRegistry(thresholds={"svc": 10_000})
+        state = registry.get("svc")
+
+        def worker():
+            for _ in range(500):
+                state.record_failure()
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert state.consecutive_failures == 2000
+
+    def test_reset_all_restores_fresh_states(self):
+        """reset_all() replaces tripped states with fresh closed ones."""
+        registry = CircuitBreakerRegistry()
+        state = registry.get("etsy")
+        for _ in range(DEFAULT_THRESHOLDS["etsy"]):
+            state.record_failure()
+        assert state.is_open
+
+        registry.reset_all()
+        assert registry.get("etsy").is_open is False
+        assert registry.get("etsy").consecutive_failures == 0
+
+
+class TestRetry:
+    """Test the synchronous retry decorator."""
+
+    def test_retries_then_succeeds(self):
+        """A transient failure is retried and the result returned."""
+        calls = {"n": 0}
+        sleeps = []
+
+        @retry(max_retries=3, sleep_fn=sleeps.append)
+        def flaky():
+            calls["n"] += 1
+            if calls["n"] < 2:
+                raise ValueError("boom")
+            return "ok"
+
+        assert flaky() == "ok"
+        assert calls["n"] == 2
+        assert sleeps == [2.0]
+
+    def test_raises_retry_exhausted(self):
+        """RetryExhaustedError is raised once all attempts fail."""
+
+        @retry(max_retries=2, sleep_fn=lambda _: None)
+        def always_fails():
+            raise ValueError("nope")
+
+        with pytest.raises(RetryExhaustedError) as exc_info:
+            always_fails()
+        assert exc_info.value.attempts == 2
+
+
+class TestAsyncRetry:
+    """Test the retry decorator applied to coroutine functions."""
+
+    def test_wraps_coroutine_function(self):
+        """Decorated coroutine functions stay awaitable."""
+        @retry(max_retries=2)
+        async def ok():
+            return 42
+
+        assert asyncio.iscoroutinefunction(ok)
+        assert asyncio.run(ok()) == 42
+
+    def test_async_retries_with_async_sleep(self):
+        """Failures are retried using the injected async sleep."""
+        calls = {"n": 0}
+        sleeps = []
+
+        async def fake_sleep(wait):
+            sleeps.append(wait)
+
+        @retry(max_retries=3, async_sleep_fn=fake_sleep)
+        async def flaky():
+            calls["n"] += 1
+            if calls["n"] < 3:
+                raise ValueError("boom")
+            return "ok"
+
+        assert asyncio.run(flaky()) == "ok"
+        assert sleeps == [2.0, 4.0]
+
+    def test_async_circuit_breaker_trips(self):
+        """Async failures count toward the service circuit breaker."""
+        registry = CircuitBreakerRegistry(thresholds={"svc": 2})
+
+        async def no_sleep(_):
+            return None
+
+        @retry(max_retries=5, service="svc", cb_registry=registry,
+               async_sleep_fn=no_sleep)
+        async def always_fails():
+            raise ValueError("down")
+
+        with pytest.raises(RetryExhaustedError):
+            asyncio.run(always_fails())
+        assert registry.get("svc").is_open
+
+        with pytest.raises(RetryExhaustedError) as exc_info:
+            asyncio.run(always_fails())
+        assert exc_info.value.attempts == 0
@@ -1,7 +1,10 @@
 """Tests for src/trends/scorer.py -- GPT-4o-mini trend scoring module."""
 
+import asyncio
 import json
 import logging
+import re
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -10,10 +13,12 @@ from src.trends.scorer import (
     TrendScore,
     TrendScorer,
     parse_score_response,
+    parse_batch_response,
     OVERALL_THRESHOLD,
     SYSTEM_PROMPT,
     BATCH_PROMPT_TEMPLATE,
     MAX_JSON_RETRIES,
+    SCORE_BATCH_SIZE,
 )
 
 
@@ -133,6 +138,26 @@ class TestParseScoreResponse:
         assert score.reasoning == ""
 
 
+class TestParseBatchResponse:
+    """Test parsing of batched score responses."""
+
+    def _item(self, index):
+        return {"index": index, "velocity": 8, "commercial": 8, "safety": 9,
+                "uniqueness": 7, "overall": 7.5, "reasoning": "ok"}
+
+    def test_truncated_response_keeps_complete_scores(self):
+        raw = json.dumps({"scores": [self._item(1), self._item(2), self._item(3)]})
+        truncated = raw[:raw.rindex('"reasoning"')]
+
+        result = parse_batch_response(truncated, expected_count=3)
+
+        assert sorted(result) == [0, 1]
+
+    def test_unsalvageable_response_raises_value_error(self):
+        with pytest.raises(ValueError, match="Malformed JSON"):
+            parse_batch_response('{"scores": [{"index": 1, "veloc', expected_count=1)
+
+
 class TestTrendScoreQualifies:
     """Test that trends scoring >= 7.0 qualify and < 7.0 are filtered out."""
 
@@ -310,6 +335,19 @@ class TestTrendScorerWithMockedOpenAI:
         call_kw = mock_client.chat.completions.create.call_args[1]
         assert call_kw.get("response_format") == {"type": "json_object"}
 
+    def test_structured_output_sends_json_schema(self):
+        """structured_output=True requests the strict score schema."""
+        from src.trends.scorer import SCORE_RESPONSE_FORMAT
+
+        mock_client = self._make_mock_client(VALID_SCORE_QUALIFYING)
+        scorer = TrendScorer(openai_client=mock_client, structured_output=True)
+
+        assert scorer.score_trend("topic").overall == 7.5
+        call_kw = mock_client.chat.completions.create.call_args[1]
+        assert call_kw["response_format"] is SCORE_RESPONSE_FORMAT
+        schema = SCORE_RESPONSE_FORMAT["json_schema"]["schema"]
+        assert set(schema["required"]) == set(json.loads(VALID_SCORE_QUALIFYING))
+
     def test_no_client_returns_none(self):
         """When OpenAI client is not available, score_trend returns None (no API call)."""
         mock_client = self._make_mock_client(VALID_SCORE_QUALIFYING)
@@ -389,6 +427,207 @@ class TestTrendScorerScoreAndFilter:
         assert result[0]["score_overall"] == 7.5
 
 
+def _batch_scores_for(messages, overall=7.5) -> str:
+    """Score every numbered trend in a batch prompt."""
+    count = len(re.findall(r"^\d+\. ", messages[1]["content"], re.M))
+    return json.dumps({"scores": [
+        {"index": i, "velocity": 8, "commercial": 8, "safety": 9, "uniqueness": 7,
+         "overall": overall, "reasoning": "ok"}
+        for i in range(1, count + 1)
+    ]})
+
+
+class FakeAsyncCompletions:
+    """AsyncOpenAI completions stub that records peak concurrency; batches with a 'fail' topic raise."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def create(self, messages, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if "[reddit] fail" in messages[1]["content"]:
+            raise RuntimeError("API down")
+        content = _batch_scores_for(messages)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class TestConcurrentBatchScoring:
+    """score_and_filter splits large inputs into batches scored concurrently."""
+
+    def _trends(self, n, prefix="t"):
+        return [{"topic": f"{prefix}{i}", "source": "reddit"} for i in range(n)]
+
+    def test_batches_scored_concurrently(self):
+        completions = FakeAsyncCompletions()
+        sync_client = MagicMock()
+        scorer = TrendScorer(
+            openai_client=sync_client,
+            async_openai_client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+        )
+
+        trends = self._trends(SCORE_BATCH_SIZE * 2 + 5)
+        result = scorer.score_and_filter(trends)
+
+        assert completions.calls == 3
+        assert completions.peak == 3
+        sync_client.chat.completions.create.assert_not_called()
+        assert [t["topic"] for t in result] == [t["topic"] for t in trends]
+
+    def test_failed_batch_only_drops_its_trends(self):
+        completions = FakeAsyncCompletions()
+        scorer = TrendScorer(
+            openai_client=MagicMock(),
+            async_openai_client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+        )
+
+        trends = self._trends(SCORE_BATCH_SIZE) + self._trends(3, prefix="fail")
+        result = scorer.score_and_filter(trends)
+
+        assert len(result) == SCORE_BATCH_SIZE
+        assert completions.calls == 1 + MAX_JSON_RETRIES + 1
+
+    def test_single_batch_uses_sync_client(self):
+        sync_client = MagicMock()
+        sync_client.chat.completions.create.side_effect = lambda messages, **kw: SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=_batch_scores_for(messages)))],
+        )
+        completions = FakeAsyncCompletions()
+        scorer = TrendScorer(
+            openai_client=sync_client,
+            async_openai_client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+        )
+
+        assert len(scorer.score_and_filter(self._trends(3))) == 3
+        assert completions.calls == 0
+        assert sync_client.chat.completions.create.call_count == 1
+
+
+class TestScoreCache:
+    """score_and_filter reuses scores cached in Supabase for recent trends."""
+
+    def _sync_client(self):
+        client = MagicMock()
+        client.chat.completions.create.side_effect = lambda messages, **kw: SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=_batch_scores_for(messages)))],
+        )
+        return client
+
+    def _row(self, key, age_days=0, overall=9.0):
+        from datetime import datetime, timedelta, timezone
+
+        created = datetime.now(timezone.utc) - timedelta(days=age_days)
+        return {
+            "hash": key,
+            "score": {"velocity": 9, "commercial": 9, "safety": 9, "uniqueness": 9,
+                      "overall": overall, "reasoning": "cached"},
+            "created_at": created.isoformat(),
+        }
+
+    def test_cached_trends_not_sent(self):
+        client, db = self._sync_client(), MagicMock()
+        scorer = TrendScorer(openai_client=client, db=db)
+        trends = [
+            {"topic": "axolotl", "topic_normalized": "axolotl", "keywords": ["axolotl"]},
+            {"topic": "otter", "topic_normalized": "otter", "keywords": ["otter"]},
+        ]
+        db.get_score_cache.return_value = [self._row(scorer._score_key(trends[0]))]
+
+        result = scorer.score_and_filter(trends)
+
+        user_msg = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "otter" in user_msg and "axolotl" not in user_msg
+        assert [t["reasoning"] for t in result] == ["cached", "ok"]
+        stored = db.upsert_score_cache.call_args.args[0]
+        assert list(stored) == [scorer._score_key(trends[1])]
+        assert stored[scorer._score_key(trends[1])]["overall"] == 7.5
+
+    def test_all_cached_makes_no_request(self):
+        client, db = self._sync_client(), MagicMock()
+        scorer = TrendScorer(openai_client=client, db=db)
+        trends = [{"topic": "hippo", "keywords": ["b", "a"]}]
+        db.get_score_cache.return_value = [self._row(scorer._score_key(trends[0]))]
+
+        assert len(scorer.score_and_filter(trends)) == 1
+        client.chat.completions.create.assert_not_called()
+
+    def test_cached_scores_used_without_client(self):
+        db = MagicMock()
+        scorer = TrendScorer(openai_client=self._sync_client(), db=db)
+        scorer._client = None  # Simulate client init failure
+        trends = [{"topic": "axolotl", "keywords": ["axolotl"]}, {"topic": "otter", "keywords": ["otter"]}]
+        db.get_score_cache.return_value = [self._row(scorer._score_key(trends[0]))]
+
+        assert [t["topic"] for t in scorer.score_and_filter(trends)] == ["axolotl"]
+
+    def test_stale_entries_rescored(self):
+        client, db = self._sync_client(), MagicMock()
+        scorer = TrendScorer(openai_client=client, db=db)
+        trends = [{"topic": "hippo", "keywords": ["hippo"]}]
+        db.get_score_cache.return_value = [self._row(scorer._score_key(trends[0]), age_days=8)]
+
+        result = scorer.score_and_filter(trends)
+
+        assert client.chat.completions.create.call_count == 1
+        assert result[0]["reasoning"] == "ok"
+
+    def test_duplicate_trends_scored_once(self):
+        client = self._sync_client()
+        scorer = TrendScorer(openai_client=client)
+        trends = [
+            {"topic": "Axolotl", "topic_normalized": "axolotl", "keywords": ["axolotl"], "source": "reddit"},
+            {"topic": "axolotl", "topic_normalized": "axolotl", "keywords": ["axolotl"], "source": "google_trends"},
+        ]
+
+        result = scorer.score_and_filter(trends)
+
+        user_msg = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "[reddit] Axolotl" in user_msg and "google_trends" not in user_msg
+        assert [t["source"] for t in result] == ["reddit", "google_trends"]
+        assert result[1]["score_overall"] == 7.5
+
+    def test_key_ignores_keyword_order(self):
+        scorer = TrendScorer(openai_client=MagicMock())
+        a = scorer._score_key({"topic_normalized": "hippo", "keywords": ["a", "b"]})
+        b = scorer._score_key({"topic_normalized": "hippo", "keywords": ["b", "a"]})
+        assert a == b
+
+
+class TestBlocklistPrefilter:
+    """Blocklisted trends are scored locally without an API call."""
+
+    def test_blocked_keyword_not_sent(self):
+        client = MagicMock()
+        client.chat.completions.create.side_effect = lambda messages, **kw: SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=_batch_scores_for(messages)))],
+        )
+        scorer = TrendScorer(openai_client=client)
+        trends = [
+            {"topic": "breaking news", "keywords": ["terrorism", "city"]},
+            {"topic": "axolotl", "keywords": ["axolotl"]},
+        ]
+
+        result = scorer.score_and_filter(trends)
+
+        user_msg = client.chat.completions.create.call_args.kwargs["messages"][1]["content"]
+        assert "axolotl" in user_msg and "breaking news" not in user_msg
+        assert [t["topic"] for t in result] == ["axolotl"]
+
+    def test_score_trend_skips_api_for_blocked_topic(self):
+        client = MagicMock()
+        scorer = TrendScorer(openai_client=client)
+
+        score = scorer.score_trend("terrorism memes")
+
+        assert score.safety == 1 and not score.qualifies()
+        client.chat.completions.create.assert_not_called()
+
+
 class TestPromptConstants:
     """Prompt includes all required elements (system message, calibration examples, trend data)."""
 
@@ -415,3 +654,37 @@ class TestPromptConstants:
         assert "uniqueness" in BATCH_PROMPT_TEMPLATE
         assert "overall" in BATCH_PROMPT_TEMPLATE
         assert "reasoning" in BATCH_PROMPT_TEMPLATE
+
+
+class TestRequestAccounting:
+    """TrendScorer rate-limits each LLM call and records its spend."""
+
+    def test_limiter_acquired_per_request(self):
+        limiter = MagicMock()
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "not json"
+        client = MagicMock()
+        client.chat.completions.create.return_value = mock_response
+        scorer = TrendScorer(openai_client=client, model="m", rate_limiter=limiter)
+
+        scorer.score_trend("topic")
+
+        assert limiter.acquire.call_count == client.chat.completions.create.call_count == 3
+        limiter.acquire.assert_called_with("openai:m")
+
+    def test_usage_recorded_as_spend(self):
+        tracker = MagicMock()
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=VALID_SCORE_QUALIFYING))],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20),
+        )
+        client = MagicMock()
+        client.chat.completions.create.return_value = response
+        scorer = TrendScorer(openai_client=client, spend_tracker=tracker)
+
+        with patch("src.monitoring.spend_tracker.estimate_llm_cost", return_value=0.5) as cost:
+            scorer.score_trend("topic")
+
+        cost.assert_called_once_with(100, 20)
+        tracker.record_spend.assert_called_once_with(0.5)
@@ -0,0 +1,133 @@
+"""Tests for src/publisher/seo.py -- batched listing copy generation."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.publisher.seo import (
+    BATCH_PROMPT_TEMPLATE,
+    MAX_BATCH_SIZE,
+    REQUIRED_TAG_COUNT,
+    TAG_RULES,
+    TAGS_PROMPT_TEMPLATE,
+    TITLE_PROMPT_TEMPLATE,
+    TITLE_RULES,
+    SEOGenerator,
+)
+
+
+def _response(content: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+    )
+
+
+def _row(topic, index=None, title=None, tag_count=REQUIRED_TAG_COUNT) -> dict:
+    row = {
+        "topic": topic,
+        "title": title or f"{topic} Sticker - Vinyl Decal",
+        "tags": [f"{topic} tag {j}" for j in range(tag_count)],
+    }
+    if index is not None:
+        row["index"] = index
+    return row
+
+
+def _generator(*batches) -> SEOGenerator:
+    """Generator whose batch calls return the given listings; per-topic calls are stubbed."""
+    client = MagicMock()
+    client.chat.completions.create.side_effect = [
+        _response(json.dumps({"listings": rows})) for rows in batches
+    ]
+    gen = SEOGenerator(openai_client=client)
+    gen.generate_title = MagicMock(side_effect=lambda topic: f"fallback {topic}")
+    gen.generate_tags = MagicMock(side_effect=lambda topic, keywords=None: ["fallback"])
+    return gen
+
+
+class TestGenerateBatch:
+    """Test matching batch rows back to their topics."""
+
+    def test_exact_topic_match(self):
+        gen = _generator([_row("capybara"), _row("axolotl")])
+
+        results = gen.generate_batch(["capybara", "axolotl"])
+
+        assert [r["title"] for r in results] == [
+            "capybara Sticker - Vinyl Decal",
+            "axolotl Sticker - Vinyl Decal",
+        ]
+        assert results[1]["tags"][0] == "axolotl tag 0"
+        gen.generate_title.assert_not_called()
+
+    def test_renamed_row_matched_by_index(self):
+        gen = _generator([_row("Axolotl!", index=1), _row("capybara", index=0)])
+
+        results = gen.generate_batch(["capybara", "axolotl"])
+
+        assert results[0]["title"] == "capybara Sticker - Vinyl Decal"
+        assert results[1]["title"] == "Axolotl! Sticker - Vinyl Decal"
+        gen.generate_title.assert_not_called()
+
+    def test_reordered_renamed_row_not_matched_by_position(self):
+        gen = _generator([_row("Axolotl!"), _row("capybara")])
+
+        results = gen.generate_batch(["capybara", "axolotl"])
+
+        assert results[0]["title"] == "capybara Sticker - Vinyl Decal"
+        assert results[1]["title"] == "fallback axolotl"
+        gen.generate_title.assert_called_once_with("axolotl")
+
+    def test_missing_row_falls_back_per_topic(self):
+        gen = _generator([_row("capybara")])
+
+        results = gen.generate_batch(["capybara", "axolotl"])
+
+        assert results[1] == {
+            "topic": "axolotl", "title": "fallback axolotl", "tags": ["fallback"],
+        }
+
+    def test_overlong_title_falls_back(self):
+        gen = _generator([_row("capybara", title="x" * 141)])
+
+        results = gen.generate_batch(["capybara"])
+
+        assert results[0]["title"] == "fallback capybara"
+
+    def test_wrong_tag_count_falls_back(self):
+        gen = _generator([_row("capybara", tag_count=REQUIRED_TAG_COUNT - 1)])
+
+        results = gen.generate_batch(["capybara"])
+
+        assert results[0]["tags"] == ["fallback"]
+
+    def test_topics_chunked_at_batch_size(self):
+        topics = [f"topic {i}" for i in range(MAX_BATCH_SIZE + 2)]
+        gen = _generator(
+            [_row(t) for t in topics[:MAX_BATCH_SIZE]],
+            [_row(t) for t in topics[MAX_BATCH_SIZE:]],
+        )
+
+        results = gen.generate_batch(topics)
+
+        calls = gen._client.chat.completions.create.call_args_list
+        assert len(calls) == 2
+        sent = json.loads(
+            calls[1].kwargs["messages"][1]["content"].split("\n\n")[1]
+        )
+        assert [t["index"] for t in sent] == [0, 1]
+        assert [r["topic"] for r in results] == topics
+        gen.generate_title.assert_not_called()
+
+
+class TestPromptTemplates:
+    """Test that the batch and per-topic prompts share one set of rules."""
+
+    def test_rules_shared(self):
+        title_rules = TITLE_RULES.format()
+        tag_rules = TAG_RULES.format()
+
+        assert title_rules in TITLE_PROMPT_TEMPLATE.format(topic="t")
+        assert tag_rules in TAGS_PROMPT_TEMPLATE.format(topic="t", keywords="k")
+        batch = BATCH_PROMPT_TEMPLATE.format(topics_json="[]")
+        assert title_rules in batch and tag_rules in batch
@@ -349,7 +349,10 @@ class TestSpendTracker:
         """check_budget should return appropriate messages for each state."""
         mock_db = MagicMock()
         mock_alerter = MagicMock()
-        tracker = SpendTracker(db=mock_db, alerter=mock_alerter, monthly_warning=120.0, monthly_cap=150.0)
+        tracker = SpendTracker(
+            db=mock_db, alerter=mock_alerter, monthly_warning=120.0, monthly_cap=150.0,
+            cache_ttl=0,
+        )
 
         # Under warning
         mock_db.select.return_value = [{"started_at": "2026-02-05T10:00:00Z", "ai_cost_estimate_usd": 50.0}]
@@ -370,3 +373,61 @@ class TestSpendTracker:
         result = tracker.check_budget()
         assert "HARD STOP" in result["message"]
         assert "halted" in result["message"]
+
+
+class TestBudgetCache:
+    """Tests for the cached monthly spend used by check_budget()."""
+
+    def _tracker(self, monthly, **kwargs):
+        tracker = SpendTracker(db=MagicMock(), alerter=MagicMock(), monthly_cap=150.0, **kwargs)
+        tracker.get_monthly_spend = MagicMock(return_value=monthly)
+        return tracker
+
+    def test_repeat_checks_served_from_cache(self):
+        tracker = self._tracker(50.0)
+
+        tracker.check_budget()
+        result = tracker.check_budget()
+
+        assert tracker.get_monthly_spend.call_count == 1
+        assert result["monthly_spend"] == 50.0
+
+    def test_recorded_spend_added_to_cached_total(self):
+        tracker = self._tracker(50.0)
+        tracker.check_budget()
+
+        tracker.record_spend(0.25)
+
+        assert tracker.check_budget()["monthly_spend"] == 50.25
+        assert tracker.get_monthly_spend.call_count == 1
+
+    def test_local_spend_past_cap_rechecks_store(self):
+        tracker = self._tracker(149.0)
+        tracker.check_budget()
+        tracker.record_spend(2.0)
+
+        result = tracker.check_budget()
+
+        assert tracker.get_monthly_spend.call_count == 2
+        assert result["can_proceed"] is False
+        assert result["monthly_spend"] == 151.0
+
+    def test_stored_spend_no_longer_added(self):
+        tracker = self._tracker(50.0)
+        tracker.record_spend(2.0)
+        assert tracker.check_budget()["monthly_spend"] == 52.0
+
+        tracker.get_monthly_spend.return_value = 52.0
+        tracker.mark_stored(2.0)
+
+        assert tracker.unstored_spend == 0.0
+        assert tracker.check_budget()["monthly_spend"] == 52.0
+        assert tracker.get_monthly_spend.call_count == 2
+
+    def test_expired_cache_refreshed(self):
+        tracker = self._tracker(50.0, cache_ttl=0)
+
+        tracker.check_budget()
+        tracker.check_budget()
+
+        assert tracker.get_monthly_spend.call_count == 2
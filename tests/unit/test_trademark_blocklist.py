@@ -157,6 +157,18 @@ class TestCheckAll:
         assert match == "nike"
 
 
+    def test_check_all_cached_until_clear(self, monkeypatch):
+        """Repeated topics skip the scan; clear_cache() picks up list changes."""
+        from src.moderation import blocklist
+
+        assert check_all("baby hippo cute sticker")[0] is False
+        monkeypatch.setattr(blocklist, "check_trademark", lambda text: (True, "hippo"))
+        assert check_all("baby hippo cute sticker")[0] is False
+
+        clear_cache()
+        assert check_all("baby hippo cute sticker") == (True, "hippo", "trademark")
+
+
 class TestBlocklistLoading:
     """Sanity checks that blocklists load from data files."""
 